@@ -1,10 +1,14 @@
 from dotenv import load_dotenv
 import os
 import json
-import yfinance as yf
 import pandas as pd
 import numpy as np
-from scipy import stats
+import time
+import threading
+import contextvars
+from multiprocessing import get_context
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -12,11 +16,17 @@ load_dotenv()
 
 groq_api_key = os.getenv("GROQ_API_KEY")    
 tavily_api_key = os.getenv("TAVILY_API_KEY")
-from langchain_groq import ChatGroq
-from langchain_community.tools.tavily_search import TavilySearchResults
+REPORT_PROCESS_WORKERS = int(os.getenv("REPORT_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+from llm_providers import get_chat_model, get_search_tool
+from response_cache import response_cache, RESPONSE_CACHE_ENABLED
+from market_data import get_history, get_info, memoize, tool_succeeded
+from session_store import session_store, active_session, session_memoize
+from tool_executor import agent_config, with_timeout
+from metrics import timed, observe_stage
 from langchain_core.messages.ai import AIMessage
+from langchain_core.messages import ToolMessage
 from langchain.tools import tool
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 
 # Finance Analysis Functions
 def calculate_cagr(start_value: float, end_value: float, periods: float) -> float:
@@ -79,6 +89,8 @@ def monte_carlo_simulation(returns: pd.Series, days: int = 252, simulations: int
     }
 
 @tool
+@session_memoize("get_stock_data", cache_if=tool_succeeded)
+@memoize("get_stock_data", cache_if=tool_succeeded)
 def get_stock_data(symbol: str) -> str:
     """
     Fetch stock data and basic information for a given symbol.
@@ -90,17 +102,16 @@ def get_stock_data(symbol: str) -> str:
         JSON string with stock data
     """
     try:
-        stock = yf.Ticker(symbol)
-        hist = stock.history(period="2y")
-        info = stock.info
+        hist = get_history(symbol, period="2y")
         
         if hist.empty:
             return json.dumps({"error": f"No data found for symbol {symbol}"})
         
+        info = get_info(symbol)
         result = {
             "symbol": symbol,
             "company_name": info.get('longName', 'N/A'),
-            "current_price": float(hist['Close'][-1]),
+            "current_price": float(hist['Close'].iloc[-1]),
             "currency": info.get('currency', 'N/A'),
             "market_cap": info.get('marketCap', 'N/A'),
             "sector": info.get('sector', 'N/A'),
@@ -113,7 +124,129 @@ def get_stock_data(symbol: str) -> str:
     except Exception as e:
         return json.dumps({"error": str(e)})
 
+def compute_financial_report(symbol: str, stock_hist: pd.DataFrame, benchmark_hist: pd.DataFrame,
+                             info: Dict[str, Any], benchmark: str = "^GSPC") -> Dict[str, Any]:
+    """
+    Compute the full metric suite for one stock from already-loaded data.
+    Pure function of its inputs, so batch reports can run it in worker processes.
+    """
+    # Calculate returns
+    stock_returns = stock_hist['Close'].pct_change().dropna()
+    
+    # Calculate financial metrics
+    start_price = stock_hist['Close'].iloc[0]
+    end_price = stock_hist['Close'].iloc[-1]
+    periods = len(stock_hist) / 252  # Convert to years
+    
+    cagr = calculate_cagr(start_price, end_price, periods)
+    volatility = calculate_volatility(stock_returns)
+    sharpe_ratio = calculate_sharpe_ratio(stock_returns)
+    max_drawdown_info = calculate_max_drawdown(stock_hist['Close'])
+    monte_carlo_results = monte_carlo_simulation(stock_returns)
+    
+    # Beta and CAPM need the benchmark; without it the report leaves them out
+    risk_free_rate = 0.02  # Assume 2% risk-free rate
+    beta = market_return = expected_return_capm = None
+    if benchmark_hist is not None and not benchmark_hist.empty:
+        benchmark_returns = benchmark_hist['Close'].pct_change().dropna()
+        common_dates = stock_returns.index.intersection(benchmark_returns.index)
+        benchmark_returns_aligned = benchmark_returns.loc[common_dates]
+        beta = float(calculate_beta(stock_returns.loc[common_dates], benchmark_returns_aligned))
+        market_return = float(benchmark_returns_aligned.mean() * 252)
+        expected_return_capm = risk_free_rate + beta * (market_return - risk_free_rate)
+    
+    # Compile comprehensive report
+    report = {
+        "stock_info": {
+            "symbol": symbol,
+            "company_name": info.get('longName', 'N/A'),
+            "sector": info.get('sector', 'N/A'),
+            "industry": info.get('industry', 'N/A'),
+            "market_cap": info.get('marketCap', 'N/A'),
+            "current_price": float(end_price),
+            "currency": info.get('currency', 'N/A')
+        },
+        "performance_metrics": {
+            "cagr": {
+                "value": float(cagr),
+                "percentage": f"{cagr * 100:.2f}%",
+                "explanation": "Compound Annual Growth Rate shows the true growth rate of investment over time. It smooths out volatility to show steady annual growth rate."
+            },
+            "volatility": {
+                "value": float(volatility),
+                "percentage": f"{volatility * 100:.2f}%",
+                "explanation": "Volatility measures market risk and price fluctuations. Higher volatility means higher risk but potentially higher returns."
+            }
+        },
+        "risk_metrics": {
+            "sharpe_ratio": {
+                "value": float(sharpe_ratio),
+                "interpretation": "Excellent" if sharpe_ratio > 2 else "Good" if sharpe_ratio > 1 else "Fair" if sharpe_ratio > 0.5 else "Poor",
+                "explanation": "Risk-adjusted return metric. Answers: Is my return worth the risk taken? Higher values indicate better risk-adjusted performance."
+            },
+            "beta": {
+                "value": beta,
+                "interpretation": "N/A" if beta is None else "High Risk" if beta > 1.2 else "Market Risk" if beta > 0.8 else "Low Risk",
+                "explanation": "Measures stock's sensitivity to market movements. Beta > 1 means more volatile than market, Beta < 1 means less volatile."
+            },
+            "max_drawdown": {
+                "value": float(max_drawdown_info['max_drawdown']),
+                "percentage": f"{max_drawdown_info['max_drawdown'] * 100:.2f}%",
+                "peak_date": max_drawdown_info['peak_date'],
+                "trough_date": max_drawdown_info['trough_date'],
+                "explanation": "Biggest loss during the period. Teaches importance of downside protection and helps understand worst-case scenarios."
+            }
+        },
+        "capm_analysis": {
+            "expected_return": expected_return_capm,
+            "expected_return_percentage": "N/A" if expected_return_capm is None else f"{expected_return_capm * 100:.2f}%",
+            "market_return": market_return,
+            "risk_free_rate": risk_free_rate,
+            "explanation": "Capital Asset Pricing Model links stock risk with market risk. Core concept for understanding risk-return relationship."
+        },
+        "monte_carlo_simulation": {
+            "mean_projected_return": float(monte_carlo_results['mean_final_price']),
+            "downside_risk_5th_percentile": float(monte_carlo_results['percentile_5']),
+            "upside_potential_95th_percentile": float(monte_carlo_results['percentile_95']),
+            "probability_of_positive_return": f"{monte_carlo_results['probability_positive'] * 100:.1f}%",
+            "simulations_run": monte_carlo_results['simulations_run'],
+            "explanation": "Simulates thousands of possible price paths to understand potential outcomes. Makes backtesting engaging and visual."
+        },
+        "investment_recommendation": {
+            "risk_level": "High" if (beta or 0) > 1.2 or volatility > 0.4 else "Medium" if (beta or 0) > 0.8 or volatility > 0.2 else "Low",
+            "suitable_for": "Aggressive investors" if (beta or 0) > 1.2 else "Moderate investors" if (beta or 0) > 0.8 else "Conservative investors",
+            "key_insights": [
+                f"CAGR of {cagr * 100:.2f}% shows {'strong' if cagr > 0.15 else 'moderate' if cagr > 0.08 else 'weak'} long-term growth",
+                f"Volatility of {volatility * 100:.2f}% indicates {'high' if volatility > 0.4 else 'moderate' if volatility > 0.2 else 'low'} risk",
+                f"Sharpe ratio of {sharpe_ratio:.2f} suggests {'excellent' if sharpe_ratio > 2 else 'good' if sharpe_ratio > 1 else 'poor'} risk-adjusted returns",
+                f"Beta of {beta:.2f} means the stock is {'more' if beta > 1 else 'less'} volatile than the market" if beta is not None
+                else f"Beta could not be calculated because {benchmark} data was unavailable",
+                f"Maximum drawdown of {max_drawdown_info['max_drawdown'] * 100:.2f}% shows potential downside risk"
+            ]
+        },
+        "educational_notes": {
+            "cagr_importance": "CAGR is crucial for beginners as it shows true investment growth over time, eliminating market noise",
+            "volatility_education": "Understanding volatility is foundation for risk education - it shows how much prices fluctuate",
+            "sharpe_ratio_significance": "Sharpe ratio helps answer the key question: Is the extra return worth the extra risk?",
+            "beta_capm_relevance": "Beta and CAPM are core SEBI concepts that link individual stock risk to overall market risk",
+            "drawdown_protection": "Max drawdown teaches the importance of downside protection in portfolio management",
+            "monte_carlo_value": "Monte Carlo simulation makes complex backtesting concepts engaging through visual probability analysis"
+        },
+        "analysis_period": f"{stock_hist.index[0].date()} to {stock_hist.index[-1].date()}",
+        "benchmark_used": benchmark if beta is not None else None,
+        "data_points_analyzed": len(stock_hist)
+    }
+    
+    return report
+
+def _timed_report(*args) -> Dict[str, Any]:
+    """compute_financial_report, timed as a stage of the current request"""
+    with timed("financial_report"):
+        return compute_financial_report(*args)
+
 @tool
+@session_memoize("generate_financial_report", cache_if=tool_succeeded)
+@memoize("generate_financial_report", cache_if=tool_succeeded)
 def generate_financial_report(symbol: str, benchmark: str = "^GSPC") -> str:
     """
     Generate a comprehensive financial analysis report for a stock including CAGR, volatility, 
@@ -127,135 +260,19 @@ def generate_financial_report(symbol: str, benchmark: str = "^GSPC") -> str:
         JSON string with comprehensive financial analysis
     """
     try:
-        # Fetch stock data
-        stock = yf.Ticker(symbol)
-        benchmark_ticker = yf.Ticker(benchmark)
-        
-        # Get 2 years of data
-        stock_hist = stock.history(period="2y")
-        benchmark_hist = benchmark_ticker.history(period="2y")
+        # Get 2 years of data (shared with get_stock_data and the Flask endpoints)
+        stock_hist = get_history(symbol, period="2y")
+        benchmark_hist = get_history(benchmark, period="2y")
         
         if stock_hist.empty:
             return json.dumps({"error": f"No data found for {symbol}"})
         
-        # Calculate returns
-        stock_returns = stock_hist['Close'].pct_change().dropna()
-        benchmark_returns = benchmark_hist['Close'].pct_change().dropna()
-        
-        # Align dates
-        common_dates = stock_returns.index.intersection(benchmark_returns.index)
-        stock_returns_aligned = stock_returns.loc[common_dates]
-        benchmark_returns_aligned = benchmark_returns.loc[common_dates]
-        
-        # Get stock info
-        info = stock.info
-        
-        # Calculate financial metrics
-        start_price = stock_hist['Close'].iloc[0]
-        end_price = stock_hist['Close'].iloc[-1]
-        periods = len(stock_hist) / 252  # Convert to years
-        
-        cagr = calculate_cagr(start_price, end_price, periods)
-        volatility = calculate_volatility(stock_returns)
-        sharpe_ratio = calculate_sharpe_ratio(stock_returns)
-        beta = calculate_beta(stock_returns_aligned, benchmark_returns_aligned)
-        max_drawdown_info = calculate_max_drawdown(stock_hist['Close'])
-        monte_carlo_results = monte_carlo_simulation(stock_returns)
-        
-        # CAPM calculation
-        risk_free_rate = 0.02  # Assume 2% risk-free rate
-        market_return = benchmark_returns_aligned.mean() * 252
-        expected_return_capm = risk_free_rate + beta * (market_return - risk_free_rate)
-        
-        # Compile comprehensive report
-        report = {
-            "stock_info": {
-                "symbol": symbol,
-                "company_name": info.get('longName', 'N/A'),
-                "sector": info.get('sector', 'N/A'),
-                "industry": info.get('industry', 'N/A'),
-                "market_cap": info.get('marketCap', 'N/A'),
-                "current_price": float(end_price),
-                "currency": info.get('currency', 'N/A')
-            },
-            "performance_metrics": {
-                "cagr": {
-                    "value": float(cagr),
-                    "percentage": f"{cagr * 100:.2f}%",
-                    "explanation": "Compound Annual Growth Rate shows the true growth rate of investment over time. It smooths out volatility to show steady annual growth rate."
-                },
-                "volatility": {
-                    "value": float(volatility),
-                    "percentage": f"{volatility * 100:.2f}%",
-                    "explanation": "Volatility measures market risk and price fluctuations. Higher volatility means higher risk but potentially higher returns."
-                }
-            },
-            "risk_metrics": {
-                "sharpe_ratio": {
-                    "value": float(sharpe_ratio),
-                    "interpretation": "Excellent" if sharpe_ratio > 2 else "Good" if sharpe_ratio > 1 else "Fair" if sharpe_ratio > 0.5 else "Poor",
-                    "explanation": "Risk-adjusted return metric. Answers: Is my return worth the risk taken? Higher values indicate better risk-adjusted performance."
-                },
-                "beta": {
-                    "value": float(beta),
-                    "interpretation": "High Risk" if beta > 1.2 else "Market Risk" if beta > 0.8 else "Low Risk",
-                    "explanation": "Measures stock's sensitivity to market movements. Beta > 1 means more volatile than market, Beta < 1 means less volatile."
-                },
-                "max_drawdown": {
-                    "value": float(max_drawdown_info['max_drawdown']),
-                    "percentage": f"{max_drawdown_info['max_drawdown'] * 100:.2f}%",
-                    "peak_date": max_drawdown_info['peak_date'],
-                    "trough_date": max_drawdown_info['trough_date'],
-                    "explanation": "Biggest loss during the period. Teaches importance of downside protection and helps understand worst-case scenarios."
-                }
-            },
-            "capm_analysis": {
-                "expected_return": float(expected_return_capm),
-                "expected_return_percentage": f"{expected_return_capm * 100:.2f}%",
-                "market_return": float(market_return),
-                "risk_free_rate": risk_free_rate,
-                "explanation": "Capital Asset Pricing Model links stock risk with market risk. Core concept for understanding risk-return relationship."
-            },
-            "monte_carlo_simulation": {
-                "mean_projected_return": float(monte_carlo_results['mean_final_price']),
-                "downside_risk_5th_percentile": float(monte_carlo_results['percentile_5']),
-                "upside_potential_95th_percentile": float(monte_carlo_results['percentile_95']),
-                "probability_of_positive_return": f"{monte_carlo_results['probability_positive'] * 100:.1f}%",
-                "simulations_run": monte_carlo_results['simulations_run'],
-                "explanation": "Simulates thousands of possible price paths to understand potential outcomes. Makes backtesting engaging and visual."
-            },
-            "investment_recommendation": {
-                "risk_level": "High" if beta > 1.2 or volatility > 0.4 else "Medium" if beta > 0.8 or volatility > 0.2 else "Low",
-                "suitable_for": "Aggressive investors" if beta > 1.2 else "Moderate investors" if beta > 0.8 else "Conservative investors",
-                "key_insights": [
-                    f"CAGR of {cagr * 100:.2f}% shows {'strong' if cagr > 0.15 else 'moderate' if cagr > 0.08 else 'weak'} long-term growth",
-                    f"Volatility of {volatility * 100:.2f}% indicates {'high' if volatility > 0.4 else 'moderate' if volatility > 0.2 else 'low'} risk",
-                    f"Sharpe ratio of {sharpe_ratio:.2f} suggests {'excellent' if sharpe_ratio > 2 else 'good' if sharpe_ratio > 1 else 'poor'} risk-adjusted returns",
-                    f"Beta of {beta:.2f} means the stock is {'more' if beta > 1 else 'less'} volatile than the market",
-                    f"Maximum drawdown of {max_drawdown_info['max_drawdown'] * 100:.2f}% shows potential downside risk"
-                ]
-            },
-            "educational_notes": {
-                "cagr_importance": "CAGR is crucial for beginners as it shows true investment growth over time, eliminating market noise",
-                "volatility_education": "Understanding volatility is foundation for risk education - it shows how much prices fluctuate",
-                "sharpe_ratio_significance": "Sharpe ratio helps answer the key question: Is the extra return worth the extra risk?",
-                "beta_capm_relevance": "Beta and CAPM are core SEBI concepts that link individual stock risk to overall market risk",
-                "drawdown_protection": "Max drawdown teaches the importance of downside protection in portfolio management",
-                "monte_carlo_value": "Monte Carlo simulation makes complex backtesting concepts engaging through visual probability analysis"
-            },
-            "analysis_period": f"{stock_hist.index[0].date()} to {stock_hist.index[-1].date()}",
-            "benchmark_used": benchmark,
-            "data_points_analyzed": len(stock_hist)
-        }
-        
+        report = _timed_report(symbol, stock_hist, benchmark_hist, get_info(symbol), benchmark)
         return json.dumps(report, indent=2)
         
     except Exception as e:
         return json.dumps({"error": f"Error generating financial report: {str(e)}"})
 
-# Initialize LLM and tools
-groq_llm = ChatGroq(model="llama-3.3-70b-versatile")
-search_tool = TavilySearchResults(max_result=2)
 
 # Enhanced system prompt for financial analysis
 financial_system_prompt = """You are an expert financial advisor and analyst specializing in comprehensive investment analysis. 
@@ -284,23 +301,130 @@ When generating reports, always:
 
 Focus on creating reports that are both technically accurate and educationally valuable."""
 
-from langgraph.prebuilt import create_react_agent
 from langchain_core.messages import SystemMessage
 
-# Create enhanced agent with financial tools
-agent = create_react_agent(
-    groq_llm,
-    [search_tool, get_stock_data, generate_financial_report]
-)
+# LLM, search tool and agent are built on first use (provider chosen by LLM_PROVIDER)
+_clients = {}
+_clients_lock = threading.Lock()
+
+def get_agent():
+    """Build the LLM, search tool and ReAct agent once, on first use"""
+    if "agent" not in _clients:
+        with _clients_lock:
+            if "agent" not in _clients:
+                from langgraph.prebuilt import create_react_agent
+                
+                groq_llm = get_chat_model()
+                search_tool = get_search_tool(max_results=2)
+                
+                # Create enhanced agent with financial tools; independent tool calls
+                # in one step run concurrently, each bounded by its timeout
+                _clients["groq_llm"] = groq_llm
+                _clients["search_tool"] = search_tool
+                _clients["agent"] = create_react_agent(
+                    groq_llm,
+                    [with_timeout(t) for t in (search_tool, get_stock_data, generate_financial_report)]
+                )
+    return _clients["agent"]
+
+def __getattr__(name):
+    # Backwards compatible access to the lazily built clients
+    if name in ("groq_llm", "search_tool", "agent"):
+        get_agent()
+        return _clients[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _build_state(query, session=None):
+    """Agent input: system prompt (plus conversation summary), trimmed history and the new query"""
+    system_prompt = financial_system_prompt
+    history = []
+    if session is not None:
+        summary, history = session.history()
+        if summary:
+            system_prompt = f"{financial_system_prompt}\n\nSummary of the earlier conversation:\n{summary}"
+    return {"messages": [SystemMessage(content=system_prompt), *history, {"role": "user", "content": query}]}
 
-def get_agent_response(query):
+def _use_response_cache(session=None):
+    # Follow-up questions depend on the conversation, so only first turns are cached
+    return RESPONSE_CACHE_ENABLED and (session is None or not session.has_history())
+
+def get_agent_response(query, session_id=None):
+    """
+    Answer a query. With a session_id the conversation history is kept server-side
+    and the answer is appended to that session.
+    """
+    session = session_store.get_or_create(session_id) if session_id else None
+    
+    # Repeated and near-duplicate questions are answered from the response cache
+    if _use_response_cache(session):
+        cached = response_cache.get(query)
+        if cached is not None:
+            if session is not None:
+                session.add_turn(query, cached)
+            return cached
+    
     # Include system prompt in the messages
-    state = {"messages": [SystemMessage(content=financial_system_prompt), {"role": "user", "content": query}]}
-    response = agent.invoke(state)
+    state = _build_state(query, session)
+    with active_session(session), timed("llm"):
+        response = get_agent().invoke(state, config=agent_config())
     messages = response.get("messages")
     ai_messages = [message.content for message in messages if isinstance(message, AIMessage)]
+    tool_calls = [call for message in messages if isinstance(message, AIMessage) for call in message.tool_calls]
+    
+    if _use_response_cache(session):
+        response_cache.put(query, ai_messages[-1], tool_calls)
+    if session is not None:
+        session.add_turn(query, ai_messages[-1])
     return ai_messages[-1]
 
+def stream_agent_response(query, session_id=None) -> Iterator[Dict[str, Any]]:
+    """
+    Run the agent and yield progress events as they happen:
+    {"type": "token", "content": ...} for each generated token,
+    {"type": "tool_start", "name": ..., "args": ...} when the model calls a tool,
+    {"type": "tool_end", "name": ...} when a tool returns, and finally
+    {"type": "done", "response": ...} with the complete answer.
+    """
+    session = session_store.get_or_create(session_id) if session_id else None
+    
+    if _use_response_cache(session):
+        cached = response_cache.get(query)
+        if cached is not None:
+            if session is not None:
+                session.add_turn(query, cached)
+            yield {"type": "token", "content": cached}
+            yield {"type": "done", "response": cached, "cached": True}
+            return
+    
+    state = _build_state(query, session)
+    final_response = ""
+    tool_calls = []
+    
+    with active_session(session):
+        for mode, chunk in get_agent().stream(state, config=agent_config(), stream_mode=["messages", "updates"]):
+            if mode == "messages":
+                message, metadata = chunk
+                if metadata.get("langgraph_node") == "agent" and isinstance(message.content, str) and message.content:
+                    yield {"type": "token", "content": message.content}
+            
+            elif mode == "updates":
+                for node_update in chunk.values():
+                    for message in (node_update or {}).get("messages", []):
+                        if isinstance(message, AIMessage):
+                            for tool_call in message.tool_calls:
+                                tool_calls.append(tool_call)
+                                yield {"type": "tool_start", "name": tool_call["name"], "args": tool_call["args"]}
+                            if not message.tool_calls:
+                                final_response = message.content
+                        elif isinstance(message, ToolMessage):
+                            yield {"type": "tool_end", "name": message.name}
+    
+    if _use_response_cache(session) and final_response:
+        response_cache.put(query, final_response, tool_calls)
+    if session is not None and final_response:
+        session.add_turn(query, final_response)
+    yield {"type": "done", "response": final_response}
+
 def get_financial_report_json(symbol: str, benchmark: str = "^GSPC") -> Dict[str, Any]:
     """
     Direct function to get financial report in JSON format for Flask routes
@@ -310,3 +434,102 @@ def get_financial_report_json(symbol: str, benchmark: str = "^GSPC") -> Dict[str
         return json.loads(report_json_str)
     except Exception as e:
         return {"error": f"Failed to generate report: {str(e)}"}
+
+_report_pool = None
+_report_pool_lock = threading.Lock()
+
+def _init_report_worker():
+    # Reseed so workers started together do not draw the same Monte Carlo paths
+    np.random.seed()
+
+def _get_report_pool():
+    global _report_pool
+    if _report_pool is None:
+        with _report_pool_lock:
+            if _report_pool is None:
+                # Spawn rather than fork: forking the threaded server process can deadlock the child
+                _report_pool = ProcessPoolExecutor(max_workers=REPORT_PROCESS_WORKERS, mp_context=get_context("spawn"),
+                                                   initializer=_init_report_worker)
+    return _report_pool
+
+def _reset_report_pool(pool):
+    """Drop a broken pool (e.g. a worker was OOM-killed) so the next batch starts a new one"""
+    global _report_pool
+    with _report_pool_lock:
+        if _report_pool is pool:
+            _report_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def get_financial_reports_batch(symbols: List[str], benchmark: str = "^GSPC") -> Dict[str, Dict[str, Any]]:
+    """
+    Reports for several symbols at once. Price histories and info are loaded
+    concurrently (the benchmark only once), then the metric suite runs in
+    parallel on a process pool. Returns {symbol: report or {"error": ...}}.
+    If the benchmark cannot be loaded the reports leave out beta and CAPM.
+    """
+    def load(func, *args, **kwargs):
+        # Copy the context so fetch timings are attributed to the calling endpoint
+        return loader.submit(contextvars.copy_context().run, func, *args, **kwargs)
+    
+    with ThreadPoolExecutor(max_workers=min(8, len(symbols) + 1)) as loader:
+        benchmark_future = load(get_history, benchmark, period="2y")
+        hist_futures = {symbol: load(get_history, symbol, period="2y") for symbol in symbols}
+        info_futures = {symbol: load(get_info, symbol) for symbol in symbols}
+        try:
+            benchmark_hist = benchmark_future.result()
+        except Exception as e:
+            print(f"⚠️ Benchmark {benchmark} unavailable ({str(e)}), reporting without beta/CAPM")
+            benchmark_hist = None
+    
+    reports = {}
+    jobs = {}
+    for symbol in symbols:
+        try:
+            stock_hist = hist_futures[symbol].result()
+            if stock_hist.empty:
+                reports[symbol] = {"error": f"No data found for {symbol}"}
+                continue
+            jobs[symbol] = (symbol, stock_hist, benchmark_hist, info_futures[symbol].result(), benchmark)
+        except Exception as e:
+            reports[symbol] = {"error": f"Error generating financial report: {str(e)}"}
+    
+    with timed("report_compute"):
+        futures = {}
+        pool = None
+        try:
+            pool = _get_report_pool()
+            for symbol, args in jobs.items():
+                futures[pool.submit(compute_financial_report, *args)] = (symbol, time.perf_counter())
+        except Exception as e:
+            # Process pools are unavailable on some hosts; compute in-process instead
+            print(f"Report process pool unavailable ({str(e)}), computing in-process")
+            if isinstance(e, BrokenProcessPool):
+                _reset_report_pool(pool)
+            for future in futures:
+                future.cancel()
+            futures = {}
+        
+        # Worker processes cannot record metrics, so each report is timed here from submit to completion
+        broken = False
+        for future in as_completed(futures):
+            symbol, submitted = futures[future]
+            try:
+                reports[symbol] = future.result()
+                observe_stage("financial_report", time.perf_counter() - submitted)
+            except BrokenProcessPool:
+                broken = True
+            except Exception as e:
+                reports[symbol] = {"error": f"Error generating financial report: {str(e)}"}
+        if broken:
+            print("Report process pool broke, recomputing in-process")
+            _reset_report_pool(pool)
+        
+        for symbol, args in jobs.items():
+            if symbol in reports:
+                continue
+            try:
+                reports[symbol] = _timed_report(*args)
+            except Exception as e:
+                reports[symbol] = {"error": f"Error generating financial report: {str(e)}"}
+    
+    return {symbol: reports[symbol] for symbol in symbols}
@@ -3,112 +3,26 @@ Algorithmic Strategy Backtesting Engine
 Real market data backtesting with actual technical indicators
 """
 
-import yfinance as yf
+import os
+import json
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
 from datetime import datetime, timedelta
+import time
+from metrics import observe_stage
+from market_data import MemoCache, as_of_date
+from indicators import (
+    INDICATORS, IndicatorContext, compute_indicators,
+    calculate_sma, calculate_ema, calculate_rsi, calculate_macd, calculate_bollinger_bands
+)
+from signals import compile_conditions, series_env
+from fill_kernel import run_fills, REASONS, TRADE_BUY, T_BAR, T_TYPE, T_REASON, T_SHARES, T_PRICE, T_VALUE, T_PL, T_PL_PCT
 import warnings
 warnings.filterwarnings('ignore')
 
 
-def calculate_sma(data: pd.Series, period: int) -> pd.Series:
-    """Calculate Simple Moving Average"""
-    return data.rolling(window=period).mean()
-
-
-def calculate_ema(data: pd.Series, period: int) -> pd.Series:
-    """Calculate Exponential Moving Average"""
-    return data.ewm(span=period, adjust=False).mean()
-
-
-def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate Relative Strength Index"""
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
-    """Calculate MACD"""
-    ema_fast = data.ewm(span=fast, adjust=False).mean()
-    ema_slow = data.ewm(span=slow, adjust=False).mean()
-    macd = ema_fast - ema_slow
-    signal_line = macd.ewm(span=signal, adjust=False).mean()
-    histogram = macd - signal_line
-    
-    return {
-        'macd': macd,
-        'signal': signal_line,
-        'histogram': histogram
-    }
-
-
-def calculate_bollinger_bands(data: pd.Series, period: int = 20, std_dev: int = 2) -> Dict[str, pd.Series]:
-    """Calculate Bollinger Bands"""
-    sma = data.rolling(window=period).mean()
-    std = data.rolling(window=period).std()
-    upper_band = sma + (std * std_dev)
-    lower_band = sma - (std * std_dev)
-    
-    return {
-        'upper': upper_band,
-        'middle': sma,
-        'lower': lower_band
-    }
-
-
-def evaluate_condition(condition: Dict[str, Any], price: float, indicators: Dict[str, Any], prev_price: float) -> bool:
-    """Evaluate if a condition is met"""
-    condition_id = condition['id']
-    params = condition['params']
-    
-    if condition_id == 'crossover':
-        # Price crossover condition
-        indicator = params.get('indicator2', 'sma')
-        direction = params.get('direction', 'above')
-        
-        if indicator in indicators:
-            indicator_value = indicators[indicator]
-            if direction == 'above':
-                return price > indicator_value and prev_price <= indicator_value
-            else:
-                return price < indicator_value and prev_price >= indicator_value
-        return False
-    
-    elif condition_id == 'threshold':
-        # Threshold condition
-        indicator = params.get('indicator', 'rsi')
-        operator = params.get('operator', '<')
-        value = params.get('value', 30)
-        
-        if indicator in indicators:
-            indicator_value = indicators[indicator]
-            if operator == '<':
-                return indicator_value < value
-            elif operator == '>':
-                return indicator_value > value
-            elif operator == '=':
-                return abs(indicator_value - value) < 1
-        return False
-    
-    elif condition_id == 'priceChange':
-        # Price change percentage
-        percentage = params.get('percentage', 5)
-        direction = params.get('direction', 'up')
-        
-        change_pct = ((price - prev_price) / prev_price) * 100
-        if direction == 'up':
-            return change_pct >= percentage
-        else:
-            return change_pct <= -percentage
-    
-    return False
-
-
 def backtest_strategy(symbol: str, strategy_blocks: List[Dict[str, Any]], 
                      start_date: str = None, end_date: str = None,
                      initial_capital: float = 100000) -> Dict[str, Any]:
@@ -137,9 +51,9 @@ def backtest_strategy(symbol: str, strategy_blocks: List[Dict[str, Any]],
         symbol = f"{symbol}.NS"
     
     try:
-        # Fetch real market data
-        stock = yf.Ticker(symbol)
-        df = stock.history(start=start_date, end=end_date)
+        # Fetch real market data (shared, memoized per as-of date)
+        from market_data import get_history
+        df = get_history(symbol, start=start_date, end=end_date)
         
         if df.empty:
             return {
@@ -154,255 +68,192 @@ def backtest_strategy(symbol: str, strategy_blocks: List[Dict[str, Any]],
         
         # Calculate all indicators
         indicator_values = {}
+        indicator_start = time.perf_counter()
         
-        for ind in indicators:
-            ind_id = ind['id']
-            params = ind['params']
-            
-            if ind_id == 'sma':
-                period = params.get('period', 20)
-                indicator_values['sma'] = calculate_sma(df['Close'], period)
-            
-            elif ind_id == 'ema':
-                period = params.get('period', 20)
-                indicator_values['ema'] = calculate_ema(df['Close'], period)
-            
-            elif ind_id == 'rsi':
-                period = params.get('period', 14)
-                indicator_values['rsi'] = calculate_rsi(df['Close'], period)
-            
-            elif ind_id == 'macd':
-                fast = params.get('fast', 12)
-                slow = params.get('slow', 26)
-                signal = params.get('signal', 9)
-                macd_data = calculate_macd(df['Close'], fast, slow, signal)
-                indicator_values['macd'] = macd_data['macd']
-                indicator_values['macd_signal'] = macd_data['signal']
-                indicator_values['macd_histogram'] = macd_data['histogram']
-            
-            elif ind_id == 'bollinger':
-                period = params.get('period', 20)
-                std_dev = params.get('stdDev', 2)
-                bb_data = calculate_bollinger_bands(df['Close'], period, std_dev)
-                indicator_values['bb_upper'] = bb_data['upper']
-                indicator_values['bb_middle'] = bb_data['middle']
-                indicator_values['bb_lower'] = bb_data['lower']
+        # One dependency graph for all blocks: shared intermediates are computed once.
+        # Outputs are keyed per instance (sma_50) and by plain name (sma)
+        indicator_values.update(compute_indicators(IndicatorContext(df), indicators))
         
-        # Initialize tracking variables
-        capital = initial_capital
-        position = 0  # Number of shares held
-        entry_price = 0
-        trades = []
-        equity_curve = []
-        peak_equity = initial_capital
-        max_drawdown = 0
+        observe_stage("indicator_calc", time.perf_counter() - indicator_start)
         
-        # Find stop loss and take profit percentages
-        stop_loss_pct = None
-        take_profit_pct = None
+        # Conditions compile once into an expression over whole columns: one entry signal per bar
+        signal_start = time.perf_counter()
+        entry_signal = compile_conditions(conditions, set(indicator_values))(series_env(df, indicator_values))
+        observe_stage("signal_calc", time.perf_counter() - signal_start)
         
-        for action in actions:
-            if action['id'] == 'stopLoss':
-                stop_loss_pct = action['params'].get('percentage', 5) / 100
-            elif action['id'] == 'takeProfit':
-                take_profit_pct = action['params'].get('percentage', 10) / 100
+        # Stop loss / take profit and fills: one sequential pass over plain arrays
+        loop_start = time.perf_counter()
+        equity, capital_curve, position_curve, fills, capital, max_drawdown = run_fills(
+            df['Close'].to_numpy(dtype=float), entry_signal, actions, initial_capital
+        )
+        observe_stage("backtest_loop", time.perf_counter() - loop_start)
         
-        # Run backtest day by day
-        for i in range(1, len(df)):
-            date = df.index[i]
-            price = df['Close'].iloc[i]
-            prev_price = df['Close'].iloc[i-1]
-            
-            # Get current indicator values
-            current_indicators = {}
-            for ind_name, ind_series in indicator_values.items():
-                if i < len(ind_series):
-                    current_indicators[ind_name] = ind_series.iloc[i]
-            
-            # Check stop loss and take profit if holding position
-            if position > 0:
-                current_pl_pct = (price - entry_price) / entry_price
-                
-                # Stop loss
-                if stop_loss_pct and current_pl_pct <= -stop_loss_pct:
-                    capital += position * price
-                    pl = (price - entry_price) * position
-                    trades.append({
-                        'date': date.strftime('%Y-%m-%d'),
-                        'type': 'SELL',
-                        'reason': 'Stop Loss',
-                        'shares': position,
-                        'price': round(price, 2),
-                        'pl': round(pl, 2),
-                        'pl_pct': round(current_pl_pct * 100, 2)
-                    })
-                    position = 0
-                    entry_price = 0
-                
-                # Take profit
-                elif take_profit_pct and current_pl_pct >= take_profit_pct:
-                    capital += position * price
-                    pl = (price - entry_price) * position
-                    trades.append({
-                        'date': date.strftime('%Y-%m-%d'),
-                        'type': 'SELL',
-                        'reason': 'Take Profit',
-                        'shares': position,
-                        'price': round(price, 2),
-                        'pl': round(pl, 2),
-                        'pl_pct': round(current_pl_pct * 100, 2)
-                    })
-                    position = 0
-                    entry_price = 0
-            
-            # Evaluate conditions
-            conditions_met = True
-            if conditions:
-                conditions_met = all(
-                    evaluate_condition(cond, price, current_indicators, prev_price)
-                    for cond in conditions
-                )
-            
-            # Execute actions if conditions met
-            if conditions_met:
-                for action in actions:
-                    action_id = action['id']
-                    params = action['params']
-                    
-                    if action_id == 'buy' and position == 0:
-                        # Buy action
-                        quantity_type = params.get('quantity', 'percentage')
-                        value = params.get('value', 10)
-                        
-                        if quantity_type == 'percentage':
-                            amount_to_invest = capital * (value / 100)
-                        else:
-                            amount_to_invest = min(value * price, capital)
-                        
-                        shares_to_buy = int(amount_to_invest / price)
-                        
-                        if shares_to_buy > 0:
-                            cost = shares_to_buy * price
-                            capital -= cost
-                            position = shares_to_buy
-                            entry_price = price
-                            
-                            trades.append({
-                                'date': date.strftime('%Y-%m-%d'),
-                                'type': 'BUY',
-                                'reason': 'Strategy Signal',
-                                'shares': shares_to_buy,
-                                'price': round(price, 2),
-                                'cost': round(cost, 2)
-                            })
-                    
-                    elif action_id == 'sell' and position > 0:
-                        # Sell action
-                        quantity = params.get('quantity', 'all')
-                        
-                        if quantity == 'all':
-                            shares_to_sell = position
-                        else:
-                            shares_to_sell = int(position * 0.5)
-                        
-                        revenue = shares_to_sell * price
-                        capital += revenue
-                        pl = (price - entry_price) * shares_to_sell
-                        pl_pct = ((price - entry_price) / entry_price) * 100
-                        
-                        trades.append({
-                            'date': date.strftime('%Y-%m-%d'),
-                            'type': 'SELL',
-                            'reason': 'Strategy Signal',
-                            'shares': shares_to_sell,
-                            'price': round(price, 2),
-                            'pl': round(pl, 2),
-                            'pl_pct': round(pl_pct, 2)
-                        })
-                        
-                        position -= shares_to_sell
-                        if position == 0:
-                            entry_price = 0
-            
-            # Calculate current equity
-            current_equity = capital + (position * price)
-            equity_curve.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'equity': round(current_equity, 2),
-                'capital': round(capital, 2),
-                'position_value': round(position * price, 2)
-            })
-            
-            # Track max drawdown
-            if current_equity > peak_equity:
-                peak_equity = current_equity
-            drawdown = (peak_equity - current_equity) / peak_equity
-            max_drawdown = max(max_drawdown, drawdown)
+        dates = df.index.strftime('%Y-%m-%d')
+        report = _backtest_report(lambda i: dates[i], df['Close'].to_numpy(dtype=float), equity, capital_curve,
+                                  position_curve, fills, capital, max_drawdown, initial_capital,
+                                  periods_per_year=252)
         
-        # Close any open position at the end
-        if position > 0:
-            final_price = df['Close'].iloc[-1]
-            capital += position * final_price
-            pl = (final_price - entry_price) * position
-            pl_pct = ((final_price - entry_price) / entry_price) * 100
-            
-            trades.append({
-                'date': df.index[-1].strftime('%Y-%m-%d'),
-                'type': 'SELL',
-                'reason': 'End of Backtest',
-                'shares': position,
-                'price': round(final_price, 2),
-                'pl': round(pl, 2),
-                'pl_pct': round(pl_pct, 2)
-            })
-            position = 0
+        return {
+            "success": True,
+            "symbol": symbol,
+            "period": f"{start_date} to {end_date}",
+            "initial_capital": initial_capital,
+            **report
+        }
+    
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+def _backtest_report(label: Callable[[int], str], close: np.ndarray, equity: np.ndarray,
+                     capital_curve: np.ndarray, position_curve: np.ndarray, fills: np.ndarray,
+                     capital: float, max_drawdown: float, initial_capital: float,
+                     periods_per_year: int) -> Dict[str, Any]:
+    """Trades, the last 100 bars of the equity curve and the metrics, from the fill kernel's arrays"""
+    n = len(close)
+    equity_values = np.round(equity[1:], 2)
+    
+    trades = []
+    for bar, kind, reason, shares, price, value, pl, pl_pct in zip(
+            fills[:, T_BAR].astype(int), fills[:, T_TYPE], fills[:, T_REASON], fills[:, T_SHARES].astype(int),
+            np.round(fills[:, T_PRICE], 2), np.round(fills[:, T_VALUE], 2),
+            np.round(fills[:, T_PL], 2), np.round(fills[:, T_PL_PCT], 2)):
+        if kind == TRADE_BUY:
+            trades.append({'date': label(bar), 'type': 'BUY', 'reason': REASONS[int(reason)],
+                           'shares': int(shares), 'price': price, 'cost': value})
+        else:
+            trades.append({'date': label(bar), 'type': 'SELL', 'reason': REASONS[int(reason)],
+                           'shares': int(shares), 'price': price, 'pl': pl, 'pl_pct': pl_pct})
+    
+    # Only the last 100 bars are sent to the frontend
+    tail = range(max(1, n - 100), n)
+    equity_curve = [{
+        'date': label(i),
+        'equity': equity_values[i - 1],
+        'capital': np.round(capital_curve[i], 2),
+        'position_value': np.round(position_curve[i] * close[i], 2)
+    } for i in tail]
+    
+    # Calculate metrics
+    final_equity = capital  # open positions were closed on the last bar
+    total_return = ((final_equity - initial_capital) / initial_capital) * 100
+    
+    # Calculate win rate
+    sell_trades = [t for t in trades if t['type'] == 'SELL' and 'pl' in t]
+    winning_trades = [t for t in sell_trades if t['pl'] > 0]
+    win_rate = (len(winning_trades) / len(sell_trades) * 100) if sell_trades else 0
+    
+    # Calculate Sharpe ratio (simplified)
+    if len(equity_values) > 1:
+        returns = pd.Series(equity_values).pct_change().dropna()
+        if len(returns) > 0 and returns.std() > 0:
+            sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(periods_per_year)
+        else:
+            sharpe_ratio = 0
+    else:
+        sharpe_ratio = 0
+    
+    # Calculate profit factor
+    total_profit = sum([t['pl'] for t in sell_trades if t['pl'] > 0]) if sell_trades else 0
+    total_loss = abs(sum([t['pl'] for t in sell_trades if t['pl'] < 0])) if sell_trades else 0
+    profit_factor = total_profit / total_loss if total_loss > 0 else (total_profit if total_profit > 0 else 1)
+    
+    return {
+        "final_equity": round(final_equity, 2),
+        "metrics": {
+            "total_return": round(total_return, 2),
+            "total_return_amount": round(final_equity - initial_capital, 2),
+            "final_capital": round(final_equity, 2),
+            "win_rate": round(win_rate, 2),
+            "total_trades": len(trades),
+            "winning_trades": len(winning_trades),
+            "losing_trades": len(sell_trades) - len(winning_trades),
+            "sharpe_ratio": round(sharpe_ratio, 2),
+            "max_drawdown": round(max_drawdown * 100, 2),
+            "profit_factor": round(profit_factor, 2),
+            "avg_trade": round(total_return / len(sell_trades), 2) if sell_trades else 0
+        },
+        "equity_curve": equity_curve,
+        "trades": trades[-50:],  # Last 50 trades
+        "total_trades_count": len(trades)
+    }
+
+
+def backtest_intraday(symbol: str, strategy_blocks: List[Dict[str, Any]], interval: str = "5m",
+                      start_date: str = None, end_date: str = None,
+                      initial_capital: float = 100000, store=None, sync: bool = True) -> Dict[str, Any]:
+    """
+    Run a backtest on 1m/5m/15m bars from the intraday store, through the same
+    indicator graph, signal compiler and fill kernel as backtest_strategy.
+    Rolling indicator windows stay within one trading session (see
+    indicators.py). The store is synced from the market data provider first
+    (unless `sync` is False), which only reaches back a few days (1m) to two months (5m/15m); older
+    bars are whatever the store has collected.
+    """
+    from intraday_store import INTRADAY_INTERVALS, intraday_store, bars_per_session
+    
+    if interval not in INTRADAY_INTERVALS:
+        return {"success": False,
+                "error": f"Unsupported interval '{interval}'. Supported: {', '.join(INTRADAY_INTERVALS)}"}
+    if not end_date:
+        end_date = (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+    if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
+        symbol = f"{symbol}.NS"
+    store = store or intraday_store
+    
+    try:
+        if sync:
+            try:
+                store.sync(symbol, interval)
+            except Exception as e:
+                # Backtest on the bars already stored
+                print(f"⚠️ Intraday sync failed for {symbol} {interval}: {str(e)}")
+        bars = store.load(symbol, interval, start=start_date, end=end_date)
+        if len(bars) == 0:
+            return {
+                "success": False,
+                "error": f"No {interval} data available for {symbol}. Check symbol or date range."
+            }
         
-        # Calculate metrics
-        final_equity = capital + (position * df['Close'].iloc[-1])
-        total_return = ((final_equity - initial_capital) / initial_capital) * 100
+        indicators = [b for b in strategy_blocks if b.get('type') == 'indicator']
+        conditions = [b for b in strategy_blocks if b.get('type') == 'condition']
+        actions = [b for b in strategy_blocks if b.get('type') == 'action']
         
-        # Calculate win rate
-        sell_trades = [t for t in trades if t['type'] == 'SELL' and 'pl' in t]
-        winning_trades = [t for t in sell_trades if t['pl'] > 0]
-        win_rate = (len(winning_trades) / len(sell_trades) * 100) if sell_trades else 0
+        # Only this window leaves the memory map, as float64 columns
+        columns = bars.columns()
         
-        # Calculate Sharpe ratio (simplified)
-        if len(equity_curve) > 1:
-            returns = pd.Series([equity_curve[i]['equity'] for i in range(len(equity_curve))]).pct_change().dropna()
-            if len(returns) > 0 and returns.std() > 0:
-                sharpe_ratio = (returns.mean() / returns.std()) * np.sqrt(252)
-            else:
-                sharpe_ratio = 0
-        else:
-            sharpe_ratio = 0
+        indicator_start = time.perf_counter()
+        indicator_values = compute_indicators(IndicatorContext(columns, sessions=bars.sessions), indicators)
+        observe_stage("indicator_calc", time.perf_counter() - indicator_start)
+        
+        signal_start = time.perf_counter()
+        entry_signal = compile_conditions(conditions, set(indicator_values))(series_env(columns, indicator_values))
+        observe_stage("signal_calc", time.perf_counter() - signal_start)
         
-        # Calculate profit factor
-        total_profit = sum([t['pl'] for t in sell_trades if t['pl'] > 0]) if sell_trades else 0
-        total_loss = abs(sum([t['pl'] for t in sell_trades if t['pl'] < 0])) if sell_trades else 0
-        profit_factor = total_profit / total_loss if total_loss > 0 else (total_profit if total_profit > 0 else 1)
+        loop_start = time.perf_counter()
+        equity, capital_curve, position_curve, fills, capital, max_drawdown = run_fills(
+            columns['Close'], entry_signal, actions, initial_capital
+        )
+        observe_stage("backtest_loop", time.perf_counter() - loop_start)
+        
+        report = _backtest_report(bars.label, columns['Close'], equity, capital_curve, position_curve, fills,
+                                  capital, max_drawdown, initial_capital,
+                                  periods_per_year=252 * bars_per_session(interval))
         
         return {
             "success": True,
             "symbol": symbol,
-            "period": f"{start_date} to {end_date}",
+            "interval": interval,
+            "period": f"{bars.label(0)} to {bars.label(len(bars) - 1)}",
+            "bars": len(bars),
+            "sessions": int(len(np.unique(bars.sessions))),
             "initial_capital": initial_capital,
-            "final_equity": round(final_equity, 2),
-            "metrics": {
-                "total_return": round(total_return, 2),
-                "total_return_amount": round(final_equity - initial_capital, 2),
-                "final_capital": round(final_equity, 2),
-                "win_rate": round(win_rate, 2),
-                "total_trades": len(trades),
-                "winning_trades": len(winning_trades),
-                "losing_trades": len(sell_trades) - len(winning_trades),
-                "sharpe_ratio": round(sharpe_ratio, 2),
-                "max_drawdown": round(max_drawdown * 100, 2),
-                "profit_factor": round(profit_factor, 2),
-                "avg_trade": round(total_return / len(sell_trades), 2) if sell_trades else 0
-            },
-            "equity_curve": equity_curve[-100:],  # Last 100 days for frontend
-            "trades": trades[-50:],  # Last 50 trades
-            "total_trades_count": len(trades)
+            **report
         }
     
     except Exception as e:
@@ -436,3 +287,179 @@ def get_indian_stocks() -> List[Dict[str, str]]:
         {"symbol": "NESTLEIND.NS", "name": "Nestle India"},
         {"symbol": "TECHM.NS", "name": "Tech Mahindra"}
     ]
+
+
+BACKTEST_CACHE_SIZE = int(os.getenv("BACKTEST_CACHE_SIZE", "256"))
+BACKTEST_CACHE_TTL = float(os.getenv("BACKTEST_CACHE_TTL", "86400"))  # seconds, within one as-of date
+
+# Named strategies offered on the Backtest page, as Algo Builder blocks
+STRATEGY_TEMPLATES = {
+    "Simple Moving Average Crossover": [
+        {"type": "indicator", "id": "sma", "params": {"period": 50}},
+        {"type": "condition", "id": "crossover", "params": {"indicator2": "sma", "direction": "above"}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}},
+        {"type": "action", "id": "stopLoss", "params": {"percentage": 8}},
+        {"type": "action", "id": "takeProfit", "params": {"percentage": 15}}
+    ],
+    "RSI Mean Reversion": [
+        {"type": "indicator", "id": "rsi", "params": {"period": 14}},
+        {"type": "condition", "id": "threshold", "params": {"indicator": "rsi", "operator": "<", "value": 30}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}},
+        {"type": "action", "id": "stopLoss", "params": {"percentage": 5}},
+        {"type": "action", "id": "takeProfit", "params": {"percentage": 10}}
+    ],
+    "Bollinger Bands": [
+        {"type": "indicator", "id": "bollinger", "params": {"period": 20, "stdDev": 2}},
+        {"type": "condition", "id": "crossover", "params": {"indicator2": "bb_lower", "direction": "below"}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}},
+        {"type": "action", "id": "stopLoss", "params": {"percentage": 5}},
+        {"type": "action", "id": "takeProfit", "params": {"percentage": 8}}
+    ],
+    "Buy and Hold": [
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}}
+    ]
+}
+
+# Display names used on the Backtest page
+SYMBOL_ALIASES = {
+    "HDFC BANK": "HDFCBANK",
+    "ICICI BANK": "ICICIBANK",
+    "INFOSYS": "INFY",
+    "BHARTI AIRTEL": "BHARTIARTL",
+    "ASIAN PAINTS": "ASIANPAINT",
+    "BAJAJ FINANCE": "BAJFINANCE"
+}
+
+# Parameter defaults the engine applies, so {} and {"period": 14} hash the same
+DEFAULT_PARAMS = {
+    **{("indicator", name): dict(indicator.defaults) for name, indicator in INDICATORS.items()},
+    ("condition", "crossover"): {"indicator1": "price", "indicator2": "sma", "direction": "above"},
+    ("condition", "threshold"): {"indicator": "rsi", "operator": "<", "value": 30},
+    ("condition", "priceChange"): {"percentage": 5, "direction": "up"},
+    ("action", "buy"): {"quantity": "percentage", "value": 10},
+    ("action", "sell"): {"quantity": "all"},
+    ("action", "stopLoss"): {"percentage": 5},
+    ("action", "takeProfit"): {"percentage": 10}
+}
+
+
+def normalize_symbol(symbol: str) -> str:
+    """RELIANCE, "HDFC BANK" or TCS.NS -> Yahoo Finance NSE ticker"""
+    symbol = symbol.strip().upper()
+    symbol = SYMBOL_ALIASES.get(symbol, symbol)
+    if not symbol.endswith('.NS') and not symbol.endswith('.BO'):
+        symbol = f"{symbol}.NS"
+    return symbol
+
+
+def _canonical_value(value):
+    # 14.0 and 14 are the same parameter
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def normalize_strategy_blocks(strategy_blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Canonical form of a strategy: only type/id/params, engine defaults filled
+    in, and blocks whose order does not change the result sorted
+    """
+    normalized = {"indicator": [], "condition": [], "action": []}
+    for block in strategy_blocks:
+        block_type, block_id = block.get('type'), block.get('id')
+        if block_type not in normalized:
+            continue
+        params = dict(DEFAULT_PARAMS.get((block_type, block_id), {}))
+        params.update(block.get('params') or {})
+        normalized[block_type].append({
+            "type": block_type,
+            "id": block_id,
+            "params": {k: _canonical_value(v) for k, v in sorted(params.items())}
+        })
+
+    # Conditions are ANDed, so their order is irrelevant; indicators with the
+    # same id keep their order (the plain name refers to the later one), and
+    # actions run in the order given
+    normalized["condition"].sort(key=lambda b: json.dumps(b, sort_keys=True))
+    normalized["indicator"].sort(key=lambda b: b["id"])
+    return normalized["indicator"] + normalized["condition"] + normalized["action"]
+
+
+def strategy_hash(symbol: str, strategy_blocks: List[Dict[str, Any]], start_date: str,
+                  end_date: str, initial_capital: float, interval: str = "1d") -> str:
+    """Stable hash of everything that determines a backtest result"""
+    key = {
+        "symbol": normalize_symbol(symbol),
+        "blocks": normalize_strategy_blocks(strategy_blocks),
+        "start": start_date,
+        "end": end_date,
+        "capital": _canonical_value(float(initial_capital))
+    }
+    if interval != "1d":
+        key["interval"] = interval  # daily hashes are unchanged
+    canonical = json.dumps(key, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+_backtest_cache = MemoCache(BACKTEST_CACHE_SIZE, BACKTEST_CACHE_TTL)
+
+
+def run_backtest_cached(symbol: str, strategy_blocks: Optional[List[Dict[str, Any]]] = None,
+                        start_date: str = None, end_date: str = None,
+                        initial_capital: float = 100000, strategy: str = None,
+                        interval: str = "1d") -> Dict[str, Any]:
+    """
+    backtest_strategy with results shared across users: identical strategies
+    (after normalization) on the same symbol, dates and capital are simulated
+    once per as-of date. `strategy` names one of STRATEGY_TEMPLATES instead of
+    passing blocks. An intraday `interval` (1m/5m/15m) runs backtest_intraday,
+    cached until the store receives new bars.
+    """
+    if strategy is not None:
+        if strategy not in STRATEGY_TEMPLATES:
+            return {"success": False, "error": f"Unknown strategy. Supported: {', '.join(STRATEGY_TEMPLATES)}"}
+        strategy_blocks = STRATEGY_TEMPLATES[strategy]
+    if not strategy_blocks:
+        return {"success": False, "error": "Strategy blocks are required"}
+
+    symbol = normalize_symbol(symbol)
+    blocks = normalize_strategy_blocks(strategy_blocks)
+    interval = interval or "1d"
+
+    if interval != "1d":
+        from intraday_store import INTRADAY_INTERVALS, intraday_store
+        if interval not in INTRADAY_INTERVALS:
+            return {"success": False,
+                    "error": f"Unsupported interval '{interval}'. Supported: 1d, {', '.join(INTRADAY_INTERVALS)}"}
+        end_date = end_date or (datetime.now() + timedelta(days=1)).strftime('%Y-%m-%d')
+        start_date = start_date or (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%d')
+        try:
+            intraday_store.sync(symbol, interval)
+        except Exception as e:
+            print(f"⚠️ Intraday sync failed for {symbol} {interval}: {str(e)}")
+        version = intraday_store.count(symbol, interval)
+
+        def run():
+            return backtest_intraday(symbol, blocks, interval=interval, start_date=start_date,
+                                     end_date=end_date, initial_capital=initial_capital, sync=False)
+    else:
+        # Resolve the default dates first so they are part of the key
+        end_date = end_date or datetime.now().strftime('%Y-%m-%d')
+        start_date = start_date or (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
+        version = as_of_date()
+
+        def run():
+            return backtest_strategy(symbol, blocks, start_date=start_date, end_date=end_date,
+                                     initial_capital=initial_capital)
+
+    key_hash = strategy_hash(symbol, blocks, start_date, end_date, initial_capital, interval)
+    computed = []
+
+    def compute():
+        computed.append(True)
+        return run()
+
+    result = _backtest_cache.get_or_compute(
+        ("backtest", key_hash, version), compute, lambda r: r.get("success", False)
+    )
+    return {**result, "strategy_hash": key_hash, "cached": not computed}
@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""
+Offline Benchmark Suite
+Times the backtester, technical indicators, Monte Carlo simulation, asset
+allocation, paper portfolio valuation, intraday backtests and the Flask endpoints against synthetic (or recorded) price
+fixtures, so performance changes can be measured without network access.
+Results are saved as JSON and can be compared against an earlier run.
+
+Usage:
+    python benchmark.py                          # run everything, save results
+    python benchmark.py --only backtest,indicators
+    python benchmark.py --replay                 # recorded fixtures (see market_data)
+    python benchmark.py --record                 # capture fixtures from Yahoo Finance
+    python benchmark.py --compare benchmark_results/baseline.json
+"""
+
+import os
+
+# Keep the chat endpoints off the network
+os.environ.setdefault("LLM_PROVIDER", "stub")
+os.environ.setdefault("STUB_LLM_LATENCY_MS", "0")
+os.environ.setdefault("STUB_SEARCH_LATENCY_MS", "0")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+
+import sys
+import json
+import time
+import zlib
+import argparse
+import platform
+import statistics
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+import numpy as np
+import pandas as pd
+
+import market_data
+
+BENCHMARK_END_DATE = "2024-12-31"  # fixed so runs are comparable
+BACKTEST_YEARS = (1, 5, 10, 20)
+MONTE_CARLO_PATHS = (100, 1000, 10000)
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_results")
+
+BENCHMARK_SYMBOLS = ("RELIANCE.NS", "TCS.NS", "INFY.NS", "^NSEI")
+PORTFOLIO_ACCOUNTS = (100, 5000)
+INTRADAY_DAYS = 182  # calendar days of 1m bars per symbol
+INTRADAY_WINDOWS = {"1_week": 7, "1_month": 30, "6_months": 182}
+
+
+class SyntheticProvider:
+    """
+    Deterministic daily OHLCV prices (geometric Brownian motion) seeded by the
+    symbol, ending on BENCHMARK_END_DATE
+    """
+
+    def __init__(self, end_date: str = BENCHMARK_END_DATE):
+        self.end_date = pd.Timestamp(end_date)
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def _frame(self, symbol: str) -> pd.DataFrame:
+        if symbol not in self._frames:
+            # Generate from a fixed origin so overlapping windows see the same prices
+            index = pd.bdate_range("1995-01-02", self.end_date, tz="Asia/Kolkata")
+            rng = np.random.default_rng(zlib.crc32(symbol.encode()))
+            returns = rng.normal(0.0004, 0.015, len(index))
+            close = 100 * np.cumprod(1 + returns)
+            spread = np.abs(rng.normal(0, 0.01, len(index)))
+            self._frames[symbol] = pd.DataFrame({
+                "Open": close * (1 + rng.normal(0, 0.003, len(index))),
+                "High": close * (1 + spread),
+                "Low": close * (1 - spread),
+                "Close": close,
+                "Volume": rng.integers(100_000, 5_000_000, len(index))
+            }, index=index)
+        return self._frames[symbol]
+
+    def history(self, symbol: str, period: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        return market_data.slice_history(self._frame(symbol), period=period, start=start, end=end)
+
+    def intraday(self, symbol: str, interval: str, period: str) -> pd.DataFrame:
+        """Session bars (09:15-15:30 IST) on business days in the `period` days up to the end date"""
+        from intraday_store import INTRADAY_INTERVALS, bars_per_session
+        days = pd.bdate_range(self.end_date - pd.Timedelta(days=int(period.rstrip("d")) - 1), self.end_date)
+        per_session = bars_per_session(interval)
+        offsets = pd.to_timedelta(np.arange(per_session) * INTRADAY_INTERVALS[interval], unit="s")
+        starts = days.tz_localize("Asia/Kolkata") + pd.Timedelta(hours=9, minutes=15)
+        index = pd.DatetimeIndex((starts.values[:, None] + offsets.values[None, :]).ravel(), tz="UTC")
+        index = index.tz_convert("Asia/Kolkata")
+
+        rng = np.random.default_rng(zlib.crc32(f"{symbol}/{interval}/{period}".encode()))
+        volatility = 0.015 / np.sqrt(per_session)
+        close = 100 * np.cumprod(1 + rng.normal(0, volatility, len(index)))
+        spread = np.abs(rng.normal(0, volatility, len(index)))
+        return pd.DataFrame({
+            "Open": close * (1 + rng.normal(0, volatility / 3, len(index))),
+            "High": close * (1 + spread),
+            "Low": close * (1 - spread),
+            "Close": close,
+            "Volume": rng.integers(1_000, 50_000, len(index))
+        }, index=index)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        return {
+            "longName": f"{symbol} Synthetic Ltd",
+            "sector": "Technology",
+            "industry": "Software",
+            "marketCap": 1_000_000_000,
+            "currency": "INR"
+        }
+
+
+def measure(func: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Run func repeatedly and summarize wall time in milliseconds"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(samples), 3),
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "repeat": repeat
+    }
+
+
+def _strategy_blocks() -> List[Dict[str, Any]]:
+    """RSI mean-reversion with an SMA filter, as built in the Algo Builder"""
+    return [
+        {"type": "indicator", "id": "rsi", "params": {"period": 14}},
+        {"type": "indicator", "id": "sma", "params": {"period": 50}},
+        {"type": "indicator", "id": "macd", "params": {"fast": 12, "slow": 26, "signal": 9}},
+        {"type": "indicator", "id": "bollinger", "params": {"period": 20, "stdDev": 2}},
+        {"type": "condition", "id": "threshold", "params": {"indicator": "rsi", "operator": "<", "value": 30}},
+        {"type": "condition", "id": "crossover", "params": {"indicator": "sma", "direction": "above"}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 20}}
+    ]
+
+
+def bench_backtest(repeat: int) -> Dict[str, Any]:
+    from algo_backtest import backtest_strategy
+    results = {}
+    end = pd.Timestamp(BENCHMARK_END_DATE)
+    for years in BACKTEST_YEARS:
+        start = (end - pd.DateOffset(years=years)).strftime("%Y-%m-%d")
+
+        def run():
+            result = backtest_strategy("RELIANCE.NS", _strategy_blocks(), start_date=start,
+                                       end_date=BENCHMARK_END_DATE, initial_capital=100000)
+            if not result.get("success"):
+                raise RuntimeError(result.get("error"))
+            return result
+
+        timing = measure(run, repeat=repeat)
+        timing["bars"] = len(market_data.get_history("RELIANCE.NS", start=start, end=BENCHMARK_END_DATE))
+        results[f"{years}y"] = timing
+    return results
+
+
+def bench_indicators(repeat: int) -> Dict[str, Any]:
+    import algo_backtest
+    from indicators import IndicatorContext, compute_indicator, compute_indicators
+    df = market_data.get_history("RELIANCE.NS", period="max")
+    close = df["Close"]
+    cases = {
+        "calculate_sma": lambda: algo_backtest.calculate_sma(close, 20),
+        "calculate_ema": lambda: algo_backtest.calculate_ema(close, 20),
+        "calculate_rsi": lambda: algo_backtest.calculate_rsi(close, 14),
+        "calculate_macd": lambda: algo_backtest.calculate_macd(close, 12, 26, 9),
+        "calculate_bollinger_bands": lambda: algo_backtest.calculate_bollinger_bands(close, 20, 2)
+    }
+    # OHLCV indicators, each on a fresh context so their intermediates are included
+    for name in ("atr", "stochastic", "adx", "obv", "vwap", "supertrend"):
+        cases[name] = lambda name=name: compute_indicator(IndicatorContext(df), name)
+    # Several blocks in one graph, as a strategy would use them
+    blocks = [{"id": name, "params": {}} for name in ("sma", "ema", "macd", "bollinger", "atr", "adx", "supertrend")]
+    cases["strategy indicators (one graph)"] = lambda: compute_indicators(IndicatorContext(df), blocks)
+    results = {name: measure(func, repeat=repeat) for name, func in cases.items()}
+    for timing in results.values():
+        timing["bars"] = len(close)
+    return results
+
+
+def bench_monte_carlo(repeat: int) -> Dict[str, Any]:
+    from ai_agent import monte_carlo_simulation
+    returns = market_data.get_history("RELIANCE.NS", period="2y")["Close"].pct_change().dropna()
+    results = {}
+    for paths in MONTE_CARLO_PATHS:
+        np.random.seed(42)
+        results[f"{paths}_paths"] = measure(lambda: monte_carlo_simulation(returns, days=252, simulations=paths),
+                                            repeat=repeat)
+    return results
+
+
+def bench_allocation(repeat: int) -> Dict[str, Any]:
+    from risk_assessment import suggest_asset_allocation
+    answers = {i: 7 for i in range(1, 11)}
+    results = {}
+    for profile, age in (("conservative", 55), ("moderate", 40), ("aggressive", 25)):
+        results[profile] = measure(lambda: suggest_asset_allocation(profile, age, 10, answers), repeat=repeat * 20)
+    return results
+
+
+def bench_endpoints(repeat: int) -> Dict[str, Any]:
+    from main import app
+    client = app.test_client()
+    risk_answers = [{"question_id": i, "score": 7} for i in range(1, 11)]
+    holdings = [
+        {"symbol": f"STOCK{i}", "quantity": 10 + i, "avg_price": 100 + i * 7, "current_price": 110 + i * 5}
+        for i in range(20)
+    ]
+
+    def cold_report():
+        # Reports are memoized; drop the cache so each run computes one
+        market_data.clear_cache()
+        return client.post("/generate_report", json={"symbol": "INFY.NS", "benchmark": "^NSEI"})
+
+    cases = {
+        "GET /health": lambda: client.get("/health"),
+        "GET /risk_questions": lambda: client.get("/risk_questions"),
+        "POST /calculate_risk_profile": lambda: client.post(
+            "/calculate_risk_profile", json={"answers": risk_answers, "age": 30, "investment_horizon": 10}),
+        "POST /analyze_portfolio_risk": lambda: client.post("/analyze_portfolio_risk", json={"holdings": holdings}),
+        "POST /generate_report": cold_report,
+        "POST /generate_report (cached)": lambda: client.post(
+            "/generate_report", json={"symbol": "INFY.NS", "benchmark": "^NSEI"}),
+        "POST /algo_backtest": lambda: client.post("/algo_backtest", json={
+            "symbol": "TCS.NS", "strategy_blocks": _strategy_blocks(),
+            "start_date": "2019-12-31", "end_date": BENCHMARK_END_DATE}),
+        "POST /get_response": lambda: client.post("/get_response", json={"query": "What is a P/E ratio?"})
+    }
+    results = {}
+    for name, func in cases.items():
+        status = func().status_code
+        results[name] = measure(func, repeat=repeat)
+        results[name]["status"] = status
+    return results
+
+
+def bench_portfolio(repeat: int) -> Dict[str, Any]:
+    import tempfile
+    from algo_backtest import get_indian_stocks
+    from portfolio_service import PortfolioService
+    symbols = [stock["symbol"] for stock in get_indian_stocks()]
+    rng = np.random.default_rng(42)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for accounts in PORTFOLIO_ACCOUNTS:
+            service = PortfolioService(os.path.join(directory, f"portfolio_{accounts}.db"))
+            conn = service._conn()
+            users = [f"user{i}" for i in range(accounts)]
+            conn.executemany("INSERT INTO portfolios VALUES (?, ?, ?)",
+                             [(u, 50_000.0, BENCHMARK_END_DATE) for u in users])
+            conn.executemany("INSERT INTO positions VALUES (?, ?, ?, ?)", [
+                (u, s, int(rng.integers(1, 100)), float(rng.uniform(50, 500)))
+                for u in users for s in rng.choice(symbols, size=5, replace=False)
+            ])
+            service.prices.get(symbols)  # prices are shared; time the valuation itself
+            results[f"{accounts}_accounts"] = measure(service.mark_to_market, repeat=repeat)
+            results[f"{accounts}_accounts"]["positions"] = accounts * 5
+    return results
+
+
+def _intraday_blocks() -> List[Dict[str, Any]]:
+    """Session VWAP pullback with an RSI filter"""
+    return [
+        {"type": "indicator", "id": "vwap", "params": {"period": 0}},
+        {"type": "indicator", "id": "rsi", "params": {"period": 14}},
+        {"type": "indicator", "id": "ema", "params": {"period": 20}},
+        {"type": "condition", "id": "crossover", "params": {"indicator2": "vwap", "direction": "above"}},
+        {"type": "condition", "id": "threshold", "params": {"indicator": "rsi", "operator": "<", "value": 60}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}},
+        {"type": "action", "id": "stopLoss", "params": {"percentage": 1}},
+        {"type": "action", "id": "takeProfit", "params": {"percentage": 2}}
+    ]
+
+
+def bench_intraday(repeat: int) -> Dict[str, Any]:
+    """1m bars for the benchmark stocks in a fresh intraday store: ingest, then backtests per window"""
+    import tempfile
+    from algo_backtest import backtest_intraday
+    from intraday_store import IntradayStore
+    provider = SyntheticProvider()
+    symbols = [s for s in BENCHMARK_SYMBOLS if not s.startswith("^")]
+    end = pd.Timestamp(BENCHMARK_END_DATE) + pd.Timedelta(days=1)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        frames = {symbol: provider.intraday(symbol, "1m", f"{INTRADAY_DAYS}d") for symbol in symbols}
+        start = time.perf_counter()
+        for symbol, frame in frames.items():
+            store.append(symbol, "1m", frame)
+        elapsed = (time.perf_counter() - start) * 1000
+        results["ingest"] = {"median_ms": round(elapsed, 3), "mean_ms": round(elapsed, 3), "max_ms": round(elapsed, 3),
+                             "repeat": 1, "bars": sum(len(f) for f in frames.values()),
+                             "store_bytes": sum(store.size_bytes(s, "1m") for s in symbols),
+                             "dataframe_bytes": int(sum(f.memory_usage(deep=True).sum() for f in frames.values()))}
+
+        for name, days in INTRADAY_WINDOWS.items():
+            window_start = (end - pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+            def run():
+                result = backtest_intraday(symbols[0], _intraday_blocks(), interval="1m", start_date=window_start,
+                                           end_date=end.strftime("%Y-%m-%d"), store=store, sync=False)
+                if not result.get("success"):
+                    raise RuntimeError(result.get("error"))
+                return result
+
+            timing = measure(run, repeat=repeat)
+            timing["bars"] = run()["bars"]
+            timing["bars_per_second"] = round(timing["bars"] / (timing["median_ms"] / 1000))
+            results[f"1m_{name}"] = timing
+    return results
+
+
+SUITES = {
+    "backtest": bench_backtest,
+    "indicators": bench_indicators,
+    "monte_carlo": bench_monte_carlo,
+    "allocation": bench_allocation,
+    "endpoints": bench_endpoints,
+    "portfolio": bench_portfolio,
+    "intraday": bench_intraday
+}
+
+
+def run_benchmarks(suites: List[str], repeat: int = 5) -> Dict[str, Any]:
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "provider": type(market_data.get_provider()).__name__,
+        "results": {}
+    }
+    for name in suites:
+        print(f"⏱️  Running {name} benchmarks...")
+        results["results"][name] = SUITES[name](repeat)
+    return results
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.1) -> List[str]:
+    """Lines describing median-time changes versus a baseline run"""
+    lines = []
+    for suite, cases in current["results"].items():
+        for case, timing in cases.items():
+            before = baseline.get("results", {}).get(suite, {}).get(case)
+            if not before or not before.get("median_ms"):
+                continue
+            change = timing["median_ms"] / before["median_ms"] - 1
+            marker = "🔺" if change > threshold else "🟢" if change < -threshold else "  "
+            lines.append(f"{marker} {suite}/{case}: {before['median_ms']:.2f}ms -> "
+                         f"{timing['median_ms']:.2f}ms ({change:+.1%})")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the JainVest backend")
+    parser.add_argument("--only", help=f"Comma-separated suites ({', '.join(SUITES)})")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    parser.add_argument("--replay", action="store_true", help="Use recorded fixtures instead of synthetic prices")
+    parser.add_argument("--record", action="store_true", help="Record fixtures for the benchmark symbols and exit")
+    parser.add_argument("--fixtures", default=market_data.MARKET_DATA_FIXTURES, help="Fixture directory")
+    parser.add_argument("--output", help="Results file (default: benchmark_results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    suites = args.only.split(",") if args.only else list(SUITES)
+    unknown = [s for s in suites if s not in SUITES]
+    if unknown:
+        parser.error(f"Unknown suites: {', '.join(unknown)}")
+
+    if args.record:
+        for symbol, bars in market_data.record_fixtures(BENCHMARK_SYMBOLS, directory=args.fixtures).items():
+            print(f"   {symbol}: {bars} bars")
+        print(f"✅ Fixtures saved to {args.fixtures}")
+        return
+
+    market_data.set_provider(market_data.ReplayProvider(args.fixtures) if args.replay else SyntheticProvider())
+    results = run_benchmarks(suites, repeat=args.repeat)
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✅ Results saved to {output}")
+
+    for suite, cases in results["results"].items():
+        for case, timing in cases.items():
+            print(f"   {suite}/{case}: median {timing['median_ms']:.2f}ms")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\n📊 Compared with {args.compare}:")
+        for line in compare_results(results, baseline):
+            print(f"   {line}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
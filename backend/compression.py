@@ -0,0 +1,115 @@
+"""
+Response Compression and HTTP Caching
+Constant JSON payloads (risk questions, profiles, languages, stock list) are
+serialized and compressed once, then served with a strong ETag and
+Cache-Control so repeat page loads get a 304 with no body. Other large JSON
+responses (SEBI content, reports) are compressed on the fly.
+Brotli is used when the `brotli` package is installed; gzip otherwise.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_CACHE_MAX_AGE = int(os.getenv("STATIC_CACHE_MAX_AGE", "3600"))  # seconds
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", "6"))  # gzip level for on-the-fly compression
+
+
+def _accepted_encoding(accept_encoding: str) -> Optional[str]:
+    """Best encoding the client accepts: br, then gzip"""
+    accepted = {
+        part.split(";")[0].strip().lower()
+        for part in accept_encoding.split(",")
+        if not part.strip().endswith(";q=0")
+    }
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def _compress(body: bytes, encoding: str, level: int) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=min(level, 11))
+    return gzip.compress(body, compresslevel=min(level, 9), mtime=0)
+
+
+class StaticJSON:
+    """
+    A JSON response whose payload never changes while the process runs.
+    The payload is built on first use (or by warm()), serialized once and
+    kept pre-compressed in every supported encoding.
+    """
+
+    def __init__(self, build: Callable[[], Any]):
+        self._build = build
+        self._variants: Optional[Dict[Optional[str], bytes]] = None
+        self._etag = ""
+        self._lock = threading.Lock()
+
+    def warm(self) -> None:
+        with self._lock:
+            if self._variants is not None:
+                return
+            body = json.dumps(self._build(), separators=(",", ":")).encode("utf-8")
+            variants = {None: body, "gzip": _compress(body, "gzip", 9)}
+            if brotli is not None:
+                variants["br"] = _compress(body, "br", 11)
+            self._etag = hashlib.sha256(body).hexdigest()[:32]
+            self._variants = variants
+
+    def response(self):
+        """Serve the cached payload for the current request, or a 304"""
+        from flask import Response, request
+        self.warm()
+
+        encoding = _accepted_encoding(request.headers.get("Accept-Encoding", ""))
+        # Each encoding is a different representation, so it gets its own ETag
+        etag = f"{self._etag}-{encoding}" if encoding else self._etag
+
+        if etag in request.if_none_match:
+            response = Response(status=304)
+        else:
+            response = Response(self._variants[encoding], mimetype="application/json")
+            if encoding:
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = f"public, max-age={STATIC_CACHE_MAX_AGE}"
+        response.vary.add("Accept-Encoding")
+        return response
+
+
+def init_app(app) -> None:
+    """Compress large JSON responses on the fly"""
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or "Content-Encoding" in response.headers
+                or response.mimetype != "application/json"):
+            return response
+
+        body = response.get_data()
+        if len(body) < COMPRESS_MIN_BYTES:
+            return response
+        encoding = _accepted_encoding(request.headers.get("Accept-Encoding", ""))
+        if encoding is None:
+            return response
+
+        response.set_data(_compress(body, encoding, COMPRESS_LEVEL))
+        response.headers["Content-Encoding"] = encoding
+        response.vary.add("Accept-Encoding")
+        return response
@@ -3,20 +3,32 @@ SEBI/NISM/NSE Content Aggregator and Summarizer
 Scrapes official content, summarizes using AI, and translates to vernacular languages
 """
 
-import requests
-from bs4 import BeautifulSoup
-from deep_translator import GoogleTranslator
 import json
 import os
+import time
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from typing import Dict, List, Any
-from langchain_groq import ChatGroq
 from dotenv import load_dotenv
+from metrics import timed, observe_stage
+
+# requests, bs4, deep_translator and the LLM client are imported on first use
+# so that importing this module (e.g. for LANGUAGES) stays cheap
 
 load_dotenv()
 
-# Initialize Groq LLM for summarization
-groq_llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.3)
+# Summary cache and batching settings
+SUMMARY_CACHE_PATH = os.getenv(
+    "SUMMARY_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "summaries.db")
+)
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "5000"))
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))
+SUMMARY_RATE_LIMIT = float(os.getenv("SUMMARY_RATE_LIMIT", "2"))  # LLM calls per second
+SUMMARY_TIME_BUDGET = float(os.getenv("SUMMARY_TIME_BUDGET", "8"))  # seconds per request
 
 # Official sources
 OFFICIAL_SOURCES = {
@@ -62,6 +74,9 @@ def scrape_sebi_content(url: str, max_articles: int = 5) -> List[Dict[str, Any]]
     Scrape content from SEBI website
     """
     try:
+        import requests
+        from bs4 import BeautifulSoup
+        
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -223,25 +238,194 @@ def get_demo_sebi_content() -> List[Dict[str, Any]]:
     ]
 
 
-def summarize_content(text: str, max_length: int = 100) -> str:
+class SummaryCache:
     """
-    Summarize content using Groq LLM
+    Persistent summary cache keyed by content hash and model name. Entries
+    live in SQLite, so every server process reads and adds to the same
+    cache; beyond max_entries the oldest summaries are dropped.
     """
-    try:
-        prompt = f"""Create a concise, actionable 2-3 sentence summary of this financial education content for retail investors in India. Focus on the most important takeaways and practical steps. Use simple language and avoid jargon.
+
+    def __init__(self, path: str, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    @staticmethod
+    def make_key(text: str, model: str, max_length: int) -> str:
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{model}:{max_length}:{digest}"
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        # A connection opened before a fork (e.g. in the gunicorn master) is not reused
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, summary TEXT NOT NULL)"
+            )
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def get(self, key: str):
+        try:
+            row = self._conn().execute("SELECT summary FROM summaries WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Summary cache read error: {str(e)}")
+            return None
+        return row[0] if row else None
+
+    def set(self, key: str, summary: str) -> None:
+        try:
+            conn = self._conn()
+            conn.execute("INSERT OR REPLACE INTO summaries (key, summary) VALUES (?, ?)", (key, summary))
+            # ids only grow, so everything max_entries below the newest is the oldest
+            conn.execute("DELETE FROM summaries WHERE id <= (SELECT MAX(id) FROM summaries) - ?", (self.max_entries,))
+        except (OSError, sqlite3.Error) as e:
+            print(f"Summary cache write error: {str(e)}")
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+
+
+class RateLimiter:
+    """
+    Spaces out calls so that at most `rate` calls start per second
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_summary_llm = None
+_summary_llm_lock = threading.Lock()
+
+
+def get_summary_llm():
+    """
+    Build the summarization LLM on first use (provider chosen by LLM_PROVIDER)
+    """
+    global _summary_llm
+    if _summary_llm is None:
+        with _summary_llm_lock:
+            if _summary_llm is None:
+                from llm_providers import get_chat_model
+                _summary_llm = get_chat_model(temperature=0.3)
+    return _summary_llm
+
+
+def get_summary_model_name() -> str:
+    """Model name used to key cached summaries"""
+    from llm_providers import get_model_name
+    return get_model_name()
+
+
+def __getattr__(name):
+    # Backwards compatible access to the lazily built client
+    if name == "groq_llm":
+        return get_summary_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+summary_cache = SummaryCache(SUMMARY_CACHE_PATH)
+_summary_rate_limiter = RateLimiter(SUMMARY_RATE_LIMIT)
+# Shared pool so calls that outlive a request budget keep running and still fill the cache
+_summary_executor = ThreadPoolExecutor(max_workers=SUMMARY_MAX_CONCURRENCY, thread_name_prefix="summarize")
+
+
+def extractive_summary(text: str, max_length: int = 100) -> str:
+    """
+    Fallback summary: simple truncation to max_length words
+    """
+    words = text.split()
+    return ' '.join(words[:max_length]) + "..."
+
+
+def _llm_summarize(text: str, max_length: int) -> str:
+    prompt = f"""Create a concise, actionable 2-3 sentence summary of this financial education content for retail investors in India. Focus on the most important takeaways and practical steps. Use simple language and avoid jargon.
 
 Content: {text}
 
 Summary (max {max_length} words):"""
-        
-        response = groq_llm.invoke(prompt)
-        return response.content.strip()
-        
+
+    _summary_rate_limiter.acquire()
+    with timed("llm_summary"):
+        response = get_summary_llm().invoke(prompt)
+    summary = response.content.strip()
+    summary_cache.set(SummaryCache.make_key(text, get_summary_model_name(), max_length), summary)
+    return summary
+
+
+def summarize_content(text: str, max_length: int = 100) -> str:
+    """
+    Summarize content using Groq LLM
+    """
+    cached = summary_cache.get(SummaryCache.make_key(text, get_summary_model_name(), max_length))
+    if cached:
+        return cached
+
+    try:
+        return _llm_summarize(text, max_length)
     except Exception as e:
         print(f"Summarization error: {str(e)}")
-        # Fallback: simple truncation
-        words = text.split()
-        return ' '.join(words[:max_length]) + "..."
+        return extractive_summary(text, max_length)
+
+
+def summarize_batch(texts: List[str], max_length: int = 100, time_budget: float = None) -> List[str]:
+    """
+    Summarize many texts at once. Cache hits are returned directly, misses are
+    summarized concurrently (rate limited) until the time budget runs out, and
+    anything still pending falls back to extractive truncation.
+    """
+    if time_budget is None:
+        time_budget = SUMMARY_TIME_BUDGET
+
+    model_name = get_summary_model_name()
+    summaries = [None] * len(texts)
+    pending = {}
+    for i, text in enumerate(texts):
+        cached = summary_cache.get(SummaryCache.make_key(text, model_name, max_length))
+        if cached:
+            summaries[i] = cached
+        else:
+            pending.setdefault(text, []).append(i)
+
+    if pending:
+        budget_start = time.perf_counter()
+        futures = {
+            _summary_executor.submit(_llm_summarize, text, max_length): text
+            for text in pending
+        }
+        done, not_done = wait(futures, timeout=time_budget)
+        observe_stage("summarization", time.perf_counter() - budget_start)
+        if not_done:
+            print(f"Summary budget of {time_budget}s exhausted, {len(not_done)} summaries fall back to truncation")
+
+        for future, text in futures.items():
+            summary = None
+            if future in done:
+                try:
+                    summary = future.result()
+                except Exception as e:
+                    print(f"Summarization error: {str(e)}")
+            if not summary:
+                summary = extractive_summary(text, max_length)
+            for i in pending[text]:
+                summaries[i] = summary
+
+    return summaries
 
 
 def translate_content(text: str, target_language: str) -> str:
@@ -252,16 +436,18 @@ def translate_content(text: str, target_language: str) -> str:
         if target_language == "en":
             return text
             
-        translator = GoogleTranslator(source='en', target=target_language)
-        # Split long text into chunks (Google Translate has limits)
-        max_chunk_size = 4500
-        if len(text) <= max_chunk_size:
-            return translator.translate(text)
-        
-        # Translate in chunks
-        chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
-        translated_chunks = [translator.translate(chunk) for chunk in chunks]
-        return ' '.join(translated_chunks)
+        from deep_translator import GoogleTranslator
+        with timed("translation"):
+            translator = GoogleTranslator(source='en', target=target_language)
+            # Split long text into chunks (Google Translate has limits)
+            max_chunk_size = 4500
+            if len(text) <= max_chunk_size:
+                return translator.translate(text)
+            
+            # Translate in chunks
+            chunks = [text[i:i+max_chunk_size] for i in range(0, len(text), max_chunk_size)]
+            translated_chunks = [translator.translate(chunk) for chunk in chunks]
+            return ' '.join(translated_chunks)
         
     except Exception as e:
         print(f"Translation error for {target_language}: {str(e)}")
@@ -303,23 +489,28 @@ def get_aggregated_content(language: str = "en", include_summary: bool = True) -
             "timestamp": datetime.now().isoformat()
         }
         
-        # Add summary if requested
-        if include_summary:
-            # Use pre-written summary if available, otherwise generate with AI
-            if "summary" in article and article["summary"]:
-                processed_article["summary"] = article["summary"]
-            else:
-                processed_article["summary"] = summarize_content(article["content"])
+        # Use pre-written summary if available, otherwise generate with AI below
+        if include_summary and article.get("summary"):
+            processed_article["summary"] = article["summary"]
         
-        # Translate if not English
-        if language != "en":
-            processed_article["title_translated"] = translate_content(article["title"], language)
-            processed_article["content_translated"] = translate_content(article["content"], language)
+        processed_content.append(processed_article)
+    
+    # Summarize all articles missing a summary in one batch
+    if include_summary:
+        missing = [article for article in processed_content if "summary" not in article]
+        if missing:
+            summaries = summarize_batch([article["content"] for article in missing])
+            for article, summary in zip(missing, summaries):
+                article["summary"] = summary
+    
+    # Translate if not English
+    if language != "en":
+        for processed_article in processed_content:
+            processed_article["title_translated"] = translate_content(processed_article["title"], language)
+            processed_article["content_translated"] = translate_content(processed_article["content"], language)
             if include_summary:
                 processed_article["summary_translated"] = translate_content(processed_article["summary"], language)
             processed_article["language"] = LANGUAGES.get(language, language)
-        
-        processed_content.append(processed_article)
     
     return {
         "success": True,
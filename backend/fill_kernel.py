@@ -0,0 +1,213 @@
+"""
+Position and Fill Kernel
+The sequential part of a backtest: stop loss / take profit checks, buy and
+sell fills and the equity curve, as one loop over plain arrays. It is
+JIT-compiled with Numba when the `numba` package is installed; otherwise the
+same function runs as plain Python over lists. Both paths produce identical
+results (see test_fill_kernel.py).
+"""
+
+import os
+from typing import Any, Dict, List
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+FILL_KERNEL_JIT = os.getenv("FILL_KERNEL_JIT", "auto").lower()  # auto, on or off
+
+# Action codes
+ACTION_BUY = 1
+ACTION_SELL = 2
+BUY_PERCENTAGE = 0
+BUY_SHARES = 1
+SELL_ALL = 0
+SELL_HALF = 1
+
+# Trade record codes
+TRADE_BUY = 0
+TRADE_SELL = 1
+REASON_SIGNAL = 0
+REASON_STOP_LOSS = 1
+REASON_TAKE_PROFIT = 2
+REASON_END = 3
+REASONS = {
+    REASON_SIGNAL: "Strategy Signal",
+    REASON_STOP_LOSS: "Stop Loss",
+    REASON_TAKE_PROFIT: "Take Profit",
+    REASON_END: "End of Backtest"
+}
+
+# Columns of the trade records array
+T_BAR, T_TYPE, T_REASON, T_SHARES, T_PRICE, T_VALUE, T_PL, T_PL_PCT = range(8)
+
+
+def simulate_fills(close, signal, action_kinds, action_modes, action_values,
+                   initial_capital, stop_loss_pct, take_profit_pct):
+    """
+    Run the fill state machine from bar 1 to the end and close any open
+    position on the last bar.
+
+    close/signal are per bar; action_* describe the strategy's buy/sell
+    actions in order; a stop/take-profit percentage of 0 means none.
+    Returns (equity, capital, position) per bar (bar 0 unset), the trade
+    records (one row per fill, columns T_*) and the maximum drawdown.
+    """
+    n = len(close)
+    n_actions = len(action_kinds)
+    equity = np.zeros(n)
+    capital_curve = np.zeros(n)
+    position_curve = np.zeros(n)
+    trades = np.zeros((64, 8))
+    n_trades = 0
+
+    capital = initial_capital
+    position = 0
+    entry_price = 0.0
+    peak_equity = initial_capital
+    max_drawdown = 0.0
+
+    for i in range(1, n):
+        price = close[i]
+        if n_trades + n_actions + 2 > trades.shape[0]:
+            # At most one fill per action plus a stop/take-profit exit per bar
+            grown = np.zeros((trades.shape[0] * 2, 8))
+            grown[:n_trades] = trades[:n_trades]
+            trades = grown
+
+        if position > 0:
+            current_pl_pct = (price - entry_price) / entry_price
+            stop = stop_loss_pct != 0 and current_pl_pct <= -stop_loss_pct
+            take = (not stop) and take_profit_pct != 0 and current_pl_pct >= take_profit_pct
+            if stop or take:
+                capital += position * price
+                trades[n_trades, T_BAR] = i
+                trades[n_trades, T_TYPE] = TRADE_SELL
+                trades[n_trades, T_REASON] = REASON_STOP_LOSS if stop else REASON_TAKE_PROFIT
+                trades[n_trades, T_SHARES] = position
+                trades[n_trades, T_PRICE] = price
+                trades[n_trades, T_PL] = (price - entry_price) * position
+                trades[n_trades, T_PL_PCT] = current_pl_pct * 100
+                n_trades += 1
+                position = 0
+                entry_price = 0.0
+
+        if signal[i]:
+            for a in range(n_actions):
+                if action_kinds[a] == ACTION_BUY and position == 0:
+                    if action_modes[a] == BUY_PERCENTAGE:
+                        amount_to_invest = capital * (action_values[a] / 100)
+                    else:
+                        amount_to_invest = min(action_values[a] * price, capital)
+                    shares_to_buy = int(amount_to_invest / price)
+                    if shares_to_buy > 0:
+                        cost = shares_to_buy * price
+                        capital -= cost
+                        position = shares_to_buy
+                        entry_price = price
+                        trades[n_trades, T_BAR] = i
+                        trades[n_trades, T_TYPE] = TRADE_BUY
+                        trades[n_trades, T_REASON] = REASON_SIGNAL
+                        trades[n_trades, T_SHARES] = shares_to_buy
+                        trades[n_trades, T_PRICE] = price
+                        trades[n_trades, T_VALUE] = cost
+                        n_trades += 1
+
+                elif action_kinds[a] == ACTION_SELL and position > 0:
+                    if action_modes[a] == SELL_ALL:
+                        shares_to_sell = position
+                    else:
+                        shares_to_sell = int(position * 0.5)
+                    capital += shares_to_sell * price
+                    trades[n_trades, T_BAR] = i
+                    trades[n_trades, T_TYPE] = TRADE_SELL
+                    trades[n_trades, T_REASON] = REASON_SIGNAL
+                    trades[n_trades, T_SHARES] = shares_to_sell
+                    trades[n_trades, T_PRICE] = price
+                    trades[n_trades, T_PL] = (price - entry_price) * shares_to_sell
+                    trades[n_trades, T_PL_PCT] = ((price - entry_price) / entry_price) * 100
+                    n_trades += 1
+                    position -= shares_to_sell
+                    if position == 0:
+                        entry_price = 0.0
+
+        current_equity = capital + (position * price)
+        equity[i] = current_equity
+        capital_curve[i] = capital
+        position_curve[i] = position
+
+        if current_equity > peak_equity:
+            peak_equity = current_equity
+        drawdown = (peak_equity - current_equity) / peak_equity
+        max_drawdown = max(max_drawdown, drawdown)
+
+    # Close any open position at the end
+    if position > 0 and n > 0:
+        final_price = close[n - 1]
+        capital += position * final_price
+        trades[n_trades, T_BAR] = n - 1
+        trades[n_trades, T_TYPE] = TRADE_SELL
+        trades[n_trades, T_REASON] = REASON_END
+        trades[n_trades, T_SHARES] = position
+        trades[n_trades, T_PRICE] = final_price
+        trades[n_trades, T_PL] = (final_price - entry_price) * position
+        trades[n_trades, T_PL_PCT] = ((final_price - entry_price) / entry_price) * 100
+        n_trades += 1
+
+    return equity, capital_curve, position_curve, trades[:n_trades], capital, max_drawdown
+
+
+_python_kernel = simulate_fills
+_jit_kernel = None
+if njit is not None and FILL_KERNEL_JIT != "off":
+    _jit_kernel = njit(cache=True, nogil=True)(simulate_fills)
+elif FILL_KERNEL_JIT == "on":
+    print("⚠️ FILL_KERNEL_JIT=on but numba is not installed; using the Python fill loop")
+
+
+def encode_actions(actions: List[Dict[str, Any]]):
+    """
+    Action blocks -> (kinds, modes, values) arrays and the stop loss / take
+    profit fractions (the last block of each kind wins; 0 for none)
+    """
+    kinds, modes, values = [], [], []
+    stop_loss_pct = take_profit_pct = 0.0
+    for action in actions:
+        params = action.get('params') or {}
+        if action['id'] == 'buy':
+            kinds.append(ACTION_BUY)
+            modes.append(BUY_PERCENTAGE if params.get('quantity', 'percentage') == 'percentage' else BUY_SHARES)
+            values.append(float(params.get('value', 10)))
+        elif action['id'] == 'sell':
+            kinds.append(ACTION_SELL)
+            modes.append(SELL_ALL if params.get('quantity', 'all') == 'all' else SELL_HALF)
+            values.append(0.0)
+        elif action['id'] == 'stopLoss':
+            stop_loss_pct = params.get('percentage', 5) / 100
+        elif action['id'] == 'takeProfit':
+            take_profit_pct = params.get('percentage', 10) / 100
+    return (np.array(kinds, dtype=np.int64), np.array(modes, dtype=np.int64),
+            np.array(values, dtype=np.float64), float(stop_loss_pct), float(take_profit_pct))
+
+
+def run_fills(close: np.ndarray, signal: np.ndarray, actions: List[Dict[str, Any]],
+              initial_capital: float, jit: bool = None):
+    """simulate_fills for a strategy's action blocks, on the JIT path when available"""
+    kinds, modes, values, stop_loss_pct, take_profit_pct = encode_actions(actions)
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    signal = np.ascontiguousarray(signal, dtype=np.bool_)
+    use_jit = _jit_kernel is not None if jit is None else jit
+    if use_jit:
+        if _jit_kernel is None:
+            raise RuntimeError("numba is not installed")
+        return _jit_kernel(close, signal, kinds, modes, values,
+                           float(initial_capital), stop_loss_pct, take_profit_pct)
+    # Lists index much faster than NumPy arrays from plain Python
+    return _python_kernel(close.tolist(), signal.tolist(), kinds.tolist(), modes.tolist(), values.tolist(),
+                          float(initial_capital), stop_loss_pct, take_profit_pct)
+
+
+def jit_available() -> bool:
+    return _jit_kernel is not None
@@ -0,0 +1,52 @@
+"""
+Gunicorn settings for the JainVest API
+Every value can be tuned through the environment:
+
+    GUNICORN_BIND              address to listen on (default 0.0.0.0:$PORT, PORT=5001)
+    WEB_CONCURRENCY            worker processes (default 2 x CPUs + 1, capped at 8)
+    GUNICORN_THREADS           threads per worker (default 4)
+    GUNICORN_TIMEOUT           seconds before a silent worker is killed (default 120)
+    GUNICORN_GRACEFUL_TIMEOUT  seconds to finish in-flight requests on restart (default 30)
+    GUNICORN_KEEPALIVE         idle keep-alive seconds (default 5)
+    GUNICORN_MAX_REQUESTS      recycle a worker after this many requests (default 1000, 0 = never)
+
+Workers use the threaded worker class: most request time is spent waiting on
+Yahoo Finance, the LLM and search APIs, so threads keep a worker busy while
+one request waits. CPU-heavy batch reports already run in a process pool.
+"""
+
+import os
+import multiprocessing
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5001')}")
+workers = int(os.getenv("WEB_CONCURRENCY", str(min(multiprocessing.cpu_count() * 2 + 1, 8))))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# Reports and agent answers can take tens of seconds; streams stay open longer
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then to bound memory held by caches
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = max_requests // 10
+
+# Import the app (and the data preloaded in wsgi.py) once, before forking
+preload_app = True
+
+# Request logs come from metrics.py; keep gunicorn's error log on stderr
+accesslog = None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # Forked workers inherit the master's RNG state; reseed so Monte Carlo
+    # simulations differ between workers
+    import numpy as np
+    np.random.seed()
+
+
+def when_ready(server):
+    server.log.info(f"JainVest API ready on {bind} with {workers} workers x {threads} threads")
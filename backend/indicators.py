@@ -0,0 +1,516 @@
+"""
+Technical Indicator Registry
+Every indicator the Algo Builder offers is registered here with its default
+parameters and the series it produces. An indicator does not compute
+anything itself: it declares its outputs as nodes of a dependency graph
+(EMA(12) of close, rolling std(20), true range, ...). The graph for all of a
+strategy's indicators is evaluated once per request, so every distinct
+intermediate is computed exactly once however many indicators use it.
+
+On intraday bars the context knows each bar's trading session: rolling
+windows (SMA, std, highest/lowest, rolling sums, RSI) are NaN until they fit
+inside the current session instead of reaching into the previous day, and
+the cumulative VWAP restarts every session. Exponential smoothing (EMA,
+Wilder) carries over between sessions, as on trading terminals.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def calculate_sma(data: pd.Series, period: int) -> pd.Series:
+    """Calculate Simple Moving Average"""
+    return data.rolling(window=period).mean()
+
+
+def calculate_ema(data: pd.Series, period: int) -> pd.Series:
+    """Calculate Exponential Moving Average"""
+    return data.ewm(span=period, adjust=False).mean()
+
+
+def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
+    """Calculate Relative Strength Index"""
+    delta = data.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+    rs = gain / loss
+    rsi = 100 - (100 / (1 + rs))
+    return rsi
+
+
+def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
+    """Calculate MACD"""
+    ema_fast = data.ewm(span=fast, adjust=False).mean()
+    ema_slow = data.ewm(span=slow, adjust=False).mean()
+    macd = ema_fast - ema_slow
+    signal_line = macd.ewm(span=signal, adjust=False).mean()
+    histogram = macd - signal_line
+
+    return {
+        'macd': macd,
+        'signal': signal_line,
+        'histogram': histogram
+    }
+
+
+def calculate_bollinger_bands(data: pd.Series, period: int = 20, std_dev: int = 2) -> Dict[str, pd.Series]:
+    """Calculate Bollinger Bands"""
+    sma = data.rolling(window=period).mean()
+    std = data.rolling(window=period).std()
+    upper_band = sma + (std * std_dev)
+    lower_band = sma - (std * std_dev)
+
+    return {
+        'upper': upper_band,
+        'middle': sma,
+        'lower': lower_band
+    }
+
+
+# ===== SHARED KERNELS =====
+
+def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Greatest of high-low and the gaps from the previous close"""
+    prev_close = np.concatenate(([np.nan], close[:-1]))
+    ranges = np.vstack((high - low, np.abs(high - prev_close), np.abs(low - prev_close)))
+    return np.nanmax(ranges, axis=0)
+
+
+def wilder_average(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder's smoothing (an EMA with alpha 1/period), NaN until `period` values"""
+    return pd.Series(values).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().to_numpy()
+
+
+def rolling_extreme(values: np.ndarray, period: int, highest: bool) -> np.ndarray:
+    """Rolling max (or min) over `period` bars, NaN for the first period-1"""
+    out = np.full(len(values), np.nan)
+    if period <= len(values):
+        windows = sliding_window_view(values, period)
+        out[period - 1:] = windows.max(axis=1) if highest else windows.min(axis=1)
+    return out
+
+
+def rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Rolling sum via cumulative sums; NaN for the first period-1 bars and any window with a NaN"""
+    out = np.full(len(values), np.nan)
+    if period <= len(values):
+        missing = np.isnan(values)
+        cumulative = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values))))
+        gaps = np.concatenate(([0], np.cumsum(missing)))
+        sums = cumulative[period:] - cumulative[:-period]
+        out[period - 1:] = np.where(gaps[period:] - gaps[:-period] > 0, np.nan, sums)
+    return out
+
+
+# ===== INTERMEDIATE NODES =====
+#
+# Every series an indicator needs is a node: a tuple (kind, *args) where args
+# that are themselves nodes are its inputs, e.g. ("ema", CLOSE, 12). Equal
+# tuples are the same computation, so the graph built from all of a
+# strategy's indicators shares EMA(12) between EMA and MACD, and SMA(20)
+# between SMA and the Bollinger middle band.
+
+KERNELS: Dict[str, Callable[..., np.ndarray]] = {}
+
+# Price columns are leaf nodes: the context holds their values, no kernel computes them
+CLOSE = ("column", "Close")
+HIGH = ("column", "High")
+LOW = ("column", "Low")
+VOLUME = ("column", "Volume")
+SESSION = ("column", "Session")
+
+# Windowed kinds (period is their last arg) and the extra bars their window reaches back
+SESSION_WINDOWS = {"sma": 0, "rolling_std": 0, "highest": 0, "lowest": 0, "rolling_sum": 0, "rsi": 1}
+
+
+def kernel(kind: str):
+    """Register the function computing nodes of one kind from their resolved args"""
+    def decorator(func):
+        KERNELS[kind] = func
+        return func
+    return decorator
+
+
+def _is_node(value) -> bool:
+    return isinstance(value, tuple) and bool(value) and (value[0] == "column" or value[0] in KERNELS)
+
+
+def session_positions(sessions: np.ndarray) -> np.ndarray:
+    """0-based position of each bar within its session"""
+    n = len(sessions)
+    index = np.arange(n)
+    starts = np.ones(n, dtype=bool)
+    starts[1:] = sessions[1:] != sessions[:-1]
+    return index - np.maximum.accumulate(np.where(starts, index, 0))
+
+
+@kernel("sma")
+def _k_sma(values, period):
+    return pd.Series(values).rolling(window=period).mean().to_numpy()
+
+
+@kernel("ema")
+def _k_ema(values, span):
+    return pd.Series(values).ewm(span=span, adjust=False).mean().to_numpy()
+
+
+@kernel("rolling_std")
+def _k_rolling_std(values, period):
+    return pd.Series(values).rolling(window=period).std().to_numpy()
+
+
+@kernel("rsi")
+def _k_rsi(values, period):
+    return calculate_rsi(pd.Series(values), period).to_numpy()
+
+
+@kernel("sub")
+def _k_sub(a, b):
+    return a - b
+
+
+@kernel("band")
+def _k_band(middle, width, multiplier):
+    return middle + multiplier * width
+
+
+@kernel("true_range")
+def _k_true_range(high, low, close):
+    return true_range(high, low, close)
+
+
+@kernel("wilder")
+def _k_wilder(values, period):
+    # Smoothing starts at the first defined value (ADX averages DX, which starts late)
+    out = np.full(len(values), np.nan)
+    valid = ~np.isnan(values)
+    out[valid] = wilder_average(values[valid], period)
+    return out
+
+
+@kernel("highest")
+def _k_highest(values, period):
+    return rolling_extreme(values, period, highest=True)
+
+
+@kernel("lowest")
+def _k_lowest(values, period):
+    return rolling_extreme(values, period, highest=False)
+
+
+@kernel("rolling_sum")
+def _k_rolling_sum(values, period):
+    return rolling_sum(values, period)
+
+
+@kernel("session_sum")
+def _k_session_sum(values, sessions):
+    """Running sum that restarts on the first bar of each session"""
+    total = np.cumsum(values)
+    starts = np.flatnonzero(np.diff(sessions, prepend=np.nan))
+    before = np.concatenate(([0.0], total))[starts]
+    return total - np.repeat(before, np.diff(np.append(starts, len(values))))
+
+
+@kernel("typical_price")
+def _k_typical_price(high, low, close):
+    return (high + low + close) / 3
+
+
+@kernel("midpoint")
+def _k_midpoint(high, low):
+    return (high + low) / 2
+
+
+@kernel("product")
+def _k_product(a, b):
+    return a * b
+
+
+@kernel("ratio")
+def _k_ratio(numerator, denominator, scale):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, scale * numerator / denominator, np.nan)
+
+
+@kernel("stoch_k")
+def _k_stoch_k(close, highest, lowest):
+    span = highest - lowest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = np.where(span > 0, (close - lowest) / span * 100, 50.0)
+    k[np.isnan(span)] = np.nan
+    return k
+
+
+@kernel("plus_dm")
+def _k_plus_dm(high, low):
+    up, down = np.diff(high, prepend=np.nan), -np.diff(low, prepend=np.nan)
+    return np.where((up > down) & (up > 0), up, 0.0)
+
+
+@kernel("minus_dm")
+def _k_minus_dm(high, low):
+    up, down = np.diff(high, prepend=np.nan), -np.diff(low, prepend=np.nan)
+    return np.where((down > up) & (down > 0), down, 0.0)
+
+
+@kernel("dx")
+def _k_dx(plus_di, minus_di):
+    total = plus_di + minus_di
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dx = np.where(total > 0, 100 * np.abs(plus_di - minus_di) / total, 0.0)
+    dx[np.isnan(total)] = np.nan
+    return dx
+
+
+@kernel("obv")
+def _k_obv(close, volume):
+    direction = np.sign(np.diff(close, prepend=close[:1]))
+    return np.cumsum(direction * volume)
+
+
+@kernel("supertrend")
+def _k_supertrend(close, midpoint, atr, multiplier):
+    """
+    Trend line and direction (+1/-1) as two rows. The bands only ratchet
+    towards price and flip on a close through them, which depends on the
+    previous bar, so that part is one sequential pass over the bands.
+    """
+    basic_upper = midpoint + multiplier * atr
+    basic_lower = midpoint - multiplier * atr
+
+    n = len(close)
+    upper, lower = basic_upper.copy(), basic_lower.copy()
+    trend = np.full(n, np.nan)
+    direction = np.full(n, np.nan)
+    start = int(np.argmax(~np.isnan(atr))) if (~np.isnan(atr)).any() else n
+    for i in range(start, n):
+        if i > start:
+            if not (basic_upper[i] < upper[i - 1] or close[i - 1] > upper[i - 1]):
+                upper[i] = upper[i - 1]
+            if not (basic_lower[i] > lower[i - 1] or close[i - 1] < lower[i - 1]):
+                lower[i] = lower[i - 1]
+            if direction[i - 1] == 1:
+                direction[i] = -1 if close[i] < lower[i] else 1
+            else:
+                direction[i] = 1 if close[i] > upper[i] else -1
+        else:
+            direction[i] = 1 if close[i] >= midpoint[i] else -1
+        trend[i] = lower[i] if direction[i] == 1 else upper[i]
+    return np.vstack((trend, direction))
+
+
+@kernel("row")
+def _k_row(values, index):
+    return values[index]
+
+
+class IndicatorContext:
+    """
+    OHLCV columns of one price frame (a DataFrame or a dict of arrays) and the
+    nodes computed from them so far. Each distinct node is computed at most
+    once per context (i.e. per request). `sessions` gives each bar's session
+    id for intraday bars; without it all bars are one session.
+    """
+
+    def __init__(self, df, sessions: np.ndarray = None):
+        self.df = df
+        self._values: Dict[Hashable, np.ndarray] = {
+            ("column", name): np.asarray(df[name], dtype=float)
+            for name in ("Open", "High", "Low", "Close", "Volume")
+        }
+        self._values[VOLUME] = np.nan_to_num(self._values[VOLUME], nan=0.0)
+        n = len(self._values[CLOSE])
+        self._values[SESSION] = np.zeros(n) if sessions is None else np.asarray(sessions, dtype=float)
+        self._session_position = None
+        if sessions is not None:
+            self._session_position = session_positions(self._values[SESSION])
+
+    @staticmethod
+    def plan(nodes: Iterable[tuple]) -> List[tuple]:
+        """Distinct nodes needed for `nodes`, inputs before the nodes using them"""
+        order: List[tuple] = []
+        seen = set()
+
+        def visit(node):
+            if node in seen:
+                return
+            seen.add(node)
+            for arg in node[1:]:
+                if _is_node(arg):
+                    visit(arg)
+            order.append(node)
+
+        for node in nodes:
+            visit(node)
+        return order
+
+    def evaluate(self, nodes: Iterable[tuple]) -> Dict[tuple, np.ndarray]:
+        nodes = list(nodes)
+        for node in self.plan(nodes):
+            if node not in self._values:
+                if node[0] == "column":
+                    raise ValueError(f"Unknown price column: {node[1]}")
+                args = [self._values[arg] if _is_node(arg) else arg for arg in node[1:]]
+                values = KERNELS[node[0]](*args)
+                if self._session_position is not None and node[0] in SESSION_WINDOWS:
+                    # A window is only valid once it fits inside the bar's session
+                    span = node[-1] - 1 + SESSION_WINDOWS[node[0]]
+                    values = np.where(self._session_position < span, np.nan, values)
+                self._values[node] = values
+        return {node: self._values[node] for node in nodes}
+
+
+@dataclass(frozen=True)
+class Indicator:
+    name: str
+    build: Callable[..., Dict[str, tuple]]
+    defaults: Dict[str, Any] = field(default_factory=dict)
+    outputs: Tuple[str, ...] = ()
+
+    def params(self, params: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Defaults overridden by the block's params (unknown params ignored)"""
+        merged = {**self.defaults, **(params or {})}
+        return {key: merged[key] for key in self.defaults}
+
+    def instance_key(self, output: str, params: Dict[str, Any]) -> str:
+        """Unique name of one output for these params, e.g. sma_50, bb_lower_20_2"""
+        return "_".join([output] + [str(value) for value in params.values()])
+
+
+INDICATORS: Dict[str, Indicator] = {}
+
+
+def register(name: str, outputs: Tuple[str, ...], **defaults):
+    """Register an indicator: build(**params) -> {output name: node}"""
+    def decorator(func):
+        INDICATORS[name] = Indicator(name, func, defaults, outputs)
+        return func
+    return decorator
+
+
+def indicator_nodes(blocks: List[Dict[str, Any]]) -> Dict[str, tuple]:
+    """
+    Output name -> node for every indicator block. Each output is available
+    under its instance key (sma_50) and its plain name (sma); when two blocks
+    share an id, the plain name refers to the later one.
+    """
+    named: Dict[str, tuple] = {}
+    for block in blocks:
+        indicator = INDICATORS.get(block.get('id'))
+        if indicator is None:
+            continue
+        params = indicator.params(block.get('params'))
+        for output, node in indicator.build(**params).items():
+            named[indicator.instance_key(output, params)] = node
+            named[output] = node
+    return named
+
+
+def compute_indicators(ctx: IndicatorContext, blocks: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Values of every indicator block, computing each shared intermediate once"""
+    named = indicator_nodes(blocks)
+    values = ctx.evaluate(named.values())
+    return {name: values[node] for name, node in named.items()}
+
+
+def compute_indicator(ctx: IndicatorContext, name: str, params: Dict[str, Any] = None) -> Dict[str, np.ndarray]:
+    """Series for one indicator by plain output name; {} for unknown ids"""
+    indicator = INDICATORS.get(name)
+    if indicator is None:
+        return {}
+    nodes = indicator.build(**indicator.params(params))
+    values = ctx.evaluate(nodes.values())
+    return {output: values[node] for output, node in nodes.items()}
+
+
+def _atr(period: int) -> tuple:
+    return ("wilder", ("true_range", HIGH, LOW, CLOSE), period)
+
+
+# ===== CLOSE-ONLY INDICATORS =====
+
+@register("sma", outputs=("sma",), period=20)
+def _sma(period):
+    return {"sma": ("sma", CLOSE, period)}
+
+
+@register("ema", outputs=("ema",), period=20)
+def _ema(period):
+    return {"ema": ("ema", CLOSE, period)}
+
+
+@register("rsi", outputs=("rsi",), period=14)
+def _rsi(period):
+    return {"rsi": ("rsi", CLOSE, period)}
+
+
+@register("macd", outputs=("macd", "macd_signal", "macd_histogram"), fast=12, slow=26, signal=9)
+def _macd(fast, slow, signal):
+    macd = ("sub", ("ema", CLOSE, fast), ("ema", CLOSE, slow))
+    signal_line = ("ema", macd, signal)
+    return {"macd": macd, "macd_signal": signal_line, "macd_histogram": ("sub", macd, signal_line)}
+
+
+@register("bollinger", outputs=("bb_upper", "bb_middle", "bb_lower"), period=20, stdDev=2)
+def _bollinger(period, stdDev):
+    middle = ("sma", CLOSE, period)
+    std = ("rolling_std", CLOSE, period)
+    return {
+        "bb_upper": ("band", middle, std, stdDev),
+        "bb_middle": middle,
+        "bb_lower": ("band", middle, std, -stdDev)
+    }
+
+
+# ===== OHLCV INDICATORS =====
+
+@register("atr", outputs=("atr",), period=14)
+def _atr_indicator(period):
+    """Average True Range (Wilder)"""
+    return {"atr": _atr(period)}
+
+
+@register("stochastic", outputs=("stoch_k", "stoch_d"), period=14, smooth=3)
+def _stochastic(period, smooth):
+    """%K: close within the period's high-low range; %D: its moving average"""
+    k = ("stoch_k", CLOSE, ("highest", HIGH, period), ("lowest", LOW, period))
+    return {"stoch_k": k, "stoch_d": ("sma", k, smooth)}
+
+
+@register("adx", outputs=("adx", "plus_di", "minus_di"), period=14)
+def _adx(period):
+    """Average Directional Index with the +DI/-DI lines"""
+    atr = _atr(period)
+    plus_di = ("ratio", ("wilder", ("plus_dm", HIGH, LOW), period), atr, 100)
+    minus_di = ("ratio", ("wilder", ("minus_dm", HIGH, LOW), period), atr, 100)
+    return {"adx": ("wilder", ("dx", plus_di, minus_di), period), "plus_di": plus_di, "minus_di": minus_di}
+
+
+@register("obv", outputs=("obv",))
+def _obv():
+    """On-Balance Volume"""
+    return {"obv": ("obv", CLOSE, VOLUME)}
+
+
+@register("vwap", outputs=("vwap",), period=20)
+def _vwap(period):
+    """
+    Volume-weighted average of the typical price over `period` bars. With
+    period 0 it is cumulative within the session: since the first bar on
+    daily data, and the usual VWAP that restarts every day on intraday bars.
+    """
+    weighted = ("product", ("typical_price", HIGH, LOW, CLOSE), VOLUME)
+    if period == 0:
+        return {"vwap": ("ratio", ("session_sum", weighted, SESSION), ("session_sum", VOLUME, SESSION), 1)}
+    return {"vwap": ("ratio", ("rolling_sum", weighted, period), ("rolling_sum", VOLUME, period), 1)}
+
+
+@register("supertrend", outputs=("supertrend", "supertrend_direction"), period=10, multiplier=3)
+def _supertrend(period, multiplier):
+    """ATR bands around the bar midpoint that trail price and flip on a close through them"""
+    bands = ("supertrend", CLOSE, ("midpoint", HIGH, LOW), _atr(period), multiplier)
+    return {"supertrend": ("row", bands, 0), "supertrend_direction": ("row", bands, 1)}
@@ -0,0 +1,251 @@
+"""
+Intraday Bar Store
+1m/5m/15m NSE bars kept column by column in flat binary files: int64
+epoch-second timestamps, float32 open/high/low/close and int64 volume, one
+file per column for each symbol and interval. Reads are memory-mapped and
+sliced by binary search on the timestamps, so a backtest over a few weeks of
+minute bars only pages in those weeks, and months of bars for many symbols
+never have to be held as DataFrames.
+
+Bars are appended in time order. Writers in any server process hold an
+flock on the symbol/interval's writer.lock from reading meta.json to
+rewriting it, so concurrent syncs cannot interleave their appends. Bars at
+or before the last stored one are skipped, so re-ingesting a window is
+harmless. The row count in meta.json is updated after the column files, so
+readers (which take no lock) never see a half-written append.
+"""
+
+import os
+import re
+import json
+import time
+import threading
+import contextlib
+from typing import Any, Dict, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # no flock (Windows): only threads of one process are serialized
+
+INTRADAY_STORE_DIR = os.getenv(
+    "INTRADAY_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "intraday")
+)
+INTRADAY_SYNC_TTL = float(os.getenv("INTRADAY_SYNC_TTL", "900"))  # seconds between provider fetches
+
+# Bar length in seconds, and how far back Yahoo Finance serves each interval
+INTRADAY_INTERVALS = {"1m": 60, "5m": 300, "15m": 900}
+INTRADAY_FETCH_PERIOD = {"1m": "7d", "5m": "60d", "15m": "60d"}
+
+# NSE cash market session, in seconds after midnight IST (UTC+5:30, no DST)
+IST_OFFSET = 5 * 3600 + 30 * 60
+SESSION_OPEN = 9 * 3600 + 15 * 60
+SESSION_CLOSE = 15 * 3600 + 30 * 60
+SESSION_SECONDS = SESSION_CLOSE - SESSION_OPEN
+
+COLUMNS = {
+    "timestamp": np.int64,
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "volume": np.int64
+}
+
+
+def session_ids(timestamps: np.ndarray) -> np.ndarray:
+    """Trading session of each bar: its IST calendar day, as days since 1970-01-01"""
+    return (np.asarray(timestamps, dtype=np.int64) + IST_OFFSET) // 86400
+
+
+def bars_per_session(interval: str) -> int:
+    return SESSION_SECONDS // INTRADAY_INTERVALS[interval]
+
+
+def _epoch_seconds(value, tz: str = "Asia/Kolkata") -> int:
+    """A date/time (naive values are IST) -> epoch seconds"""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize(tz)
+    return int(ts.value // 10**9)
+
+
+class IntradayBars:
+    """One symbol/interval window: read-only views into the store's memory maps"""
+
+    def __init__(self, symbol: str, interval: str, columns: Dict[str, np.ndarray]):
+        self.symbol = symbol
+        self.interval = interval
+        self.timestamps = columns["timestamp"]
+        self._columns = columns
+        self._sessions = None
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def sessions(self) -> np.ndarray:
+        if self._sessions is None:
+            self._sessions = session_ids(self.timestamps)
+        return self._sessions
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """OHLCV as float64 arrays under the DataFrame column names; copies only this window"""
+        return {name.capitalize(): self._columns[name].astype(np.float64)
+                for name in ("open", "high", "low", "close", "volume")}
+
+    def label(self, i: int) -> str:
+        """Bar start in IST, e.g. 2024-12-30 09:15"""
+        return time.strftime("%Y-%m-%d %H:%M", time.gmtime(int(self.timestamps[i]) + IST_OFFSET))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The window as a yfinance-style DataFrame (for small windows and debugging)"""
+        index = pd.to_datetime(np.asarray(self.timestamps), unit="s", utc=True).tz_convert("Asia/Kolkata")
+        return pd.DataFrame(self.columns(), index=index)
+
+
+class IntradayStore:
+    def __init__(self, directory: str = INTRADAY_STORE_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._writer_locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._maps: Dict[Tuple[str, str], Tuple[int, Dict[str, np.ndarray]]] = {}
+
+    def _path(self, symbol: str, interval: str, name: str) -> str:
+        folder = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        return os.path.join(self.directory, folder, interval, name)
+
+    def _meta(self, symbol: str, interval: str) -> Dict[str, Any]:
+        try:
+            with open(self._path(symbol, interval, "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"count": 0, "last": None, "synced_at": 0}
+
+    def _write_meta(self, symbol: str, interval: str, meta: Dict[str, Any]) -> None:
+        path = self._path(symbol, interval, "meta.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(path + ".tmp", path)
+
+    @contextlib.contextmanager
+    def _writer(self, symbol: str, interval: str):
+        """Exclusive write access to one symbol/interval, across threads and processes"""
+        lock_path = self._path(symbol, interval, "writer.lock")
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with self._lock:
+            thread_lock = self._writer_locks.setdefault((symbol, interval), threading.Lock())
+        with thread_lock, open(lock_path, "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def count(self, symbol: str, interval: str) -> int:
+        return self._meta(symbol, interval)["count"]
+
+    def append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """
+        Add yfinance-style bars (DatetimeIndex, Open/High/Low/Close/Volume)
+        that fall inside the session and after the last stored bar; returns
+        how many were added
+        """
+        if interval not in INTRADAY_INTERVALS:
+            raise ValueError(f"Unsupported interval '{interval}'. Supported: {', '.join(INTRADAY_INTERVALS)}")
+        with self._writer(symbol, interval):
+            return self._append(symbol, interval, df)
+
+    def _append(self, symbol: str, interval: str, df: pd.DataFrame) -> int:
+        """append, with the writer lock already held"""
+        if df.empty:
+            return 0
+        index = df.index if df.index.tz is not None else df.index.tz_localize("Asia/Kolkata")
+        timestamps = index.tz_convert("UTC").tz_localize(None).to_numpy(dtype="datetime64[s]").astype(np.int64)
+        seconds = (timestamps + IST_OFFSET) % 86400
+        keep = (seconds >= SESSION_OPEN) & (seconds < SESSION_CLOSE) & df["Close"].notna().to_numpy()
+
+        meta = self._meta(symbol, interval)
+        if meta["last"] is not None:
+            keep &= timestamps > meta["last"]
+        if not keep.any():
+            return 0
+        rows, timestamps = df[keep], timestamps[keep]
+        order = np.argsort(timestamps, kind="stable")
+        timestamps, rows = timestamps[order], rows.iloc[order]
+        unique = np.concatenate(([True], np.diff(timestamps) > 0))
+        timestamps, rows = timestamps[unique], rows[unique]
+
+        values = {
+            "timestamp": timestamps,
+            "open": rows["Open"].to_numpy(),
+            "high": rows["High"].to_numpy(),
+            "low": rows["Low"].to_numpy(),
+            "close": rows["Close"].to_numpy(),
+            "volume": rows["Volume"].fillna(0).to_numpy()
+        }
+        for name, dtype in COLUMNS.items():
+            path = self._path(symbol, interval, f"{name}.bin")
+            stored = meta["count"] * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) > stored:
+                os.truncate(path, stored)  # drop the tail of an interrupted append
+            with open(path, "ab") as f:
+                f.write(np.ascontiguousarray(values[name], dtype=dtype).tobytes())
+        meta.update(count=meta["count"] + len(timestamps), last=int(timestamps[-1]))
+        self._write_meta(symbol, interval, meta)
+        return len(timestamps)
+
+    def _columns(self, symbol: str, interval: str) -> Dict[str, np.ndarray]:
+        """Memory maps of every column, reopened only when the row count has grown"""
+        count = self.count(symbol, interval)
+        cached = self._maps.get((symbol, interval))
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        if count == 0:
+            columns = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        else:
+            columns = {name: np.memmap(self._path(symbol, interval, f"{name}.bin"), dtype=dtype,
+                                       mode="r", shape=(count,))
+                       for name, dtype in COLUMNS.items()}
+        self._maps[(symbol, interval)] = (count, columns)
+        return columns
+
+    def load(self, symbol: str, interval: str, start: str = None, end: str = None) -> IntradayBars:
+        """Bars from `start` (inclusive) to `end` (exclusive); dates without a time are IST midnight"""
+        columns = self._columns(symbol, interval)
+        timestamps = columns["timestamp"]
+        lo = int(np.searchsorted(timestamps, _epoch_seconds(start), side="left")) if start else 0
+        hi = int(np.searchsorted(timestamps, _epoch_seconds(end), side="left")) if end else len(timestamps)
+        return IntradayBars(symbol, interval, {name: values[lo:hi] for name, values in columns.items()})
+
+    def sync(self, symbol: str, interval: str, force: bool = False) -> int:
+        """
+        Fetch the provider's recent bars and append the new ones (at most every
+        INTRADAY_SYNC_TTL). Concurrent syncs of a stale symbol fetch once: the
+        others wait for the writer lock and then find it fresh.
+        """
+        def fresh():
+            return not force and time.time() - self._meta(symbol, interval).get("synced_at", 0) < INTRADAY_SYNC_TTL
+
+        if fresh():
+            return 0
+        from market_data import get_intraday
+        with self._writer(symbol, interval):
+            if fresh():
+                return 0
+            added = self._append(symbol, interval, get_intraday(symbol, interval, INTRADAY_FETCH_PERIOD[interval]))
+            meta = self._meta(symbol, interval)
+            meta["synced_at"] = time.time()
+            self._write_meta(symbol, interval, meta)
+        return added
+
+    def size_bytes(self, symbol: str, interval: str) -> int:
+        return self.count(symbol, interval) * sum(np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+
+
+intraday_store = IntradayStore()
@@ -0,0 +1,305 @@
+"""
+Quiz Leaderboard
+Scores live in SQLite and are mirrored in memory by an indexable skip list,
+so a score update, a user's rank and a top-K page are all O(log n) instead
+of re-sorting every user. Badges are only recomputed when a score or streak
+crosses one of the badge thresholds.
+
+Each update bumps a version number in the database; other server processes
+apply just the rows with a newer version on their next read, so all workers
+see the same ranking without reloading the table.
+"""
+
+import os
+import json
+import random
+import sqlite3
+import threading
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+LEADERBOARD_DB_PATH = os.getenv(
+    "LEADERBOARD_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "leaderboard.db")
+)
+LEADERBOARD_PAGE_SIZE = int(os.getenv("LEADERBOARD_PAGE_SIZE", "50"))
+LEADERBOARD_MAX_PAGE_SIZE = 500
+
+# Every threshold any badge depends on; badges only change when a tier changes
+SCORE_THRESHOLDS = (300, 600, 800, 1000, 1200, 1400)
+STREAK_THRESHOLDS = (3, 5, 7, 10, 15, 20)
+
+SEED_LEADERBOARD = [
+    ("1", "Demo Learner", 850, 7),
+    ("user_123", "Priya Sharma", 1200, 15),
+    ("user_456", "Rahul Patel", 980, 5),
+    ("user_789", "Sneha Gupta", 1450, 23),
+    ("user_321", "Amit Singh", 720, 3)
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS leaderboard (
+    user_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    total_score INTEGER NOT NULL,
+    streak_days INTEGER NOT NULL,
+    badges TEXT NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS leaderboard_version ON leaderboard (version);
+"""
+
+
+def badge_tiers(total_score: int, streak_days: int) -> Tuple[int, int]:
+    return bisect_right(SCORE_THRESHOLDS, total_score), bisect_right(STREAK_THRESHOLDS, streak_days)
+
+
+@lru_cache(maxsize=None)
+def badges_for_tiers(score_tier: int, streak_tier: int) -> Tuple[str, ...]:
+    """Badges for a (score tier, streak tier) pair; there are only 49 pairs"""
+    score = (0,) + SCORE_THRESHOLDS
+    streak = (0,) + STREAK_THRESHOLDS
+    total_score, streak_days = score[score_tier], streak[streak_tier]
+
+    badges = []
+    if total_score >= 1400: badges.append("Expert")
+    elif total_score >= 1000: badges.append("Scholar")
+    elif total_score >= 600: badges.append("Rising Star")
+    elif total_score >= 300: badges.append("Rookie")
+    else: badges.append("Beginner")
+
+    for days in (20, 15, 10, 7, 5, 3):
+        if streak_days >= days:
+            badges.append(f"Streak {days}")
+            break
+
+    if total_score >= 1200 and streak_days >= 15: badges.append("Top Performer")
+    if total_score >= 800 and streak_days >= 10: badges.append("Quiz Master")
+    return tuple(badges)
+
+
+def calculate_badges(total_score: int, streak_days: int) -> List[str]:
+    return list(badges_for_tiers(*badge_tiers(total_score, streak_days)))
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels: int):
+        self.key = key
+        self.next: List[Optional["_Node"]] = [None] * levels
+        self.width = [1] * levels  # level-0 steps to next[level]
+
+
+class IndexableSkipList:
+    """
+    Sorted keys with O(log n) insert, remove, rank and positional access.
+    Every link records how many entries it skips, which is what makes
+    rank lookups and paging by offset logarithmic.
+    """
+
+    MAX_LEVELS = 24
+
+    def __init__(self):
+        self._head = _Node(None, self.MAX_LEVELS)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _random_levels(self) -> int:
+        levels = 1
+        while levels < self.MAX_LEVELS and random.random() < 0.5:
+            levels += 1
+        return levels
+
+    def insert(self, key) -> None:
+        chain = [self._head] * self.MAX_LEVELS
+        steps_at_level = [0] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        levels = self._random_levels()
+        new = _Node(key, levels)
+        steps = 0
+        for level in range(levels):
+            prev = chain[level]
+            new.next[level] = prev.next[level]
+            prev.next[level] = new
+            new.width[level] = prev.width[level] - steps
+            prev.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(levels, self.MAX_LEVELS):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key) -> None:
+        chain = [self._head] * self.MAX_LEVELS
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for level in range(len(target.next)):
+            prev = chain[level]
+            prev.width[level] += target.width[level] - 1
+            prev.next[level] = target.next[level]
+        for level in range(len(target.next), self.MAX_LEVELS):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def rank(self, key) -> int:
+        """0-based position of key"""
+        position = 0
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        if node.next[0] is None or node.next[0].key != key:
+            raise KeyError(key)
+        return position
+
+    def slice(self, start: int, count: int) -> list:
+        """Up to `count` keys starting at 0-based position `start`"""
+        if start < 0 or start >= self._size or count <= 0:
+            return []
+        remaining = start + 1
+        node = self._head
+        for level in reversed(range(self.MAX_LEVELS)):
+            while node.next[level] is not None and node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+class Leaderboard:
+    def __init__(self, db_path: str = LEADERBOARD_DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._ranking = IndexableSkipList()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._version = 0
+        self._pages: Dict[Tuple[int, int], Tuple[int, List[Dict[str, Any]]]] = {}
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            if conn.execute("SELECT COUNT(*) FROM leaderboard").fetchone()[0] == 0:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO leaderboard VALUES (?, ?, ?, ?, ?, 0)",
+                    [(user_id, name, score, streak, json.dumps(calculate_badges(score, streak)))
+                     for user_id, name, score, streak in SEED_LEADERBOARD]
+                )
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _key(entry: Dict[str, Any]) -> Tuple[int, str]:
+        # Highest score first; ties in user id order so ranks are stable
+        return (-entry["totalScore"], entry["userId"])
+
+    def _sync(self) -> None:
+        """Apply rows changed since the last sync, by this or any other process"""
+        conn = self._conn()
+        with self._lock:
+            rows = conn.execute(
+                "SELECT * FROM leaderboard WHERE version > ? OR ? = 0 ORDER BY version",
+                (self._version, len(self._entries))
+            ).fetchall()
+            for row in rows:
+                old = self._entries.get(row["user_id"])
+                if old is not None:
+                    self._ranking.remove(self._key(old))
+                entry = {
+                    "userId": row["user_id"],
+                    "name": row["name"],
+                    "totalScore": row["total_score"],
+                    "streakDays": row["streak_days"],
+                    "badges": json.loads(row["badges"])
+                }
+                self._entries[entry["userId"]] = entry
+                self._ranking.insert(self._key(entry))
+                self._version = max(self._version, row["version"])
+            if rows:
+                self._pages.clear()
+
+    def update_score(self, user_id: str, points: int, name: Optional[str] = None) -> Dict[str, Any]:
+        """Add quiz points (one quiz counts as a streak day), creating the entry if needed"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT * FROM leaderboard WHERE user_id = ?", (user_id,)).fetchone()
+            if row is None:
+                score, streak, badges = 0, 0, None
+                name = name or "Learner"
+            else:
+                score, streak, badges = row["total_score"], row["streak_days"], row["badges"]
+                name = name or row["name"]
+
+            new_score, new_streak = score + int(points), streak + 1
+            tiers = badge_tiers(new_score, new_streak)
+            if badges is None or tiers != badge_tiers(score, streak):
+                badges = json.dumps(list(badges_for_tiers(*tiers)))
+
+            version = conn.execute("SELECT COALESCE(MAX(version), 0) + 1 FROM leaderboard").fetchone()[0]
+            conn.execute(
+                "INSERT INTO leaderboard VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (user_id) DO UPDATE SET "
+                "name = excluded.name, total_score = excluded.total_score, streak_days = excluded.streak_days, "
+                "badges = excluded.badges, version = excluded.version",
+                (user_id, name, new_score, new_streak, badges, version)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._sync()
+        return self.get_user(user_id)
+
+    def get_user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        self._sync()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            return {**entry, "rank": self._ranking.rank(self._key(entry)) + 1}
+
+    def page(self, offset: int = 0, limit: int = LEADERBOARD_PAGE_SIZE) -> Dict[str, Any]:
+        """Ranked entries offset+1 .. offset+limit; pages are cached until the next update"""
+        offset = max(offset, 0)
+        limit = min(max(limit, 1), LEADERBOARD_MAX_PAGE_SIZE)
+        self._sync()
+        with self._lock:
+            cached = self._pages.get((offset, limit))
+            if cached is None or cached[0] != self._version:
+                keys = self._ranking.slice(offset, limit)
+                entries = [{**self._entries[user_id], "rank": offset + i + 1}
+                           for i, (_, user_id) in enumerate(keys)]
+                cached = (self._version, entries)
+                if len(self._pages) >= 256:
+                    self._pages.clear()
+                self._pages[(offset, limit)] = cached
+            return {"entries": cached[1], "total": len(self._ranking), "offset": offset, "limit": limit}
+
+
+leaderboard = Leaderboard()
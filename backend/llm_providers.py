@@ -0,0 +1,123 @@
+"""
+LLM and Web Search Providers
+Builds the chat model and search tool used by the agent and the content summarizer.
+Set LLM_PROVIDER=stub to swap Groq/Tavily for a deterministic local stand-in
+with configurable latency and output size (for offline load testing).
+"""
+
+import os
+import json
+import time
+import random
+import hashlib
+from typing import Any, Iterator, List, Optional
+from dotenv import load_dotenv
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain.tools import tool
+
+load_dotenv()
+
+# Provider selection: "groq" (live Groq + Tavily) or "stub" (local, no network)
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq").lower()
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+
+# Stub backend settings
+STUB_LLM_LATENCY_MS = float(os.getenv("STUB_LLM_LATENCY_MS", "200"))
+STUB_LLM_TOKENS = int(os.getenv("STUB_LLM_TOKENS", "60"))
+STUB_LLM_TOKEN_INTERVAL_MS = float(os.getenv("STUB_LLM_TOKEN_INTERVAL_MS", "0"))
+STUB_SEARCH_LATENCY_MS = float(os.getenv("STUB_SEARCH_LATENCY_MS", "300"))
+
+STUB_VOCABULARY = [
+    "investors", "should", "diversify", "across", "equity", "debt", "and", "gold",
+    "the", "portfolio", "risk", "return", "volatility", "SEBI", "recommends", "a",
+    "long-term", "horizon", "with", "regular", "SIP", "contributions", "to",
+    "benefit", "from", "compounding", "while", "keeping", "an", "emergency", "fund",
+]
+
+
+class StubChatModel(BaseChatModel):
+    """
+    Deterministic chat model: sleeps for `latency_ms` (time to first token),
+    then answers with `tokens` words chosen from a fixed vocabulary seeded by
+    the prompt, spending `token_interval_ms` per word.
+    Never requests tools, so a ReAct agent finishes after one model call.
+    """
+
+    latency_ms: float = STUB_LLM_LATENCY_MS
+    tokens: int = STUB_LLM_TOKENS
+    token_interval_ms: float = STUB_LLM_TOKEN_INTERVAL_MS
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub-chat"
+
+    def bind_tools(self, tools: Any, **kwargs: Any) -> "StubChatModel":
+        return self
+
+    def _render(self, messages: List[BaseMessage]) -> str:
+        prompt = str(messages[-1].content) if messages else ""
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16], 16)
+        rng = random.Random(seed)
+        return " ".join(rng.choice(STUB_VOCABULARY) for _ in range(self.tokens))
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep((self.latency_ms + self.tokens * self.token_interval_ms) / 1000)
+        message = AIMessage(content=self._render(messages))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency_ms / 1000)
+        for i, word in enumerate(self._render(messages).split(" ")):
+            if i:
+                time.sleep(self.token_interval_ms / 1000)
+            token = word if i == 0 else f" {word}"
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+
+@tool("tavily_search_results_json")
+def stub_search(query: str) -> str:
+    """
+    A search engine optimized for comprehensive, accurate, and trusted results.
+    Input should be a search query.
+    """
+    time.sleep(STUB_SEARCH_LATENCY_MS / 1000)
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:8]
+    return json.dumps([
+        {
+            "url": f"https://example.com/search/{digest}/{i}",
+            "content": f"Stub search result {i + 1} for '{query}'"
+        }
+        for i in range(2)
+    ])
+
+
+def get_model_name() -> str:
+    """Name of the active chat model (used to key cached LLM output)"""
+    return "stub" if LLM_PROVIDER == "stub" else GROQ_MODEL
+
+
+def get_chat_model(temperature: Optional[float] = None) -> BaseChatModel:
+    """Build the chat model for the configured provider"""
+    if LLM_PROVIDER == "stub":
+        return StubChatModel()
+
+    from langchain_groq import ChatGroq
+    if temperature is None:
+        return ChatGroq(model=GROQ_MODEL)
+    return ChatGroq(model=GROQ_MODEL, temperature=temperature)
+
+
+def get_search_tool(max_results: int = 2):
+    """Build the web search tool for the configured provider"""
+    if LLM_PROVIDER == "stub":
+        return stub_search
+
+    from langchain_community.tools.tavily_search import TavilySearchResults
+    return TavilySearchResults(max_results=max_results)
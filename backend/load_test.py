@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Load Test Harness
+Drives a running server with concurrent clients and reports requests/sec and
+latency percentiles for each endpoint class. For repeatable numbers, start the
+server against recorded data and the stub LLM:
+
+    MARKET_DATA_MODE=replay LLM_PROVIDER=stub gunicorn -c gunicorn.conf.py wsgi:app
+    python load_test.py --url http://localhost:5001 --concurrency 16 --duration 20
+
+Repeated requests hit the memo and response caches after warm-up; set
+RESPONSE_CACHE_ENABLED=false on the server to load the LLM path itself.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+import statistics
+import urllib.error
+import urllib.request
+from typing import Any, Dict, List, Tuple
+
+# Endpoint classes: (method, path, JSON body)
+ENDPOINT_CLASSES: Dict[str, List[Tuple[str, str, Any]]] = {
+    "static": [
+        ("GET", "/health", None),
+        ("GET", "/risk_questions", None),
+        ("GET", "/risk_profiles", None),
+        ("GET", "/algo_stocks", None),
+        ("GET", "/supported_languages", None)
+    ],
+    "compute": [
+        ("POST", "/calculate_risk_profile", {
+            "answers": [{"question_id": i, "score": 7} for i in range(1, 11)],
+            "age": 30, "investment_horizon": 10
+        }),
+        ("POST", "/analyze_portfolio_risk", {"holdings": [
+            {"symbol": "RELIANCE", "quantity": 10, "avg_price": 2500, "current_price": 2600},
+            {"symbol": "TCS", "quantity": 5, "avg_price": 3500, "current_price": 3400},
+            {"symbol": "INFY", "quantity": 20, "avg_price": 1500, "current_price": 1550}
+        ]})
+    ],
+    "market": [
+        ("POST", "/generate_report", {"symbol": "RELIANCE.NS", "benchmark": "^NSEI"}),
+        ("POST", "/generate_report", {"symbol": "TCS.NS", "benchmark": "^NSEI"}),
+        ("POST", "/algo_backtest", {"symbol": "INFY.NS", "strategy_blocks": [
+            {"type": "indicator", "id": "rsi", "params": {"period": 14}},
+            {"type": "condition", "id": "threshold", "params": {"indicator": "rsi", "operator": "<", "value": 30}},
+            {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 20}}
+        ]})
+    ],
+    "llm": [
+        ("POST", "/get_response", {"query": "What is a SIP and how does rupee cost averaging work?"}),
+        ("POST", "/get_response", {"query": "Explain the difference between equity and debt funds"})
+    ]
+}
+
+
+def send(base_url: str, method: str, path: str, body: Any, timeout: float) -> int:
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(base_url + path, data=data, method=method,
+                                 headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def run_class(base_url: str, name: str, concurrency: int, duration: float, timeout: float) -> Dict[str, Any]:
+    """Hammer one endpoint class with `concurrency` clients for `duration` seconds"""
+    requests = ENDPOINT_CLASSES[name]
+    latencies: List[float] = []
+    errors = {"count": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def client(seed: int):
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            method, path, body = rng.choice(requests)
+            start = time.perf_counter()
+            try:
+                ok = send(base_url, method, path, body, timeout) < 400
+            except Exception:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                if not ok:
+                    errors["count"] += 1
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    if not latencies:
+        return {"requests": 0, "errors": 0, "requests_per_sec": 0.0}
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors["count"],
+        "requests_per_sec": round(len(latencies) / wall, 2),
+        "mean_ms": round(statistics.fmean(latencies) * 1000, 2),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "concurrency": concurrency,
+        "duration_s": round(wall, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the JainVest API by endpoint class")
+    parser.add_argument("--url", default="http://localhost:5001", help="Server base URL")
+    parser.add_argument("--classes", help=f"Comma-separated classes ({', '.join(ENDPOINT_CLASSES)})")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per class")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per class")
+    parser.add_argument("--timeout", type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Save results as JSON")
+    args = parser.parse_args()
+
+    classes = args.classes.split(",") if args.classes else list(ENDPOINT_CLASSES)
+    unknown = [c for c in classes if c not in ENDPOINT_CLASSES]
+    if unknown:
+        parser.error(f"Unknown classes: {', '.join(unknown)}")
+
+    base_url = args.url.rstrip("/")
+    try:
+        send(base_url, "GET", "/health", None, 5)
+    except Exception as e:
+        print(f"❌ Server not reachable at {base_url}: {str(e)}")
+        return 1
+
+    results = {}
+    for name in classes:
+        # Warm caches and lazily built clients so they do not skew the first class
+        for method, path, body in ENDPOINT_CLASSES[name]:
+            try:
+                send(base_url, method, path, body, args.timeout)
+            except Exception:
+                pass
+        print(f"🔥 {name}: {args.concurrency} clients for {args.duration:g}s...")
+        results[name] = run_class(base_url, name, args.concurrency, args.duration, args.timeout)
+        r = results[name]
+        if r["requests"]:
+            print(f"   {r['requests_per_sec']:.1f} req/s, p50 {r['p50_ms']}ms, p95 {r['p95_ms']}ms, "
+                  f"p99 {r['p99_ms']}ms, {r['errors']} errors")
+        else:
+            print("   no requests completed")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"url": base_url, "results": results}, f, indent=2)
+        print(f"✅ Results saved to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,33 +1,89 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
+import os
+import json
 from flask_cors import CORS
-from ai_agent import get_agent_response, get_financial_report_json
-from content_aggregator import get_aggregated_content, LANGUAGES
+import metrics
+import compression
+from metrics import timed
+# ai_agent, content_aggregator and algo_backtest pull in langchain, yfinance,
+# pandas and bs4, so they are imported inside the routes that need them to
+# keep worker startup light
 from risk_assessment import (
     get_risk_questions, calculate_risk_score, analyze_portfolio_risk,
     suggest_asset_allocation, get_risk_profiles
 )
-from algo_backtest import backtest_strategy, get_indian_stocks
 
 app = Flask(__name__)
+metrics.init_app(app)
+compression.init_app(app)
 
-# Configure CORS properly - allow both React dev servers
-CORS(app, origins=["http://localhost:3000", "http://127.0.0.1:3000", "http://localhost:5174", "http://127.0.0.1:5174"], 
+MAX_BATCH_SYMBOLS = 25
+
+
+def _supported_languages_payload():
+    from content_aggregator import LANGUAGES
+    return {
+        "success": True,
+        "languages": [{"code": "en", "name": "English"}] + [
+            {"code": code, "name": name} for code, name in LANGUAGES.items()
+        ]
+    }
+
+
+def _algo_stocks_payload():
+    from algo_backtest import get_indian_stocks
+    return {"success": True, "stocks": get_indian_stocks()}
+
+
+# Constant payloads, serialized and compressed once (see compression.py)
+RISK_QUESTIONS_RESPONSE = compression.StaticJSON(lambda: {"success": True, "questions": get_risk_questions()})
+RISK_PROFILES_RESPONSE = compression.StaticJSON(lambda: {"success": True, "profiles": get_risk_profiles()})
+SUPPORTED_LANGUAGES_RESPONSE = compression.StaticJSON(_supported_languages_payload)
+ALGO_STOCKS_RESPONSE = compression.StaticJSON(_algo_stocks_payload)
+STATIC_RESPONSES = [RISK_QUESTIONS_RESPONSE, RISK_PROFILES_RESPONSE, SUPPORTED_LANGUAGES_RESPONSE, ALGO_STOCKS_RESPONSE]
+
+# Browser origins allowed to call the API (the React dev servers by default)
+CORS_ORIGINS = [o.strip() for o in os.getenv(
+    "CORS_ORIGINS",
+    "http://localhost:3000,http://127.0.0.1:3000,http://localhost:5173,http://127.0.0.1:5173,"
+    "http://localhost:5174,http://127.0.0.1:5174"
+).split(",") if o.strip()]
+# How long browsers may reuse a preflight answer (Chromium caps this at 2 hours)
+CORS_MAX_AGE = int(os.getenv("CORS_MAX_AGE", "86400"))
+
+# flask_cors adds the CORS headers to actual responses
+CORS(app, origins=CORS_ORIGINS,
      methods=["GET", "POST", "OPTIONS"],
-     allow_headers=["Content-Type", "Authorization"])
+     allow_headers=["Content-Type", "Authorization"],
+     max_age=CORS_MAX_AGE)
+
+_PREFLIGHT_HEADERS = {
+    "Access-Control-Allow-Methods": "GET, POST, OPTIONS",
+    "Access-Control-Allow-Headers": "Content-Type, Authorization",
+    "Access-Control-Max-Age": str(CORS_MAX_AGE)
+}
 
-# Add a preflight handler for all origins during development
+
+# Every preflight is answered here, before any route runs, with precomputed headers
 @app.before_request
 def handle_preflight():
     if request.method == "OPTIONS":
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response 
+        response = app.response_class(status=204)
+        response.vary.add("Origin")
+        origin = request.headers.get("Origin")
+        if origin and ("*" in CORS_ORIGINS or origin in CORS_ORIGINS):
+            response.headers.update(_PREFLIGHT_HEADERS)
+            response.headers["Access-Control-Allow-Origin"] = origin
+        return response
 
 @app.route('/get_response', methods=['POST'])
 def get_response():
-    """Original chat endpoint"""
+    """
+    Original chat endpoint
+    Expected JSON payload: {"query": "...", "session_id": "..."} (session_id is optional;
+    send "new_session": true instead to start one)
+    Follow-up questions reuse the server-side history of the returned session_id
+    """
     try:
         data = request.get_json()
         query = data.get('query')
@@ -35,11 +91,74 @@ def get_response():
         if not query:
             return jsonify({"error": "Query is required"}), 400
             
-        response = get_agent_response(query)
-        return jsonify({"response": response})
+        from ai_agent import get_agent_response
+        # Stateless unless the client continues a session or asks for a new one
+        session_id = data.get('session_id')
+        if session_id or data.get('new_session'):
+            from session_store import session_store
+            session_id = session_store.get_or_create(session_id).id
+        response = get_agent_response(query, session_id=session_id)
+        return jsonify({"response": response, "session_id": session_id})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@app.route('/get_response_stream', methods=['POST'])
+def get_response_stream():
+    """
+    Streaming chat endpoint (Server-Sent Events)
+    Expected JSON payload: {"query": "...", "session_id": "..."} (session_id is optional;
+    send "new_session": true instead to start one)
+    Emits a session event (with a session), then token, tool_start, tool_end and done events while the agent runs
+    """
+    data = request.get_json() or {}
+    query = data.get('query')
+    
+    if not query:
+        return jsonify({"error": "Query is required"}), 400
+    
+    from ai_agent import stream_agent_response
+    # Stateless unless the client continues a session or asks for a new one
+    session_id = data.get('session_id')
+    if session_id or data.get('new_session'):
+        from session_store import session_store
+        session_id = session_store.get_or_create(session_id).id
+    
+    def generate():
+        try:
+            if session_id:
+                yield f"event: session\ndata: {json.dumps({'type': 'session', 'session_id': session_id})}\n\n"
+            for event in stream_agent_response(query, session_id=session_id):
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'error': str(e)})}\n\n"
+    
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/clear_session', methods=['POST'])
+def clear_session():
+    """
+    Forget a chat session's history and cached tool outputs
+    Expected JSON payload: {"session_id": "..."}
+    """
+    data = request.get_json(silent=True) or {}
+    from session_store import session_store
+    removed = session_store.delete(data.get('session_id', ''))
+    return jsonify({"success": True, "removed": removed})
+
+@app.route('/invalidate_response_cache', methods=['POST'])
+def invalidate_response_cache():
+    """
+    Drop cached chat answers that depend on market data
+    Expected JSON payload: {"symbol": "TCS.NS"} (symbol is optional; omit to drop all)
+    """
+    data = request.get_json(silent=True) or {}
+    from response_cache import response_cache
+    removed = response_cache.invalidate(data.get('symbol'))
+    return jsonify({"success": True, "removed": removed, "cache": response_cache.stats()})
+
 @app.route('/financial_report', methods=['POST'])
 def financial_report():
     """
@@ -55,6 +174,7 @@ def financial_report():
             return jsonify({"error": "Stock symbol is required"}), 400
         
         # Generate comprehensive financial report
+        from ai_agent import get_financial_report_json
         report = get_financial_report_json(symbol.upper(), benchmark)
         
         if "error" in report:
@@ -98,27 +218,15 @@ def get_stock_data_endpoint():
     except Exception as e:
         return jsonify({"error": f"Internal server error: {str(e)}"}), 500
 
-@app.route('/generate_report', methods=['POST', 'OPTIONS'])
+@app.route('/generate_report', methods=['POST'])
 def generate_comprehensive_report():
     """
     Generate a comprehensive financial analysis report in proper JSON format
     Expected JSON payload: {"symbol": "AAPL", "benchmark": "^GSPC"}
     Returns: Structured financial report with all key metrics
     """
-    # Handle preflight request
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        print(f"Received request: {request.method} {request.url}")
-        print(f"Request headers: {dict(request.headers)}")
-        
         data = request.get_json()
-        print(f"Request data: {data}")
         
         symbol = data.get('symbol')
         benchmark = data.get('benchmark', '^GSPC')
@@ -130,10 +238,10 @@ def generate_comprehensive_report():
                 "code": "MISSING_SYMBOL"
             }), 400
         
-        print(f"Processing report for symbol: {symbol}, benchmark: {benchmark}")
-        
         # Generate comprehensive financial report
         try:
+            with timed("import"):
+                from ai_agent import get_financial_report_json
             report_data = get_financial_report_json(symbol.upper(), benchmark)
         except Exception as report_error:
             print(f"Error generating report: {str(report_error)}")
@@ -154,139 +262,202 @@ def generate_comprehensive_report():
             }), 400
         
         # Structure the response as a proper financial report
-        financial_report = {
-            "success": True,
-            "generated_at": "2025-09-04T00:00:00Z",
-            "report_type": "Comprehensive Financial Analysis",
-            "analysis_period": report_data.get("analysis_period", "2 Years"),
-            "stock_symbol": symbol.upper(),
-            "benchmark": benchmark,
-            
-            # Executive Summary
-            "executive_summary": {
-                "company_name": report_data["stock_info"]["company_name"],
-                "sector": report_data["stock_info"]["sector"],
-                "current_price": report_data["stock_info"]["current_price"],
-                "currency": report_data["stock_info"]["currency"],
-                "market_cap": report_data["stock_info"]["market_cap"],
-                "investment_grade": report_data["investment_recommendation"]["risk_level"],
-                "suitable_for": report_data["investment_recommendation"]["suitable_for"],
-                "overall_rating": _calculate_overall_rating(report_data)
-            },
-            
-            # Performance Analysis
-            "performance_analysis": {
-                "returns": {
-                    "cagr": {
-                        "value": report_data["performance_metrics"]["cagr"]["value"],
-                        "percentage": report_data["performance_metrics"]["cagr"]["percentage"],
-                        "interpretation": _interpret_cagr(report_data["performance_metrics"]["cagr"]["value"]),
-                        "explanation": report_data["performance_metrics"]["cagr"]["explanation"]
-                    }
-                },
-                "risk_metrics": {
-                    "volatility": {
-                        "value": report_data["performance_metrics"]["volatility"]["value"],
-                        "percentage": report_data["performance_metrics"]["volatility"]["percentage"],
-                        "risk_level": _interpret_volatility(report_data["performance_metrics"]["volatility"]["value"]),
-                        "explanation": report_data["performance_metrics"]["volatility"]["explanation"]
-                    },
-                    "sharpe_ratio": {
-                        "value": report_data["risk_metrics"]["sharpe_ratio"]["value"],
-                        "rating": report_data["risk_metrics"]["sharpe_ratio"]["interpretation"],
-                        "explanation": report_data["risk_metrics"]["sharpe_ratio"]["explanation"]
-                    },
-                    "beta": {
-                        "value": report_data["risk_metrics"]["beta"]["value"],
-                        "market_sensitivity": report_data["risk_metrics"]["beta"]["interpretation"],
-                        "explanation": report_data["risk_metrics"]["beta"]["explanation"]
-                    },
-                    "maximum_drawdown": {
-                        "value": report_data["risk_metrics"]["max_drawdown"]["value"],
-                        "percentage": report_data["risk_metrics"]["max_drawdown"]["percentage"],
-                        "peak_date": report_data["risk_metrics"]["max_drawdown"]["peak_date"],
-                        "trough_date": report_data["risk_metrics"]["max_drawdown"]["trough_date"],
-                        "severity": _interpret_drawdown(report_data["risk_metrics"]["max_drawdown"]["value"]),
-                        "explanation": report_data["risk_metrics"]["max_drawdown"]["explanation"]
-                    }
+        financial_report = _build_structured_report(symbol.upper(), benchmark, report_data)
+        
+        with timed("serialization"):
+            return jsonify(financial_report)
+        
+    except Exception as e:
+        print(f"❌ Exception in generate_report endpoint: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({
+            "success": False,
+            "error": f"Internal server error: {str(e)}",
+            "code": "INTERNAL_ERROR"
+        }), 500
+
+def _build_structured_report(symbol, benchmark, report_data):
+    """Shape a raw metrics report into the structured GetReport response"""
+    financial_report = {
+        "success": True,
+        "generated_at": "2025-09-04T00:00:00Z",
+        "report_type": "Comprehensive Financial Analysis",
+        "analysis_period": report_data.get("analysis_period", "2 Years"),
+        "stock_symbol": symbol,
+        "benchmark": benchmark,
+        
+        # Executive Summary
+        "executive_summary": {
+            "company_name": report_data["stock_info"]["company_name"],
+            "sector": report_data["stock_info"]["sector"],
+            "current_price": report_data["stock_info"]["current_price"],
+            "currency": report_data["stock_info"]["currency"],
+            "market_cap": report_data["stock_info"]["market_cap"],
+            "investment_grade": report_data["investment_recommendation"]["risk_level"],
+            "suitable_for": report_data["investment_recommendation"]["suitable_for"],
+            "overall_rating": _calculate_overall_rating(report_data)
+        },
+        
+        # Performance Analysis
+        "performance_analysis": {
+            "returns": {
+                "cagr": {
+                    "value": report_data["performance_metrics"]["cagr"]["value"],
+                    "percentage": report_data["performance_metrics"]["cagr"]["percentage"],
+                    "interpretation": _interpret_cagr(report_data["performance_metrics"]["cagr"]["value"]),
+                    "explanation": report_data["performance_metrics"]["cagr"]["explanation"]
                 }
             },
-            
-            # Advanced Analysis
-            "advanced_analysis": {
-                "capm_model": {
-                    "expected_return": report_data["capm_analysis"]["expected_return"],
-                    "expected_return_percentage": report_data["capm_analysis"]["expected_return_percentage"],
-                    "market_return": report_data["capm_analysis"]["market_return"],
-                    "risk_free_rate": report_data["capm_analysis"]["risk_free_rate"],
-                    "explanation": report_data["capm_analysis"]["explanation"]
+            "risk_metrics": {
+                "volatility": {
+                    "value": report_data["performance_metrics"]["volatility"]["value"],
+                    "percentage": report_data["performance_metrics"]["volatility"]["percentage"],
+                    "risk_level": _interpret_volatility(report_data["performance_metrics"]["volatility"]["value"]),
+                    "explanation": report_data["performance_metrics"]["volatility"]["explanation"]
+                },
+                "sharpe_ratio": {
+                    "value": report_data["risk_metrics"]["sharpe_ratio"]["value"],
+                    "rating": report_data["risk_metrics"]["sharpe_ratio"]["interpretation"],
+                    "explanation": report_data["risk_metrics"]["sharpe_ratio"]["explanation"]
+                },
+                "beta": {
+                    "value": report_data["risk_metrics"]["beta"]["value"],
+                    "market_sensitivity": report_data["risk_metrics"]["beta"]["interpretation"],
+                    "explanation": report_data["risk_metrics"]["beta"]["explanation"]
                 },
-                "monte_carlo_simulation": {
-                    "projected_scenarios": {
-                        "most_likely_outcome": report_data["monte_carlo_simulation"]["mean_projected_return"],
-                        "worst_case_5th_percentile": report_data["monte_carlo_simulation"]["downside_risk_5th_percentile"],
-                        "best_case_95th_percentile": report_data["monte_carlo_simulation"]["upside_potential_95th_percentile"]
-                    },
-                    "probability_analysis": {
-                        "positive_return_probability": report_data["monte_carlo_simulation"]["probability_of_positive_return"],
-                        "simulations_run": report_data["monte_carlo_simulation"]["simulations_run"]
-                    },
-                    "explanation": report_data["monte_carlo_simulation"]["explanation"]
+                "maximum_drawdown": {
+                    "value": report_data["risk_metrics"]["max_drawdown"]["value"],
+                    "percentage": report_data["risk_metrics"]["max_drawdown"]["percentage"],
+                    "peak_date": report_data["risk_metrics"]["max_drawdown"]["peak_date"],
+                    "trough_date": report_data["risk_metrics"]["max_drawdown"]["trough_date"],
+                    "severity": _interpret_drawdown(report_data["risk_metrics"]["max_drawdown"]["value"]),
+                    "explanation": report_data["risk_metrics"]["max_drawdown"]["explanation"]
                 }
+            }
+        },
+        
+        # Advanced Analysis
+        "advanced_analysis": {
+            "capm_model": {
+                "expected_return": report_data["capm_analysis"]["expected_return"],
+                "expected_return_percentage": report_data["capm_analysis"]["expected_return_percentage"],
+                "market_return": report_data["capm_analysis"]["market_return"],
+                "risk_free_rate": report_data["capm_analysis"]["risk_free_rate"],
+                "explanation": report_data["capm_analysis"]["explanation"]
             },
-            
-            # Investment Recommendation
-            "investment_recommendation": {
-                "recommendation": _generate_recommendation(report_data),
-                "risk_assessment": {
-                    "overall_risk": report_data["investment_recommendation"]["risk_level"],
-                    "investor_profile": report_data["investment_recommendation"]["suitable_for"],
-                    "key_risk_factors": _extract_risk_factors(report_data)
+            "monte_carlo_simulation": {
+                "projected_scenarios": {
+                    "most_likely_outcome": report_data["monte_carlo_simulation"]["mean_projected_return"],
+                    "worst_case_5th_percentile": report_data["monte_carlo_simulation"]["downside_risk_5th_percentile"],
+                    "best_case_95th_percentile": report_data["monte_carlo_simulation"]["upside_potential_95th_percentile"]
                 },
-                "key_insights": report_data["investment_recommendation"]["key_insights"],
-                "action_points": _generate_action_points(report_data)
-            },
-            
-            # Educational Content
-            "educational_content": {
-                "key_concepts": {
-                    "cagr": report_data["educational_notes"]["cagr_importance"],
-                    "volatility": report_data["educational_notes"]["volatility_education"],
-                    "sharpe_ratio": report_data["educational_notes"]["sharpe_ratio_significance"],
-                    "beta_capm": report_data["educational_notes"]["beta_capm_relevance"],
-                    "drawdown": report_data["educational_notes"]["drawdown_protection"],
-                    "monte_carlo": report_data["educational_notes"]["monte_carlo_value"]
+                "probability_analysis": {
+                    "positive_return_probability": report_data["monte_carlo_simulation"]["probability_of_positive_return"],
+                    "simulations_run": report_data["monte_carlo_simulation"]["simulations_run"]
                 },
-                "learning_resources": {
-                    "beginner_concepts": [
-                        "Understanding CAGR for long-term investment planning",
-                        "Risk vs Return relationship through volatility",
-                        "Market sensitivity analysis using Beta"
-                    ],
-                    "advanced_concepts": [
-                        "Risk-adjusted performance evaluation",
-                        "Portfolio optimization using modern portfolio theory",
-                        "Scenario analysis through Monte Carlo simulations"
-                    ]
-                }
+                "explanation": report_data["monte_carlo_simulation"]["explanation"]
+            }
+        },
+        
+        # Investment Recommendation
+        "investment_recommendation": {
+            "recommendation": _generate_recommendation(report_data),
+            "risk_assessment": {
+                "overall_risk": report_data["investment_recommendation"]["risk_level"],
+                "investor_profile": report_data["investment_recommendation"]["suitable_for"],
+                "key_risk_factors": _extract_risk_factors(report_data)
             },
-            
-            # Technical Details
-            "technical_details": {
-                "data_source": "Yahoo Finance",
-                "analysis_methodology": "Modern Portfolio Theory & CAPM",
-                "data_points_analyzed": report_data.get("data_points_analyzed", "500+"),
-                "benchmark_index": benchmark,
-                "risk_free_rate_assumed": "2.0%",
-                "confidence_interval": "95%"
+            "key_insights": report_data["investment_recommendation"]["key_insights"],
+            "action_points": _generate_action_points(report_data)
+        },
+        
+        # Educational Content
+        "educational_content": {
+            "key_concepts": {
+                "cagr": report_data["educational_notes"]["cagr_importance"],
+                "volatility": report_data["educational_notes"]["volatility_education"],
+                "sharpe_ratio": report_data["educational_notes"]["sharpe_ratio_significance"],
+                "beta_capm": report_data["educational_notes"]["beta_capm_relevance"],
+                "drawdown": report_data["educational_notes"]["drawdown_protection"],
+                "monte_carlo": report_data["educational_notes"]["monte_carlo_value"]
+            },
+            "learning_resources": {
+                "beginner_concepts": [
+                    "Understanding CAGR for long-term investment planning",
+                    "Risk vs Return relationship through volatility",
+                    "Market sensitivity analysis using Beta"
+                ],
+                "advanced_concepts": [
+                    "Risk-adjusted performance evaluation",
+                    "Portfolio optimization using modern portfolio theory",
+                    "Scenario analysis through Monte Carlo simulations"
+                ]
             }
+        },
+        
+        # Technical Details
+        "technical_details": {
+            "data_source": "Yahoo Finance",
+            "analysis_methodology": "Modern Portfolio Theory & CAPM",
+            "data_points_analyzed": report_data.get("data_points_analyzed", "500+"),
+            "benchmark_index": benchmark,
+            "risk_free_rate_assumed": "2.0%",
+            "confidence_interval": "95%"
         }
+    }
+    return financial_report
+
+@app.route('/generate_report_batch', methods=['POST'])
+def generate_report_batch():
+    """
+    Generate structured reports for several symbols in one call
+    Expected JSON payload: {"symbols": ["TCS.NS", "INFY.NS"], "benchmark": "^GSPC"}
+    Returns: {"success": true, "reports": {symbol: structured report}}
+    Data is loaded once (one shared benchmark) and metrics run in parallel.
+    """
+    try:
+        data = request.get_json() or {}
+        symbols = list(dict.fromkeys(str(s).upper() for s in data.get('symbols', []) if s))
+        benchmark = data.get('benchmark', '^GSPC')
         
-        print(f"✅ Successfully generated report for {symbol}")
-        return jsonify(financial_report)
+        if not symbols:
+            return jsonify({
+                "success": False,
+                "error": "At least one stock symbol is required",
+                "code": "MISSING_SYMBOL"
+            }), 400
+        
+        if len(symbols) > MAX_BATCH_SYMBOLS:
+            return jsonify({
+                "success": False,
+                "error": f"At most {MAX_BATCH_SYMBOLS} symbols per batch",
+                "code": "TOO_MANY_SYMBOLS"
+            }), 400
+        
+        from ai_agent import get_financial_reports_batch
+        raw_reports = get_financial_reports_batch(symbols, benchmark)
+        
+        reports = {}
+        for symbol, report_data in raw_reports.items():
+            if "error" in report_data:
+                reports[symbol] = {
+                    "success": False,
+                    "error": report_data["error"],
+                    "code": "ANALYSIS_ERROR"
+                }
+            else:
+                reports[symbol] = _build_structured_report(symbol, benchmark, report_data)
+        
+        return jsonify({
+            "success": True,
+            "benchmark": benchmark,
+            "count": len(reports),
+            "reports": reports
+        })
         
     except Exception as e:
-        print(f"❌ Exception in generate_report endpoint: {str(e)}")
+        print(f"❌ Exception in generate_report_batch endpoint: {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -364,7 +535,7 @@ def _extract_risk_factors(report_data):
     
     if volatility > 0.3:
         factors.append("High price volatility")
-    if beta > 1.3:
+    if beta is not None and beta > 1.3:
         factors.append("Highly sensitive to market movements")
     if drawdown > 0.3:
         factors.append("Significant historical drawdowns")
@@ -391,16 +562,9 @@ def _generate_action_points(report_data):
     
     return actions
 
-@app.route('/test', methods=['GET', 'POST', 'OPTIONS'])
+@app.route('/test', methods=['GET', 'POST'])
 def test_endpoint():
     """Simple test endpoint to verify connectivity"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     return jsonify({
         "success": True,
         "message": "Backend is working!",
@@ -413,20 +577,15 @@ def health_check():
     """Health check endpoint"""
     return jsonify({"status": "healthy", "message": "Financial AI Agent API is running"})
 
-@app.route('/sebi_content', methods=['GET', 'POST', 'OPTIONS'])
+@app.route('/sebi_content', methods=['GET', 'POST'])
 def sebi_content():
     """
     Get aggregated SEBI/NISM/NSE content with AI summarization and vernacular translation
     Query params: language (en, hi, mr, gu, ta, te, bn, kn, ml), summary (true/false)
     """
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
+        from content_aggregator import get_aggregated_content, LANGUAGES
+        
         # Get parameters
         if request.method == 'POST':
             data = request.get_json() or {}
@@ -442,16 +601,12 @@ def sebi_content():
                 "success": False,
                 "error": f"Unsupported language. Supported: en, {', '.join(LANGUAGES.keys())}"
             })
-            response.headers.add("Access-Control-Allow-Origin", "*")
             return response, 400
         
-        print(f"📚 Fetching SEBI content in {language}...")
-        
         # Get aggregated content
         result = get_aggregated_content(language=language, include_summary=include_summary)
         
         response = jsonify(result)
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response
         
     except Exception as e:
@@ -462,61 +617,27 @@ def sebi_content():
             "success": False,
             "error": f"Failed to fetch content: {str(e)}"
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
-@app.route('/supported_languages', methods=['GET', 'OPTIONS'])
+@app.route('/supported_languages', methods=['GET'])
 def supported_languages():
     """Get list of supported vernacular languages"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
-    response = jsonify({
-        "success": True,
-        "languages": [{"code": "en", "name": "English"}] + [
-            {"code": code, "name": name} for code, name in LANGUAGES.items()
-        ]
-    })
-    response.headers.add("Access-Control-Allow-Origin", "*")
+    response = SUPPORTED_LANGUAGES_RESPONSE.response()
     return response
 
-@app.route('/risk_questions', methods=['GET', 'OPTIONS'])
+@app.route('/risk_questions', methods=['GET'])
 def risk_questions():
     """Get risk assessment questionnaire"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        questions = get_risk_questions()
-        response = jsonify({
-            "success": True,
-            "questions": questions
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
+        response = RISK_QUESTIONS_RESPONSE.response()
         return response
     except Exception as e:
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
-@app.route('/calculate_risk_profile', methods=['POST', 'OPTIONS'])
+@app.route('/calculate_risk_profile', methods=['POST'])
 def calculate_risk_profile():
     """Calculate risk profile from questionnaire answers"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         answers = data.get('answers', [])
@@ -539,154 +660,254 @@ def calculate_risk_profile():
             "risk_assessment": risk_result,
             "asset_allocation": allocation
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response
     except Exception as e:
         print(f"Error in risk profile calculation: {str(e)}")
         import traceback
         traceback.print_exc()
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
-@app.route('/analyze_portfolio_risk', methods=['POST', 'OPTIONS'])
+@app.route('/analyze_portfolio_risk', methods=['POST'])
 def portfolio_risk():
     """Analyze portfolio risk metrics"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
-        holdings = data.get('holdings', [])
+        user_id = data.get('user_id')
         
-        analysis = analyze_portfolio_risk(holdings)
+        if user_id:
+            # Server-side paper portfolio, marked to market from the shared price table
+            from portfolio_service import portfolio_service
+            analysis = portfolio_service.analyze_risk(str(user_id))
+        else:
+            analysis = analyze_portfolio_risk(data.get('holdings', []))
         
         response = jsonify({
             "success": True,
             "analysis": analysis
         })
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response
     except Exception as e:
         print(f"Error in portfolio risk analysis: {str(e)}")
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
-@app.route('/risk_profiles', methods=['GET', 'OPTIONS'])
+@app.route('/risk_profiles', methods=['GET'])
 def risk_profiles():
     """Get all risk profile definitions"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        profiles = get_risk_profiles()
-        response = jsonify({
-            "success": True,
-            "profiles": profiles
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
+        response = RISK_PROFILES_RESPONSE.response()
         return response
     except Exception as e:
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
+# ===== MARKET DATA ENDPOINTS =====
+
+@app.route('/market_snapshot', methods=['GET'])
+def market_snapshot():
+    """Index levels and top gainers/losers from the precomputed market snapshot"""
+    try:
+        from market_snapshot import snapshot_service
+        return jsonify(snapshot_service.get())
+    except Exception as e:
+        print(f"Error in market snapshot: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/ohlc', methods=['GET'])
+def ohlc():
+    """OHLC candles as parallel arrays: ?symbol=&resolution=1d|1wk|1mo&start=&end=&limit="""
+    symbol = request.args.get('symbol')
+    if not symbol:
+        return jsonify({"success": False, "error": "Stock symbol is required"}), 400
+    
+    try:
+        limit = request.args.get('limit', type=int)
+        from ohlc import get_candles
+        result = get_candles(
+            symbol,
+            resolution=request.args.get('resolution', '1d'),
+            start=request.args.get('start'),
+            end=request.args.get('end'),
+            limit=limit
+        )
+        if "error" in result:
+            return jsonify({"success": False, "error": result["error"]}), 400
+        return jsonify({"success": True, **result})
+    except Exception as e:
+        print(f"Error in OHLC endpoint: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# ===== PAPER TRADING ENDPOINTS =====
+
+@app.route('/portfolio', methods=['GET'])
+def portfolio():
+    """Paper trading portfolio marked to market: ?user_id="""
+    user_id = request.args.get('user_id')
+    if not user_id:
+        return jsonify({"success": False, "error": "user_id is required"}), 400
+    
+    try:
+        from portfolio_service import portfolio_service
+        return jsonify({"success": True, "portfolio": portfolio_service.get_portfolio(user_id)})
+    except Exception as e:
+        print(f"Error in portfolio: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/portfolio/trade', methods=['POST'])
+def portfolio_trade():
+    """Buy or sell in a paper trading portfolio at the latest market price"""
+    data = request.get_json() or {}
+    user_id = data.get('user_id')
+    symbol = data.get('symbol')
+    if not user_id or not symbol:
+        return jsonify({"success": False, "error": "user_id and symbol are required"}), 400
+    
+    try:
+        from portfolio_service import portfolio_service, PortfolioError
+        result = portfolio_service.trade(
+            str(user_id),
+            action=data.get('action', 'BUY'),
+            symbol=symbol,
+            quantity=data.get('quantity')
+        )
+        return jsonify({"success": True, "portfolio": result})
+    except PortfolioError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        print(f"Error in portfolio trade: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/portfolio/reset', methods=['POST'])
+def portfolio_reset():
+    """Reset a paper trading portfolio to starting cash"""
+    data = request.get_json() or {}
+    user_id = data.get('user_id')
+    if not user_id:
+        return jsonify({"success": False, "error": "user_id is required"}), 400
+    
+    try:
+        from portfolio_service import portfolio_service
+        return jsonify({"success": True, "portfolio": portfolio_service.reset(str(user_id))})
+    except Exception as e:
+        print(f"Error in portfolio reset: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# ===== LEADERBOARD ENDPOINTS =====
+
+@app.route('/leaderboard', methods=['GET'])
+def get_leaderboard():
+    """Ranked leaderboard page: ?offset=&limit=&user_id= (user_id adds that user's rank)"""
+    try:
+        from leaderboard import leaderboard, LEADERBOARD_PAGE_SIZE
+        result = leaderboard.page(
+            offset=request.args.get('offset', 0, type=int),
+            limit=request.args.get('limit', LEADERBOARD_PAGE_SIZE, type=int)
+        )
+        user_id = request.args.get('user_id')
+        if user_id:
+            result["user"] = leaderboard.get_user(user_id)
+        return jsonify({"success": True, **result})
+    except Exception as e:
+        print(f"Error in leaderboard: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@app.route('/leaderboard/score', methods=['POST'])
+def leaderboard_score():
+    """Add quiz points for a user and return their updated entry and rank"""
+    data = request.get_json() or {}
+    user_id = data.get('user_id')
+    score = data.get('score')
+    if not user_id or not isinstance(score, (int, float)):
+        return jsonify({"success": False, "error": "user_id and a numeric score are required"}), 400
+    
+    try:
+        from leaderboard import leaderboard
+        entry = leaderboard.update_score(str(user_id), int(score), name=data.get('name'))
+        return jsonify({"success": True, "user": entry})
+    except Exception as e:
+        print(f"Error in leaderboard score update: {str(e)}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
 # ===== ALGO BUILDER ENDPOINTS =====
 
-@app.route('/algo_stocks', methods=['GET', 'OPTIONS'])
+@app.route('/algo_stocks', methods=['GET'])
 def algo_stocks():
     """Get list of Indian stocks for algo trading"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
-        stocks = get_indian_stocks()
-        response = jsonify({
-            "success": True,
-            "stocks": stocks
-        })
-        response.headers.add("Access-Control-Allow-Origin", "*")
+        response = ALGO_STOCKS_RESPONSE.response()
         return response
     except Exception as e:
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
-@app.route('/algo_backtest', methods=['POST', 'OPTIONS'])
+@app.route('/algo_backtest', methods=['POST'])
 def algo_backtest():
     """Run backtest on real market data with user's strategy"""
-    if request.method == 'OPTIONS':
-        response = jsonify()
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add('Access-Control-Allow-Headers', "*")
-        response.headers.add('Access-Control-Allow-Methods', "*")
-        return response
-    
     try:
         data = request.get_json()
         symbol = data.get('symbol', 'RELIANCE.NS')
         strategy_blocks = data.get('strategy_blocks', [])
-        start_date = data.get('start_date')
-        end_date = data.get('end_date')
+        # The Backtest page sends a named strategy ("rules") instead of blocks
+        strategy = data.get('strategy') or data.get('rules')
+        start_date = data.get('start_date') or data.get('startDate')
+        end_date = data.get('end_date') or data.get('endDate')
         initial_capital = data.get('initial_capital', 100000)
+        # 1d (default) or intraday bars: 1m, 5m, 15m
+        interval = data.get('interval', '1d')
         
-        if not strategy_blocks:
+        if not strategy_blocks and not strategy:
             response = jsonify({
                 "success": False,
                 "error": "Strategy blocks are required"
             })
-            response.headers.add("Access-Control-Allow-Origin", "*")
             return response, 400
         
-        print(f"Running backtest for {symbol} with {len(strategy_blocks)} blocks")
-        
-        result = backtest_strategy(
+        from algo_backtest import run_backtest_cached
+        result = run_backtest_cached(
             symbol=symbol,
-            strategy_blocks=strategy_blocks,
+            strategy_blocks=strategy_blocks or None,
             start_date=start_date,
             end_date=end_date,
-            initial_capital=initial_capital
+            initial_capital=initial_capital,
+            strategy=None if strategy_blocks else strategy,
+            interval=interval
         )
         
         response = jsonify(result)
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response
     except Exception as e:
         print(f"Error in algo backtest: {str(e)}")
         import traceback
         traceback.print_exc()
         response = jsonify({"success": False, "error": str(e)})
-        response.headers.add("Access-Control-Allow-Origin", "*")
         return response, 500
 
 if __name__ == "__main__":
     print("🚀 Starting JainVest Financial Analysis API...")
     print("🌐 Server will be available at: http://localhost:5001")
-    print("🔧 Debug mode: ON")
+    print("🔧 Debug mode: ON (for production: gunicorn -c gunicorn.conf.py wsgi:app)")
     print("📊 Available endpoints:")
     print("  - GET  /health")
     print("  - GET  /test") 
     print("  - POST /generate_report")
+    print("  - POST /generate_report_batch (Reports for several symbols)")
     print("  - POST /financial_report")
     print("  - POST /stock_data")
     print("  - POST /get_response")
+    print("  - POST /get_response_stream (Streaming chat, Server-Sent Events)")
     print("  - GET/POST /sebi_content (SEBI/NISM content aggregator)")
     print("  - GET  /supported_languages (Vernacular language support)")
     print("  - GET  /risk_questions (Risk assessment questionnaire)")
     print("  - POST /calculate_risk_profile (Calculate investor risk profile)")
     print("  - POST /analyze_portfolio_risk (Portfolio risk analysis)")
     print("  - GET  /risk_profiles (Risk profile definitions)")
+    print("  - GET  /market_snapshot (Indices and top gainers/losers)")
+    print("  - GET  /ohlc (Daily/weekly/monthly candles)")
+    print("  - GET  /portfolio (Paper trading portfolio, marked to market)")
+    print("  - POST /portfolio/trade (Paper trading buy/sell)")
+    print("  - POST /portfolio/reset (Reset paper trading portfolio)")
+    print("  - GET  /leaderboard (Ranked quiz leaderboard)")
+    print("  - POST /leaderboard/score (Add quiz points)")
+    print("  - GET  /metrics (Request and stage timings, Prometheus format)")
     app.run(debug=True, host='0.0.0.0', port=5001)
\ No newline at end of file
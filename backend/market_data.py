@@ -0,0 +1,363 @@
+"""
+Market Data Access Layer
+Single entry point for Yahoo Finance price history and company info.
+Results are memoized in-process under (name, args, as-of date), so the agent
+tools and the Flask endpoints share one download per symbol per day.
+The data source is pluggable (see set_provider), so benchmarks and tests can
+run against synthetic or recorded prices instead of the network.
+
+MARKET_DATA_MODE selects the source at startup:
+    live    - Yahoo Finance (default)
+    record  - Yahoo Finance, saving every response as a fixture
+    replay  - fixtures only, never touches the network
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import threading
+import functools
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Optional
+import pandas as pd
+from metrics import timed, record_cache
+
+MARKET_DATA_CACHE_SIZE = int(os.getenv("MARKET_DATA_CACHE_SIZE", "512"))
+MARKET_DATA_TTL = float(os.getenv("MARKET_DATA_TTL", "3600"))  # seconds, within one as-of date
+MARKET_DATA_TIMEOUT = float(os.getenv("MARKET_DATA_TIMEOUT", "20"))  # seconds per Yahoo Finance request
+MARKET_DATA_MODE = os.getenv("MARKET_DATA_MODE", "live").lower()  # live, record or replay
+MARKET_DATA_FIXTURES = os.getenv(
+    "MARKET_DATA_FIXTURES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "market_data")
+)
+
+# Calendar days covered by the yfinance period strings
+PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 31, "3mo": 92, "6mo": 183, "1y": 365,
+    "2y": 730, "5y": 1826, "10y": 3652, "max": 365 * 100
+}
+
+
+class MemoCache:
+    """
+    Thread-safe LRU cache with TTL. Concurrent misses for the same key wait
+    for a single computation instead of each fetching the data.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, threading.Lock] = {}
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        value, stored_at = entry
+        if time.time() - stored_at > self.ttl:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def get_or_compute(self, key, compute: Callable[[], Any], cache_if: Callable[[Any], bool]):
+        with self._lock:
+            found, value = self._lookup(key)
+            record_cache(key[0], found)
+            if found:
+                return value
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                found, value = self._lookup(key)
+                if found:
+                    return value
+            try:
+                value = compute()
+                if cache_if(value):
+                    with self._lock:
+                        self._entries[key] = (value, time.time())
+                        self._entries.move_to_end(key)
+                        while len(self._entries) > self.max_entries:
+                            self._entries.popitem(last=False)
+                return value
+            finally:
+                with self._lock:
+                    self._inflight.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+_memo_cache = MemoCache(MARKET_DATA_CACHE_SIZE, MARKET_DATA_TTL)
+
+
+def as_of_date() -> str:
+    """Date the cached market data belongs to"""
+    return date.today().isoformat()
+
+
+def memoize(name: str, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Memoize a function under (name, args, kwargs, as-of date).
+    `cache_if` decides whether a result is worth keeping (e.g. skip errors).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())), as_of_date())
+            return _memo_cache.get_or_compute(
+                key, lambda: func(*args, **kwargs), cache_if or (lambda value: True)
+            )
+        return wrapper
+    return decorator
+
+
+def tool_succeeded(result: str) -> bool:
+    """Tools report failures as {"error": ...} JSON; those are not cached"""
+    return not result.lstrip().startswith('{"error"')
+
+
+class YFinanceProvider:
+    """Live prices and company info from Yahoo Finance"""
+
+    def history(self, symbol: str, period: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        import yfinance as yf
+        ticker = yf.Ticker(symbol)
+        if period:
+            return ticker.history(period=period, timeout=MARKET_DATA_TIMEOUT)
+        return ticker.history(start=start, end=end, timeout=MARKET_DATA_TIMEOUT)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        import yfinance as yf
+        return yf.Ticker(symbol).info
+
+    def intraday(self, symbol: str, interval: str, period: str) -> pd.DataFrame:
+        # Yahoo keeps 1m bars for about 7 days and 5m/15m bars for 60
+        import yfinance as yf
+        return yf.Ticker(symbol).history(period=period, interval=interval, timeout=MARKET_DATA_TIMEOUT)
+
+
+def slice_history(df: pd.DataFrame, period: str = None, start: str = None, end: str = None,
+                  as_of: pd.Timestamp = None) -> pd.DataFrame:
+    """
+    Window a full price history the way yfinance does: `period` counts back
+    from `as_of` (default: the last bar), `start` is inclusive, `end` exclusive
+    """
+    if df.empty:
+        return df
+    tz = df.index.tz
+
+    def to_ts(value):
+        ts = pd.Timestamp(value)
+        if tz is not None:
+            ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+        return ts
+
+    last = to_ts(as_of) if as_of is not None else df.index[-1]
+    if period == "ytd":
+        return df[df.index >= last.replace(month=1, day=1, hour=0, minute=0, second=0)]
+    if period or not (start or end):
+        days = PERIOD_DAYS.get(period or "1mo", 365)
+        return df[(df.index > last - pd.Timedelta(days=days)) & (df.index <= last)]
+    mask = pd.Series(True, index=df.index)
+    if start:
+        mask &= df.index >= to_ts(start)
+    if end:
+        mask &= df.index < to_ts(end)
+    return df[mask.values]
+
+
+def _fixture_path(directory: str, symbol: str) -> str:
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9._-]", "_", symbol) + ".json.gz")
+
+
+def _read_fixture(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _history_from_fixture(fixture: Dict[str, Any]) -> pd.DataFrame:
+    history = fixture.get("history")
+    if not history:
+        return pd.DataFrame()
+    index = pd.to_datetime(history["index"], utc=True)
+    if fixture.get("timezone"):
+        index = index.tz_convert(fixture["timezone"])
+    return pd.DataFrame(history["data"], index=index, columns=history["columns"])
+
+
+class RecordingProvider:
+    """
+    Passes calls through to another provider and saves the responses as
+    gzipped JSON fixtures, one file per symbol. Repeated recordings of a
+    symbol are merged, so the fixture keeps the longest history seen.
+    """
+
+    def __init__(self, inner, directory: str = MARKET_DATA_FIXTURES):
+        self.inner = inner
+        self.directory = directory
+        self._lock = threading.Lock()
+
+    def _update(self, symbol: str, update: Callable[[Dict[str, Any]], None]) -> None:
+        path = _fixture_path(self.directory, symbol)
+        with self._lock:
+            fixture = _read_fixture(path) or {"symbol": symbol}
+            update(fixture)
+            fixture["recorded_at"] = pd.Timestamp.now(tz="UTC").isoformat()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = f"{path}.tmp"
+                with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                    json.dump(fixture, f, default=str)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                print(f"Fixture write error for {symbol}: {str(e)}")
+
+    def history(self, symbol: str, period: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        df = self.inner.history(symbol, period=period, start=start, end=end)
+        if df.empty:
+            return df
+
+        def update(fixture):
+            merged = df
+            recorded = _history_from_fixture(fixture)
+            if not recorded.empty:
+                merged = pd.concat([recorded.tz_convert(df.index.tz), df])
+                merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            fixture["timezone"] = str(df.index.tz) if df.index.tz is not None else None
+            fixture["history"] = {
+                "index": [ts.isoformat() for ts in merged.index],
+                "columns": list(merged.columns),
+                "data": merged.astype(float).values.tolist()
+            }
+
+        self._update(symbol, update)
+        return df
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        info = self.inner.info(symbol)
+        if info:
+            self._update(symbol, lambda fixture: fixture.__setitem__("info", info))
+        return info
+
+
+class ReplayProvider:
+    """
+    Serves recorded fixtures with no network access. Periods are measured back
+    from the last recorded bar, so results do not drift from day to day.
+    Symbols without a fixture get an empty history, like an unknown ticker.
+    """
+
+    def __init__(self, directory: str = MARKET_DATA_FIXTURES):
+        self.directory = directory
+        self._fixtures: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def _fixture(self, symbol: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if symbol not in self._fixtures:
+                fixture = _read_fixture(_fixture_path(self.directory, symbol))
+                if fixture is not None:
+                    fixture["frame"] = _history_from_fixture(fixture)
+                else:
+                    print(f"No recorded market data for {symbol} in {self.directory}")
+                self._fixtures[symbol] = fixture
+            return self._fixtures[symbol]
+
+    def history(self, symbol: str, period: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+        fixture = self._fixture(symbol)
+        if fixture is None:
+            return pd.DataFrame()
+        return slice_history(fixture["frame"], period=period, start=start, end=end)
+
+    def info(self, symbol: str) -> Dict[str, Any]:
+        fixture = self._fixture(symbol)
+        return dict(fixture.get("info") or {}) if fixture else {}
+
+
+def provider_for_mode(mode: str = MARKET_DATA_MODE, directory: str = MARKET_DATA_FIXTURES):
+    """Build the provider for a MARKET_DATA_MODE value"""
+    if mode == "replay":
+        return ReplayProvider(directory)
+    if mode == "record":
+        return RecordingProvider(YFinanceProvider(), directory)
+    if mode != "live":
+        print(f"Unknown MARKET_DATA_MODE '{mode}', using live data")
+    return YFinanceProvider()
+
+
+def record_fixtures(symbols, period: str = "max", directory: str = MARKET_DATA_FIXTURES) -> Dict[str, int]:
+    """Capture history and info for symbols from Yahoo Finance; returns bars recorded per symbol"""
+    recorder = RecordingProvider(YFinanceProvider(), directory)
+    recorded = {}
+    for symbol in symbols:
+        try:
+            recorded[symbol] = len(recorder.history(symbol, period=period))
+            recorder.info(symbol)
+        except Exception as e:
+            print(f"Error recording {symbol}: {str(e)}")
+            recorded[symbol] = 0
+    return recorded
+
+
+_provider = provider_for_mode()
+
+
+def set_provider(provider) -> None:
+    """
+    Swap the data source. A provider has history(symbol, period, start, end)
+    and info(symbol) methods, and optionally intraday(symbol, interval, period);
+    memoized results from the old one are dropped.
+    """
+    global _provider
+    _provider = provider
+    clear_cache()
+
+
+def get_provider():
+    return _provider
+
+
+@memoize("history", cache_if=lambda df: not df.empty)
+def get_history(symbol: str, period: str = None, start: str = None, end: str = None) -> pd.DataFrame:
+    """
+    Daily price history for a symbol. The returned DataFrame is shared between
+    callers, so treat it as read-only.
+    """
+    with timed("data_fetch"):
+        return _provider.history(symbol, period=period, start=start, end=end)
+
+
+def get_intraday(symbol: str, interval: str, period: str) -> pd.DataFrame:
+    """
+    Recent intraday bars (1m/5m/15m) from the provider. Not memoized: the
+    intraday store (intraday_store.py) keeps them instead.
+    """
+    intraday = getattr(_provider, "intraday", None)
+    if intraday is None:
+        raise ValueError("The current market data provider has no intraday bars")
+    with timed("data_fetch"):
+        return intraday(symbol, interval=interval, period=period)
+
+
+@memoize("info", cache_if=bool)
+def get_info(symbol: str) -> Dict[str, Any]:
+    """Company info (name, sector, market cap, currency...)"""
+    with timed("data_fetch"):
+        return _provider.info(symbol)
+
+
+def clear_cache() -> None:
+    """Drop all memoized market data and tool results"""
+    _memo_cache.clear()
@@ -0,0 +1,184 @@
+"""
+Market Snapshot Engine
+Precomputes the Market page overview: index levels with day change, and the
+top gainers, losers and most active stocks across the stock universe. The
+snapshot is rebuilt in the background on a fixed interval, so page views
+only read the latest snapshot and never fetch prices themselves.
+"""
+
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+from metrics import timed
+
+MARKET_SNAPSHOT_REFRESH = float(os.getenv("MARKET_SNAPSHOT_REFRESH", "300"))  # seconds between rebuilds
+MARKET_SNAPSHOT_TOP = int(os.getenv("MARKET_SNAPSHOT_TOP", "5"))
+MARKET_SNAPSHOT_UNIVERSE = os.getenv("MARKET_SNAPSHOT_UNIVERSE", "default").lower()  # default or nifty50
+MARKET_SNAPSHOT_WORKERS = int(os.getenv("MARKET_SNAPSHOT_WORKERS", "8"))
+
+INDICES = {
+    "NIFTY 50": "^NSEI",
+    "SENSEX": "^BSESN",
+    "NIFTY BANK": "^NSEBANK",
+    "NIFTY IT": "^CNXIT"
+}
+
+# NIFTY 50 constituents not already in the Algo Builder stock list
+NIFTY_50_EXTRA = [
+    "ADANIENT.NS", "ADANIPORTS.NS", "APOLLOHOSP.NS", "BAJAJ-AUTO.NS", "BAJFINANCE.NS",
+    "BAJAJFINSV.NS", "BEL.NS", "BPCL.NS", "CIPLA.NS", "COALINDIA.NS", "DRREDDY.NS",
+    "EICHERMOT.NS", "GRASIM.NS", "HCLTECH.NS", "HDFCLIFE.NS", "HEROMOTOCO.NS",
+    "HINDALCO.NS", "INDUSINDBK.NS", "JSWSTEEL.NS", "M&M.NS", "NTPC.NS", "ONGC.NS",
+    "POWERGRID.NS", "SBILIFE.NS", "SHRIRAMFIN.NS", "TATACONSUM.NS", "TATAMOTORS.NS",
+    "TATASTEEL.NS", "TRENT.NS", "ADANIGREEN.NS"
+]
+
+
+def get_universe() -> List[str]:
+    """Symbols ranked for gainers/losers"""
+    from algo_backtest import get_indian_stocks
+    symbols = [stock["symbol"] for stock in get_indian_stocks()]
+    if MARKET_SNAPSHOT_UNIVERSE == "nifty50":
+        symbols += [s for s in NIFTY_50_EXTRA if s not in symbols]
+    return symbols
+
+
+def format_volume(volume: float) -> str:
+    """Volume the way the Market page shows it: 2.3M, 987K"""
+    if volume >= 1_000_000:
+        return f"{volume / 1_000_000:.1f}M"
+    if volume >= 1_000:
+        return f"{volume / 1_000:.0f}K"
+    return str(int(volume))
+
+
+def _last_two_bars(symbol: str) -> Optional[Dict[str, float]]:
+    """Latest and previous daily bars for a symbol, straight from the provider"""
+    import market_data
+    try:
+        # Bypass the memo cache, which would hold today's prices for an hour
+        df = market_data.get_provider().history(symbol, period="5d")
+    except Exception as e:
+        print(f"Snapshot fetch error for {symbol}: {str(e)}")
+        return None
+    if df is None or len(df) < 2:
+        return None
+    last, prev = df.iloc[-1], df.iloc[-2]
+    return {
+        "last": float(last["Close"]),
+        "prev": float(prev["Close"]),
+        "high": float(last["High"]),
+        "low": float(last["Low"]),
+        "volume": float(last["Volume"])
+    }
+
+
+def _rank(order: np.ndarray, values: np.ndarray, n: int, largest: bool) -> np.ndarray:
+    """Indices of the n largest (or smallest) values, best first, via a partial sort"""
+    if len(values) == 0:
+        return order[:0]
+    n = min(n, len(values))
+    keyed = -values if largest else values
+    top = np.argpartition(keyed, n - 1)[:n]
+    return order[top[np.argsort(keyed[top], kind="stable")]]
+
+
+def build_snapshot(top_n: int = MARKET_SNAPSHOT_TOP) -> Dict[str, Any]:
+    """Fetch the latest bars for the indices and universe and rank the movers"""
+    universe = get_universe()
+    symbols = list(INDICES.values()) + universe
+    with timed("snapshot_fetch"), ThreadPoolExecutor(max_workers=MARKET_SNAPSHOT_WORKERS) as pool:
+        bars = dict(zip(symbols, pool.map(_last_two_bars, symbols)))
+
+    indices = []
+    for name, symbol in INDICES.items():
+        bar = bars.get(symbol)
+        if bar:
+            change = bar["last"] - bar["prev"]
+            indices.append({
+                "symbol": name,
+                "last": round(bar["last"], 2),
+                "change": round(change, 2),
+                "changePct": round(change / bar["prev"] * 100, 2),
+                "high": round(bar["high"], 2),
+                "low": round(bar["low"], 2)
+            })
+
+    # Price matrix: one row per stock with columns last, prev, volume
+    stocks = [s for s in universe if bars.get(s)]
+    matrix = np.array([[bars[s]["last"], bars[s]["prev"], bars[s]["volume"]] for s in stocks]).reshape(-1, 3)
+    change = matrix[:, 0] - matrix[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = np.where(matrix[:, 1] > 0, change / matrix[:, 1] * 100, 0.0)
+    order = np.arange(len(stocks))
+
+    def rows(selected):
+        return [{
+            "symbol": stocks[i].rsplit(".", 1)[0],
+            "ticker": stocks[i],
+            "last": round(float(matrix[i, 0]), 2),
+            "change": round(float(change[i]), 2),
+            "changePct": round(float(change_pct[i]), 2),
+            "volume": format_volume(matrix[i, 2]),
+            "volumeValue": int(matrix[i, 2])
+        } for i in selected]
+
+    advancing = order[change_pct > 0]
+    declining = order[change_pct < 0]
+    return {
+        "success": True,
+        "indices": indices,
+        "topGainers": rows(_rank(advancing, change_pct[advancing], top_n, largest=True)),
+        "topLosers": rows(_rank(declining, change_pct[declining], top_n, largest=False)),
+        "mostActive": rows(_rank(order, matrix[:, 2], top_n, largest=True)),
+        "advances": int(len(advancing)),
+        "declines": int(len(declining)),
+        "universeSize": len(stocks),
+        "lastUpdated": datetime.now().isoformat(timespec="seconds")
+    }
+
+
+class SnapshotService:
+    """
+    Holds the latest snapshot and rebuilds it on a background thread. The
+    thread starts on first use in each process, so it also runs in forked
+    server workers.
+    """
+
+    def __init__(self, refresh_interval: float = MARKET_SNAPSHOT_REFRESH):
+        self.refresh_interval = refresh_interval
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._refresher_pid = None
+
+    def refresh(self) -> Dict[str, Any]:
+        snapshot = build_snapshot()
+        self._snapshot = snapshot
+        return snapshot
+
+    def _refresh_loop(self) -> None:
+        while True:
+            time.sleep(self.refresh_interval)
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"Market snapshot refresh error: {str(e)}")
+
+    def get(self) -> Dict[str, Any]:
+        """Latest snapshot; the first call in a process builds it"""
+        with self._lock:
+            if self._refresher_pid != os.getpid():
+                self._refresher_pid = os.getpid()
+                self._snapshot = None
+                threading.Thread(target=self._refresh_loop, name="market-snapshot", daemon=True).start()
+            if self._snapshot is None:
+                self.refresh()
+            return self._snapshot
+
+
+snapshot_service = SnapshotService()
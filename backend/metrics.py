@@ -0,0 +1,203 @@
+"""
+Request Metrics and Stage Timing
+In-process counters and histograms rendered in the Prometheus text format
+at /metrics, per-stage timers (data fetch, indicators, Monte Carlo, LLM...)
+attributed to the endpoint being served, and sampled structured request logs.
+Metrics are per process; with several workers, scrape each one.
+"""
+
+import os
+import json
+import time
+import random
+import logging
+import threading
+import contextlib
+import contextvars
+from typing import Dict, Iterable, Tuple
+
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", "0.1"))  # share of requests logged
+SLOW_REQUEST_SECONDS = float(os.getenv("SLOW_REQUEST_SECONDS", "5"))  # always logged above this
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+logger = logging.getLogger("jainvest.requests")
+if not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+# Endpoint and per-stage timings of the request being served in this context
+_current_endpoint = contextvars.ContextVar("current_endpoint", default="none")
+_request_stages = contextvars.ContextVar("request_stages", default=None)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{str(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value:g}")
+        return "\n".join(lines)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, *labels: str, value: float) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # bucket counts, then sum and count
+                series = self._series[labels] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for labels, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series):
+                    le = _format_labels(self.labelnames, labels, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{le} {count}")
+                le = _format_labels(self.labelnames, labels, 'le="+Inf"')
+                plain = _format_labels(self.labelnames, labels)
+                lines.append(f"{self.name}_bucket{le} {series[-1]}")
+                lines.append(f"{self.name}_sum{plain} {series[-2]:.6f}")
+                lines.append(f"{self.name}_count{plain} {series[-1]}")
+        return "\n".join(lines)
+
+
+REQUESTS_TOTAL = Counter(
+    "jainvest_requests_total", "HTTP requests served", ("endpoint", "method", "status")
+)
+REQUEST_SECONDS = Histogram(
+    "jainvest_request_seconds", "End-to-end request latency", ("endpoint",)
+)
+STAGE_SECONDS = Histogram(
+    "jainvest_stage_seconds", "Time spent in each processing stage", ("endpoint", "stage")
+)
+CACHE_REQUESTS_TOTAL = Counter(
+    "jainvest_cache_requests_total", "Cache lookups by outcome", ("cache", "result")
+)
+TOOL_TIMEOUTS_TOTAL = Counter(
+    "jainvest_tool_timeouts_total", "Agent tool calls abandoned after their timeout", ("tool",)
+)
+
+REGISTRY = [REQUESTS_TOTAL, REQUEST_SECONDS, STAGE_SECONDS, CACHE_REQUESTS_TOTAL, TOOL_TIMEOUTS_TOTAL]
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record time spent in a stage for the current endpoint"""
+    STAGE_SECONDS.observe(_current_endpoint.get(), stage, value=seconds)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages[stage] = round(stages.get(stage, 0.0) + seconds, 6)
+
+
+@contextlib.contextmanager
+def timed(stage: str):
+    """Time a block as one stage of the current request"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - start)
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS_TOTAL.inc(cache, "hit" if hit else "miss")
+
+
+def record_tool_timeout(tool: str) -> None:
+    TOOL_TIMEOUTS_TOTAL.inc(tool)
+
+
+def render_metrics() -> str:
+    return "\n".join(metric.render() for metric in REGISTRY) + "\n"
+
+
+def init_app(app) -> None:
+    """Install request timing hooks and the /metrics endpoint on a Flask app"""
+    from flask import Response, g, request
+
+    @app.before_request
+    def _start_request_timer():
+        g._metrics_start = time.perf_counter()
+        g._metrics_tokens = (
+            _current_endpoint.set(request.endpoint or "unknown"),
+            _request_stages.set({})
+        )
+
+    @app.after_request
+    def _record_request(response):
+        start = g.pop("_metrics_start", None)
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or "unknown"
+        REQUESTS_TOTAL.inc(endpoint, request.method, str(response.status_code))
+        REQUEST_SECONDS.observe(endpoint, value=elapsed)
+
+        if elapsed >= SLOW_REQUEST_SECONDS or response.status_code >= 500 or random.random() < LOG_SAMPLE_RATE:
+            logger.info(json.dumps({
+                "event": "request",
+                "endpoint": endpoint,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 2),
+                "stages_ms": {k: round(v * 1000, 2) for k, v in (_request_stages.get() or {}).items()},
+                "response_bytes": response.calculate_content_length()
+            }))
+        return response
+
+    @app.teardown_request
+    def _reset_request_context(exc=None):
+        tokens = g.pop("_metrics_tokens", None)
+        if tokens:
+            try:
+                _current_endpoint.reset(tokens[0])
+                _request_stages.reset(tokens[1])
+            except ValueError:
+                # Streamed responses may finish in a different context
+                pass
+
+    @app.route('/metrics', methods=['GET'])
+    def metrics():
+        """Prometheus-style counters and histograms for this process"""
+        return Response(render_metrics(), mimetype="text/plain; version=0.0.4")
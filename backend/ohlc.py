@@ -0,0 +1,95 @@
+"""
+OHLC Candles
+Daily, weekly and monthly candles for the Market page charts. Rollups are
+computed once per symbol per as-of date and kept as column arrays in the
+shared memo cache, so a chart pan or zoom is a cache lookup plus a binary
+search on the dates. Candles are returned as parallel arrays rather than
+one object per candle, which keeps payloads several times smaller.
+"""
+
+import os
+from typing import Any, Dict, Optional
+import numpy as np
+import pandas as pd
+
+from market_data import get_history, memoize
+
+OHLC_HISTORY_PERIOD = os.getenv("OHLC_HISTORY_PERIOD", "10y")
+OHLC_DEFAULT_LIMIT = int(os.getenv("OHLC_DEFAULT_LIMIT", "250"))
+
+# Resolution -> pandas resample rule (None: daily bars as stored)
+RESOLUTIONS = {"1d": None, "1wk": "W-FRI", "1mo": "ME"}
+
+_AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def resolve_symbol(symbol: str) -> str:
+    """Accept the Market page's index names (e.g. "NIFTY 50") as well as tickers"""
+    from market_snapshot import INDICES
+    return INDICES.get(symbol, symbol)
+
+
+def _columns(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    dates = df.index.tz_localize(None) if df.index.tz is not None else df.index
+    return {
+        "day": dates.values.astype("datetime64[D]"),
+        "date": np.array(dates.strftime("%Y-%m-%d")),
+        "open": df["Open"].round(2).to_numpy(),
+        "high": df["High"].round(2).to_numpy(),
+        "low": df["Low"].round(2).to_numpy(),
+        "close": df["Close"].round(2).to_numpy(),
+        "volume": df["Volume"].fillna(0).astype("int64").to_numpy()
+    }
+
+
+@memoize("ohlc_rollups", cache_if=bool)
+def get_rollups(symbol: str) -> Dict[str, Dict[str, np.ndarray]]:
+    """Column arrays for every resolution; empty if the symbol has no data"""
+    df = get_history(symbol, period=OHLC_HISTORY_PERIOD)
+    if df.empty:
+        return {}
+    df = df[list(_AGGREGATION)].dropna(subset=["Close"])
+
+    rollups = {}
+    for resolution, rule in RESOLUTIONS.items():
+        frame = df if rule is None else df.resample(rule).agg(_AGGREGATION).dropna(subset=["Close"])
+        rollups[resolution] = _columns(frame)
+    return rollups
+
+
+def get_candles(symbol: str, resolution: str = "1d", start: Optional[str] = None,
+                end: Optional[str] = None, limit: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Candles between start and end (inclusive, YYYY-MM-DD), keeping the most
+    recent `limit`. Without start, the last OHLC_DEFAULT_LIMIT candles.
+    """
+    if resolution not in RESOLUTIONS:
+        return {"error": f"Unsupported resolution. Supported: {', '.join(RESOLUTIONS)}"}
+
+    try:
+        start_day = np.datetime64(start, "D") if start else None
+        end_day = np.datetime64(end, "D") if end else None
+    except (ValueError, TypeError):
+        return {"error": "start and end must be dates in YYYY-MM-DD format"}
+
+    ticker = resolve_symbol(symbol)
+    rollups = get_rollups(ticker)
+    if not rollups:
+        return {"error": f"No data found for {symbol}"}
+
+    columns = rollups[resolution]
+    days = columns["day"]
+    lo = np.searchsorted(days, start_day, side="left") if start else 0
+    hi = np.searchsorted(days, end_day, side="right") if end else len(days)
+    if limit is None and not start:
+        limit = OHLC_DEFAULT_LIMIT
+    if limit:
+        lo = max(lo, hi - limit)
+
+    return {
+        "symbol": symbol,
+        "ticker": ticker,
+        "resolution": resolution,
+        "count": int(max(hi - lo, 0)),
+        "candles": {name: values[lo:hi].tolist() for name, values in columns.items() if name != "day"}
+    }
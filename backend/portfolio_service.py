@@ -0,0 +1,288 @@
+"""
+Paper Trading Portfolio Service
+Server-side paper-trading accounts: cash, positions and transactions live in
+SQLite, and portfolios are marked to market from one shared latest-price
+table. Valuing every account is a single vectorized join of all positions
+against that table, not a price lookup per user.
+"""
+
+import os
+import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+
+PORTFOLIO_DB_PATH = os.getenv(
+    "PORTFOLIO_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "portfolio.db")
+)
+PORTFOLIO_STARTING_CASH = float(os.getenv("PORTFOLIO_STARTING_CASH", "100000"))
+PORTFOLIO_PRICE_TTL = float(os.getenv("PORTFOLIO_PRICE_TTL", "60"))  # seconds a latest price stays fresh
+PORTFOLIO_PRICE_WORKERS = int(os.getenv("PORTFOLIO_PRICE_WORKERS", "8"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS portfolios (
+    user_id TEXT PRIMARY KEY,
+    cash REAL NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS positions (
+    user_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    avg_price REAL NOT NULL,
+    PRIMARY KEY (user_id, symbol)
+);
+CREATE INDEX IF NOT EXISTS positions_symbol ON positions (symbol);
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    type TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    quantity INTEGER NOT NULL,
+    price REAL NOT NULL,
+    total REAL NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS transactions_user ON transactions (user_id, id);
+"""
+
+
+class PortfolioError(ValueError):
+    """A trade that cannot be executed (insufficient funds/shares, bad input)"""
+
+
+class LatestPrices:
+    """
+    Shared symbol -> last close table. Stale or missing symbols are fetched
+    together in one concurrent batch; everything else is a Series lookup.
+    """
+
+    def __init__(self, ttl: float = PORTFOLIO_PRICE_TTL):
+        self.ttl = ttl
+        self._prices = pd.Series(dtype=float)
+        self._updated_at = pd.Series(dtype=float)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fetch(symbol: str) -> Optional[float]:
+        import market_data
+        try:
+            df = market_data.get_provider().history(symbol, period="5d")
+            return float(df["Close"].iloc[-1]) if df is not None and not df.empty else None
+        except Exception as e:
+            print(f"Price fetch error for {symbol}: {str(e)}")
+            return None
+
+    def get(self, symbols: Iterable[str]) -> pd.Series:
+        symbols = pd.Index(pd.unique(pd.Series(list(symbols), dtype=object)))
+        now = time.time()
+        with self._lock:
+            fresh = self._updated_at.reindex(symbols) > now - self.ttl
+            stale = list(symbols[~fresh.fillna(False).to_numpy(dtype=bool)])
+        if stale:
+            with ThreadPoolExecutor(max_workers=PORTFOLIO_PRICE_WORKERS) as pool:
+                fetched = dict(zip(stale, pool.map(self._fetch, stale)))
+            fetched = {s: p for s, p in fetched.items() if p is not None}
+            if fetched:
+                self.set(fetched)
+        with self._lock:
+            return self._prices.reindex(symbols)
+
+    def set(self, prices: Dict[str, float]) -> None:
+        """Update prices directly (e.g. from a market data feed)"""
+        with self._lock:
+            updates = pd.Series(prices, dtype=float)
+            self._prices = updates.combine_first(self._prices)
+            self._updated_at = pd.Series(time.time(), index=updates.index).combine_first(self._updated_at)
+
+
+class PortfolioService:
+    def __init__(self, db_path: str = PORTFOLIO_DB_PATH, prices: LatestPrices = None):
+        self.db_path = db_path
+        self.prices = prices or LatestPrices()
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self.db_path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(_SCHEMA)
+                    self._initialized = True
+        return conn
+
+    def _ensure_account(self, conn: sqlite3.Connection, user_id: str) -> None:
+        conn.execute(
+            "INSERT OR IGNORE INTO portfolios (user_id, cash, created_at) VALUES (?, ?, ?)",
+            (user_id, PORTFOLIO_STARTING_CASH, datetime.now().isoformat(timespec="seconds"))
+        )
+
+    def trade(self, user_id: str, action: str, symbol: str, quantity: int) -> Dict[str, Any]:
+        """Buy or sell at the server's latest market price; no price, no trade"""
+        from algo_backtest import normalize_symbol
+        action = action.upper()
+        if action not in ("BUY", "SELL"):
+            raise PortfolioError("Action must be BUY or SELL")
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise PortfolioError("Quantity must be a positive whole number")
+
+        ticker = normalize_symbol(symbol)
+        market_price = self.prices.get([ticker]).iloc[0]
+        if pd.isna(market_price) or market_price <= 0:
+            raise PortfolioError(f"No price available for {symbol}, try again later")
+        price = round(float(market_price), 2)
+        total = round(quantity * price, 2)
+
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._ensure_account(conn, user_id)
+            cash = conn.execute("SELECT cash FROM portfolios WHERE user_id = ?", (user_id,)).fetchone()["cash"]
+            position = conn.execute(
+                "SELECT quantity, avg_price FROM positions WHERE user_id = ? AND symbol = ?", (user_id, ticker)
+            ).fetchone()
+
+            if action == "BUY":
+                if cash < total:
+                    raise PortfolioError("Insufficient funds")
+                held = position["quantity"] if position else 0
+                avg = ((position["avg_price"] * held) + total) / (held + quantity) if position else price
+                conn.execute(
+                    "INSERT INTO positions (user_id, symbol, quantity, avg_price) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (user_id, symbol) DO UPDATE SET quantity = excluded.quantity, "
+                    "avg_price = excluded.avg_price",
+                    (user_id, ticker, held + quantity, avg)
+                )
+                conn.execute("UPDATE portfolios SET cash = cash - ? WHERE user_id = ?", (total, user_id))
+            else:
+                if not position or position["quantity"] < quantity:
+                    raise PortfolioError("Insufficient shares")
+                if position["quantity"] == quantity:
+                    conn.execute("DELETE FROM positions WHERE user_id = ? AND symbol = ?", (user_id, ticker))
+                else:
+                    conn.execute(
+                        "UPDATE positions SET quantity = quantity - ? WHERE user_id = ? AND symbol = ?",
+                        (quantity, user_id, ticker)
+                    )
+                conn.execute("UPDATE portfolios SET cash = cash + ? WHERE user_id = ?", (total, user_id))
+
+            conn.execute(
+                "INSERT INTO transactions (user_id, type, symbol, quantity, price, total, timestamp) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (user_id, action, ticker, quantity, price, total, datetime.now().isoformat(timespec="seconds"))
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get_portfolio(user_id)
+
+    def _positions_frame(self, user_ids: Optional[List[str]] = None) -> pd.DataFrame:
+        query = "SELECT user_id, symbol, quantity, avg_price FROM positions"
+        params: List[str] = []
+        if user_ids is not None:
+            query += f" WHERE user_id IN ({','.join('?' * len(user_ids))})"
+            params = list(user_ids)
+        return pd.read_sql_query(query, self._conn(), params=params)
+
+    def mark_to_market(self, user_ids: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Value positions (all accounts, or the given ones) in one pass: every
+        position row is joined against the latest-price table at once.
+        Returns the marked positions and per-account totals.
+        """
+        positions = self._positions_frame(user_ids)
+        prices = self.prices.get(positions["symbol"]) if len(positions) else pd.Series(dtype=float)
+
+        # Symbols without a market price are carried at cost
+        current = positions["symbol"].map(prices).astype(float).fillna(positions["avg_price"])
+        positions["current_price"] = current
+        positions["market_value"] = positions["quantity"] * current
+        positions["pnl"] = (current - positions["avg_price"]) * positions["quantity"]
+
+        query = "SELECT user_id, cash FROM portfolios"
+        params: List[str] = []
+        if user_ids is not None:
+            query += f" WHERE user_id IN ({','.join('?' * len(user_ids))})"
+            params = list(user_ids)
+        accounts = pd.read_sql_query(query, self._conn(), params=params).set_index("user_id")
+        holdings = positions.groupby("user_id")[["market_value", "pnl"]].sum()
+        accounts = accounts.join(holdings, how="left").fillna({"market_value": 0.0, "pnl": 0.0})
+        accounts["total_value"] = accounts["cash"] + accounts["market_value"]
+        return {"positions": positions, "accounts": accounts}
+
+    def get_portfolio(self, user_id: str, transaction_limit: int = 50) -> Dict[str, Any]:
+        conn = self._conn()
+        self._ensure_account(conn, user_id)
+        marked = self.mark_to_market([user_id])
+        account = marked["accounts"].loc[user_id]
+        positions = [{
+            "symbol": row.symbol.rsplit(".", 1)[0],
+            "ticker": row.symbol,
+            "quantity": int(row.quantity),
+            "averagePrice": round(row.avg_price, 2),
+            "currentPrice": round(row.current_price, 2),
+            "marketValue": round(row.market_value, 2),
+            "pnl": round(row.pnl, 2)
+        } for row in marked["positions"].itertuples()]
+        transactions = [{
+            "id": row["id"],
+            "type": row["type"],
+            "symbol": row["symbol"].rsplit(".", 1)[0],
+            "quantity": row["quantity"],
+            "price": row["price"],
+            "total": row["total"],
+            "timestamp": row["timestamp"]
+        } for row in conn.execute(
+            "SELECT * FROM transactions WHERE user_id = ? ORDER BY id DESC LIMIT ?", (user_id, transaction_limit)
+        )]
+        return {
+            "userId": user_id,
+            "cash": round(float(account["cash"]), 2),
+            "positions": positions,
+            "transactions": transactions[::-1],
+            "totalValue": round(float(account["total_value"]), 2),
+            "totalPnL": round(float(account["pnl"]), 2)
+        }
+
+    def get_holdings(self, user_id: str) -> List[Dict[str, Any]]:
+        """Positions in the format analyze_portfolio_risk expects, marked to market"""
+        positions = self.mark_to_market([user_id])["positions"]
+        return [{
+            "symbol": row.symbol.rsplit(".", 1)[0],
+            "quantity": int(row.quantity),
+            "avg_price": float(row.avg_price),
+            "current_price": float(row.current_price)
+        } for row in positions.itertuples()]
+
+    def analyze_risk(self, user_id: str) -> Dict[str, Any]:
+        from risk_assessment import analyze_portfolio_risk
+        return analyze_portfolio_risk(self.get_holdings(user_id))
+
+    def reset(self, user_id: str) -> Dict[str, Any]:
+        """Start the account over with fresh cash and no positions"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("positions", "transactions", "portfolios"):
+                conn.execute(f"DELETE FROM {table} WHERE user_id = ?", (user_id,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return self.get_portfolio(user_id)
+
+
+portfolio_service = PortfolioService()
@@ -0,0 +1,222 @@
+"""
+Response Cache for the Financial Chat Agent
+Answers repeated questions without re-running the agent: exact match on a
+normalized query, plus an optional local embedding similarity index for
+near-duplicate educational questions. Answers that depend on market data
+get a short TTL and can be invalidated per symbol.
+"""
+
+import os
+import re
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+import numpy as np
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "86400"))  # educational answers
+RESPONSE_CACHE_MARKET_TTL = float(os.getenv("RESPONSE_CACHE_MARKET_TTL", "300"))  # market-data answers
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+RESPONSE_CACHE_EMBEDDINGS = os.getenv("RESPONSE_CACHE_EMBEDDINGS", "true").lower() == "true"
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.82"))
+
+# Tools whose output depends on live market data
+MARKET_DATA_TOOLS = {"get_stock_data", "generate_financial_report", "tavily_search_results_json"}
+
+# Words that do not change the meaning of a question ("what is CAGR" == "explain CAGR")
+FILLER_WORDS = {
+    "what", "whats", "is", "are", "a", "an", "the", "explain", "define", "definition",
+    "tell", "me", "about", "please", "meaning", "of", "does", "mean", "do", "you",
+    "can", "could", "describe", "i", "want", "to", "know", "understand", "by"
+}
+
+# Ticker-like tokens (RELIANCE.NS, ^NSEI, AAPL) mark a question as market dependent
+TICKER_PATTERN = re.compile(r"\^[A-Z]+|\b[A-Z]{2,}(?:\.(?:NS|BO))?\b|\b[A-Za-z]+\.(?:NS|BO|ns|bo)\b")
+ACRONYMS = {"CAGR", "SIP", "SEBI", "NISM", "NSE", "BSE", "IPO", "ETF", "NAV", "KYC", "PE", "EPS",
+            "ROE", "ROCE", "RSI", "MACD", "SMA", "EMA", "CAPM", "VAR", "LTCG", "STCG", "GST",
+            "TDS", "STT", "ITR", "F&O", "FD", "PPF", "NPS", "ELSS", "AUM", "DRHP", "ASBA", "HNI"}
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and filler words, collapse whitespace"""
+    words = re.findall(r"[a-z0-9^&.]+", query.lower())
+    words = [w.strip(".") for w in words if w.strip(".")]
+    meaningful = [w for w in words if w not in FILLER_WORDS]
+    return " ".join(meaningful or words)
+
+
+def _stem(word: str) -> str:
+    """Light suffix stripping so "works"/"work" and "taxed"/"taxes"/"tax" compare equal"""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def same_question_shape(a: str, b: str) -> bool:
+    """
+    Guard for similarity hits between two normalized queries. The embedding
+    scores "should I buy gold" and "should I not buy gold", or "short term"
+    and "long term", as near-duplicates, so a hit also needs the same
+    meaningful words in the same order, differing at most in their endings.
+    """
+    return [_stem(w) for w in a.split()] == [_stem(w) for w in b.split()]
+
+
+def extract_symbols(query: str) -> List[str]:
+    """Ticker-like tokens in the query that are not common finance acronyms"""
+    return sorted({m.upper() for m in TICKER_PATTERN.findall(query) if m.upper() not in ACRONYMS})
+
+
+class HashingEmbedder:
+    """
+    Dependency-free local embedding: hashed word and character-trigram counts,
+    L2-normalized so a dot product is the cosine similarity
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = text.split()
+        padded = f" {text} "
+        features += [padded[i:i + 3] for i in range(len(padded) - 2)]
+        for feature in features:
+            digest = hashlib.md5(feature.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache of agent answers with per-entry TTL
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES,
+                 ttl: float = RESPONSE_CACHE_TTL, market_ttl: float = RESPONSE_CACHE_MARKET_TTL,
+                 use_embeddings: bool = RESPONSE_CACHE_EMBEDDINGS,
+                 similarity_threshold: float = RESPONSE_CACHE_SIMILARITY):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.market_ttl = market_ttl
+        self.similarity_threshold = similarity_threshold
+        self.embedder = HashingEmbedder() if use_embeddings else None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._index_keys = None
+        self._index_matrix = None
+        self.hits = 0
+        self.misses = 0
+
+    def _expire(self, now: float) -> None:
+        expired = [key for key, entry in self._entries.items() if entry["expires_at"] <= now]
+        for key in expired:
+            del self._entries[key]
+        if expired:
+            self._index_keys = None
+
+    def _similar_key(self, normalized: str) -> Optional[str]:
+        # Only educational answers are eligible; market answers need an exact match
+        if self._index_keys is None:
+            keys = [key for key, entry in self._entries.items() if not entry["market"]]
+            self._index_keys = keys
+            self._index_matrix = np.stack([self._entries[k]["vector"] for k in keys]) if keys else None
+        if self._index_matrix is None:
+            return None
+
+        scores = self._index_matrix @ self.embedder.embed(normalized)
+        for best in np.argsort(-scores):
+            if scores[best] < self.similarity_threshold:
+                break
+            key = self._index_keys[int(best)]
+            if same_question_shape(normalized, key):
+                return key
+        return None
+
+    def get(self, query: str) -> Optional[str]:
+        """Cached answer for the query, or None"""
+        normalized = normalize_query(query)
+        with self._lock:
+            self._expire(time.time())
+            key = normalized if normalized in self._entries else None
+            if key is None and self.embedder is not None and not extract_symbols(query):
+                key = self._similar_key(normalized)
+
+            if key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]["response"]
+
+    def put(self, query: str, response: str, tool_calls: List[Dict[str, Any]] = None) -> None:
+        """
+        Store an answer. It is treated as market dependent when the agent used a
+        market-data tool or the query names a ticker; those entries get the short
+        TTL and are tagged with their symbols for invalidation.
+        """
+        tool_calls = tool_calls or []
+        symbols = set(extract_symbols(query))
+        for call in tool_calls:
+            symbol = (call.get("args") or {}).get("symbol")
+            if symbol:
+                symbols.add(str(symbol).upper())
+        market = bool(symbols) or any(call.get("name") in MARKET_DATA_TOOLS for call in tool_calls)
+
+        normalized = normalize_query(query)
+        with self._lock:
+            self._entries[normalized] = {
+                "response": response,
+                "market": market,
+                "symbols": symbols,
+                "expires_at": time.time() + (self.market_ttl if market else self.ttl),
+                "vector": self.embedder.embed(normalized) if self.embedder is not None else None
+            }
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._index_keys = None
+
+    def invalidate(self, symbol: str = None) -> int:
+        """
+        Drop market-dependent answers: those mentioning `symbol`, or all of them
+        when no symbol is given. Returns the number of entries removed.
+        """
+        with self._lock:
+            symbol = symbol.upper() if symbol else None
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry["market"] and (symbol is None or symbol in entry["symbols"])
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._index_keys = None
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._index_keys = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "embeddings": self.embedder is not None
+            }
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,279 @@
+"""
+Conversation Session Store
+Server-side chat history for the financial agent. Each session keeps a bounded
+number of turns; older turns are folded into a running summary so the prompt
+stays within a token budget.
+
+Sessions live in SQLite, so a follow-up question can land on any server
+worker. Tool outputs are a per-process cache on top (bounded per session):
+follow-up questions on the same worker reuse data fetched earlier in the
+conversation, and a miss on another worker just runs the tool again.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+import functools
+import contextlib
+import contextvars
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+SESSION_DB_PATH = os.getenv(
+    "SESSION_DB_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "sessions.db")
+)
+SESSION_TTL = float(os.getenv("SESSION_TTL", "3600"))  # idle seconds before a session expires
+SESSION_MAX_SESSIONS = int(os.getenv("SESSION_MAX_SESSIONS", "1000"))
+SESSION_MAX_TURNS = int(os.getenv("SESSION_MAX_TURNS", "20"))
+SESSION_TOKEN_BUDGET = int(os.getenv("SESSION_TOKEN_BUDGET", "1500"))  # history tokens per prompt
+SESSION_SUMMARY_TOKENS = int(os.getenv("SESSION_SUMMARY_TOKENS", "300"))
+SESSION_MAX_TOOL_OUTPUTS = int(os.getenv("SESSION_MAX_TOOL_OUTPUTS", "32"))  # cached tool results per session
+
+# Session whose tool cache is used by session_memoize (set while the agent runs)
+_active_session = contextvars.ContextVar("active_session", default=None)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id TEXT PRIMARY KEY,
+    summary TEXT NOT NULL,
+    turns TEXT NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_last_access ON sessions (last_access);
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _first_sentence(text: str, max_chars: int = 200) -> str:
+    sentence = text.strip().split(". ")[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rstrip() + "..."
+
+
+def _fold_into_summary(summary: str, turn: Dict[str, str]) -> str:
+    line = f"User asked: {_first_sentence(turn['user'])} Assistant answered: {_first_sentence(turn['assistant'])}"
+    summary = f"{summary}\n{line}".strip()
+    # Keep the newest part of the summary when it outgrows its budget
+    return summary[-SESSION_SUMMARY_TOKENS * 4:]
+
+
+class ToolOutputCache(OrderedDict):
+    """Tool results of one session, least recently stored dropped beyond max_entries"""
+
+    def __init__(self, max_entries: int = SESSION_MAX_TOOL_OUTPUTS):
+        super().__init__()
+        self.max_entries = max_entries
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_entries:
+            self.popitem(last=False)
+
+
+class Session:
+    """
+    One conversation. Turns and summary are read and written through the
+    store on every call, so concurrent requests on different workers see
+    each other's turns; tool_outputs and lock are local to this process.
+    """
+
+    def __init__(self, store: "SessionStore", session_id: str, tool_outputs: ToolOutputCache,
+                 lock: threading.Lock):
+        self.store = store
+        self.id = session_id
+        self.tool_outputs = tool_outputs
+        self.lock = lock
+
+    @contextlib.contextmanager
+    def _state(self):
+        """(summary, turns) of this session inside a write transaction; changes are saved on exit"""
+        conn = self.store._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT summary, turns FROM sessions WHERE id = ?", (self.id,)).fetchone()
+            state = {"summary": row[0], "turns": json.loads(row[1])} if row else {"summary": "", "turns": []}
+            yield state
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?, ?) ON CONFLICT (id) DO UPDATE SET "
+                "summary = excluded.summary, turns = excluded.turns, last_access = excluded.last_access",
+                (self.id, state["summary"], json.dumps(state["turns"]), time.time())
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add_turn(self, user: str, assistant: str) -> None:
+        with self._state() as state:
+            turns = state["turns"]
+            while len(turns) >= self.store.max_turns:
+                state["summary"] = _fold_into_summary(state["summary"], turns.pop(0))
+            turns.append({"user": user, "assistant": assistant})
+
+    def history(self, token_budget: int = SESSION_TOKEN_BUDGET) -> Tuple[str, List[Dict[str, str]]]:
+        """
+        Context for the next prompt: the summary of older turns, plus chat messages
+        for as many recent turns as fit in the token budget. Turns that no longer
+        fit are folded into the summary.
+        """
+        with self._state() as state:
+            turns = state["turns"]
+            budget = token_budget - estimate_tokens(state["summary"])
+            kept = []
+            for turn in reversed(turns):
+                cost = estimate_tokens(turn["user"]) + estimate_tokens(turn["assistant"])
+                if cost > budget:
+                    break
+                kept.append(turn)
+                budget -= cost
+
+            for turn in turns[:len(turns) - len(kept)]:
+                state["summary"] = _fold_into_summary(state["summary"], turn)
+            state["turns"] = turns[len(turns) - len(kept):]
+
+            messages = []
+            for turn in reversed(kept):
+                messages.append({"role": "user", "content": turn["user"]})
+                messages.append({"role": "assistant", "content": turn["assistant"]})
+            return state["summary"], messages
+
+    def has_history(self) -> bool:
+        row = self.store._conn().execute(
+            "SELECT summary != '' OR turns != '[]' FROM sessions WHERE id = ?", (self.id,)
+        ).fetchone()
+        return bool(row and row[0])
+
+
+class SessionStore:
+    """SQLite-backed sessions with idle expiry, shared by all server processes"""
+
+    def __init__(self, db_path: str = SESSION_DB_PATH, max_sessions: int = SESSION_MAX_SESSIONS,
+                 ttl: float = SESSION_TTL, max_turns: int = SESSION_MAX_TURNS):
+        self.db_path = db_path
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_turns = max_turns
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # Per-process tool caches and locks, for the most recently used sessions
+        self._local_state: "OrderedDict[str, Tuple[ToolOutputCache, threading.Lock]]" = OrderedDict()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    def _session(self, session_id: str) -> Session:
+        with self._lock:
+            local = self._local_state.get(session_id)
+            if local is None:
+                local = (ToolOutputCache(), threading.Lock())
+                self._local_state[session_id] = local
+                while len(self._local_state) > self.max_sessions:
+                    self._local_state.popitem(last=False)
+            self._local_state.move_to_end(session_id)
+        return Session(self, session_id, *local)
+
+    def _expire(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute("DELETE FROM sessions WHERE last_access < ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM sessions WHERE id IN "
+            "(SELECT id FROM sessions ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (max(self.max_sessions - 1, 0),)  # room for the session being created
+        )
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """The session if it exists and has not expired (marking it used), else None"""
+        if not session_id:
+            return None
+        conn = self._conn()
+        now = time.time()
+        updated = conn.execute(
+            "UPDATE sessions SET last_access = ? WHERE id = ? AND last_access >= ?",
+            (now, session_id, now - self.ttl)
+        ).rowcount
+        return self._session(session_id) if updated else None
+
+    def get_or_create(self, session_id: Optional[str] = None) -> Session:
+        """The session with this id, created (under a new id if none given) when missing or expired"""
+        session = self.get(session_id)
+        if session is not None:
+            return session
+        session_id = session_id or uuid.uuid4().hex
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire(conn, now)
+            # Expired rows are gone now; a row still here was just created by another worker
+            conn.execute(
+                "INSERT INTO sessions VALUES (?, '', '[]', ?) ON CONFLICT (id) DO UPDATE SET "
+                "last_access = excluded.last_access",
+                (session_id, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        with self._lock:
+            self._local_state.pop(session_id, None)  # an expired session's tool outputs are stale
+        return self._session(session_id)
+
+    def delete(self, session_id: str) -> bool:
+        with self._lock:
+            self._local_state.pop(session_id, None)
+        return self._conn().execute("DELETE FROM sessions WHERE id = ?", (session_id,)).rowcount > 0
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+session_store = SessionStore()
+
+
+@contextlib.contextmanager
+def active_session(session: Optional[Session]):
+    """Make a session's tool cache visible to the tools while the agent runs"""
+    token = _active_session.set(session)
+    try:
+        yield session
+    finally:
+        _active_session.reset(token)
+
+
+def session_memoize(name: str, cache_if: Optional[Callable[[Any], bool]] = None):
+    """
+    Cache a tool's output in the active session, so a follow-up question in the
+    same conversation never re-runs the tool with the same arguments
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _active_session.get()
+            if session is None:
+                return func(*args, **kwargs)
+
+            key = (name, args, tuple(sorted(kwargs.items())))
+            with session.lock:
+                if key in session.tool_outputs:
+                    return session.tool_outputs[key]
+            result = func(*args, **kwargs)
+            if cache_if is None or cache_if(result):
+                with session.lock:
+                    session.tool_outputs[key] = result
+            return result
+        return wrapper
+    return decorator
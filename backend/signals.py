@@ -0,0 +1,243 @@
+"""
+Strategy Signal Compiler
+Condition blocks are compiled once into an expression tree and evaluated
+as whole-array operations, giving one boolean entry signal per bar instead
+of interpreting every condition on every bar.
+
+Besides the Algo Builder's crossover/threshold/priceChange blocks, a
+condition block with id "expression" takes a tree in params["expr"]:
+
+    {"all": [expr, ...]}                 AND
+    {"any": [expr, ...]}                 OR
+    {"not": expr}                        NOT
+    {"compare": [a, "<", b]}             <, <=, >, >=, ==, !=
+    {"cross": [a, "above", b]}           a crosses above (or below) b on this bar
+    {"within": 5, "expr": expr}          expr was true on any of the last 5 bars
+    {"for": 3, "expr": expr}             expr was true on each of the last 3 bars
+
+Operands (a, b) are numbers, series names ("close", "volume", "sma_50",
+"bb_lower", ...), {"ref": name, "lookback": n} for the value n bars ago, or
+{"pct_change": name, "bars": n} for the % change over n bars. For example,
+a golden cross while RSI is not overbought:
+
+    {"all": [{"cross": ["sma_50", "above", "sma_200"]},
+             {"compare": ["rsi", "<", 70]}]}
+"""
+
+import operator
+from typing import Any, Callable, Dict, List
+import numpy as np
+
+Env = Dict[str, np.ndarray]
+
+COMPARISONS = {
+    "<": operator.lt, "<=": operator.le, ">": operator.gt,
+    ">=": operator.ge, "==": operator.eq, "!=": operator.ne
+}
+
+
+def shift(values: np.ndarray, bars: int) -> np.ndarray:
+    """Values `bars` bars ago, NaN where there is no earlier bar"""
+    if bars <= 0:
+        return values
+    out = np.full(len(values), np.nan)
+    out[bars:] = values[:-bars]
+    return out
+
+
+def window_count(signal: np.ndarray, bars: int) -> np.ndarray:
+    """How many of the last `bars` bars (including this one) were True"""
+    counts = np.concatenate(([0], np.cumsum(signal, dtype=np.int64)))
+    start = np.maximum(np.arange(1, len(signal) + 1) - bars, 0)
+    return counts[1:] - counts[start]
+
+
+def series_env(df, indicator_values: Env) -> Env:
+    """
+    Everything an operand can name: OHLCV columns (plus "price") and indicator
+    outputs. `df` is a price DataFrame or a dict of its columns as arrays.
+    """
+    close = np.asarray(df['Close'], dtype=float)
+    return {
+        "price": close,
+        "close": close,
+        "open": np.asarray(df['Open'], dtype=float),
+        "high": np.asarray(df['High'], dtype=float),
+        "low": np.asarray(df['Low'], dtype=float),
+        "volume": np.nan_to_num(np.asarray(df['Volume'], dtype=float), nan=0.0),
+        **indicator_values
+    }
+
+
+# ===== COMPILATION =====
+#
+# Compiling turns the JSON tree into nested closures; evaluating a compiled
+# condition is then only NumPy operations over whole columns.
+
+def _operand(spec: Any) -> Callable[[Env], Any]:
+    if isinstance(spec, bool):
+        raise ValueError(f"Invalid operand: {spec!r}")
+    if isinstance(spec, (int, float)):
+        value = float(spec)
+        return lambda env: value
+    if isinstance(spec, str):
+        name = spec
+
+        def series(env):
+            if name not in env:
+                raise ValueError(f"Unknown series '{name}'. Add the indicator block that produces it.")
+            return env[name]
+        return series
+    if isinstance(spec, dict) and "ref" in spec:
+        base, bars = _operand(spec["ref"]), int(spec.get("lookback", 0))
+        return lambda env: shift(np.asarray(base(env), dtype=float), bars)
+    if isinstance(spec, dict) and "pct_change" in spec:
+        base, bars = _operand(spec["pct_change"]), int(spec.get("bars", 1))
+
+        def pct_change(env):
+            values = np.asarray(base(env), dtype=float)
+            previous = shift(values, bars)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return (values - previous) / previous * 100
+        return pct_change
+    raise ValueError(f"Invalid operand: {spec!r}")
+
+
+def _broadcast(result, n: int) -> np.ndarray:
+    return np.broadcast_to(np.asarray(result, dtype=bool), (n,))
+
+
+def compile_expression(spec: Dict[str, Any]) -> Callable[[Env], np.ndarray]:
+    """Compile an expression tree into a function env -> boolean array"""
+    if not isinstance(spec, dict) or len(spec) == 0:
+        raise ValueError(f"Invalid expression: {spec!r}")
+
+    if "all" in spec or "any" in spec:
+        combine = np.logical_and if "all" in spec else np.logical_or
+        children = [compile_expression(child) for child in spec.get("all", spec.get("any"))]
+        if not children:
+            raise ValueError("all/any needs at least one expression")
+
+        def group(env):
+            result = children[0](env)
+            for child in children[1:]:
+                result = combine(result, child(env))
+            return result
+        return group
+
+    if "not" in spec:
+        child = compile_expression(spec["not"])
+        return lambda env: ~child(env)
+
+    if "compare" in spec:
+        left, op, right = spec["compare"]
+        if op not in COMPARISONS:
+            raise ValueError(f"Unsupported comparison '{op}'. Supported: {', '.join(COMPARISONS)}")
+        a, b, compare = _operand(left), _operand(right), COMPARISONS[op]
+
+        def comparison(env):
+            n = len(env["close"])
+            with np.errstate(invalid="ignore"):
+                return _broadcast(compare(a(env), b(env)), n)
+        return comparison
+
+    if "cross" in spec:
+        left, direction, right = spec["cross"]
+        if direction not in ("above", "below"):
+            raise ValueError("cross direction must be 'above' or 'below'")
+        a, b = _operand(left), _operand(right)
+
+        def cross(env):
+            n = len(env["close"])
+            now = np.broadcast_to(np.asarray(a(env), dtype=float) - np.asarray(b(env), dtype=float), (n,))
+            before = shift(now, 1)
+            with np.errstate(invalid="ignore"):
+                if direction == "above":
+                    return (now > 0) & (before <= 0)
+                return (now < 0) & (before >= 0)
+        return cross
+
+    if "within" in spec or "for" in spec:
+        bars = int(spec.get("within", spec.get("for")))
+        if bars < 1:
+            raise ValueError("within/for needs a window of at least 1 bar")
+        child = compile_expression(spec["expr"])
+        if "within" in spec:
+            return lambda env: window_count(child(env), bars) > 0
+        return lambda env: window_count(child(env), bars) >= bars
+
+    raise ValueError(f"Unknown expression: {', '.join(spec)}")
+
+
+def _never(env):
+    return np.zeros(len(env["close"]), dtype=bool)
+
+
+def compile_condition(condition: Dict[str, Any], available: set) -> Callable[[Env], np.ndarray]:
+    """
+    Compile one condition block. The Algo Builder blocks keep their original
+    meaning, including being False when they name an indicator that the
+    strategy does not compute.
+    """
+    condition_id = condition['id']
+    params = condition.get('params') or {}
+
+    if condition_id == 'expression':
+        return compile_expression(params.get('expr'))
+
+    if condition_id == 'crossover':
+        first = params.get('indicator1', 'price')
+        indicator = params.get('indicator2', 'sma')
+        direction = params.get('direction', 'above')
+        if indicator not in available or (first != 'price' and first not in available):
+            return _never
+        if first != 'price':
+            # Indicator against indicator: both sides are compared on both bars
+            return compile_expression({"cross": [first, "above" if direction == 'above' else "below", indicator]})
+        # Price crossing an indicator, judged against the indicator's current value
+        if direction == 'above':
+            return compile_expression({"all": [
+                {"compare": ["price", ">", indicator]},
+                {"compare": [{"ref": "price", "lookback": 1}, "<=", indicator]}
+            ]})
+        return compile_expression({"all": [
+            {"compare": ["price", "<", indicator]},
+            {"compare": [{"ref": "price", "lookback": 1}, ">=", indicator]}
+        ]})
+
+    if condition_id == 'threshold':
+        indicator = params.get('indicator', 'rsi')
+        op = params.get('operator', '<')
+        value = float(params.get('value', 30))
+        if indicator not in available:
+            return _never
+        if op == '=':
+            # "Equals" means within one point
+            return compile_expression({"all": [
+                {"compare": [indicator, ">", value - 1]},
+                {"compare": [indicator, "<", value + 1]}
+            ]})
+        if op not in ('<', '>'):
+            return _never
+        return compile_expression({"compare": [indicator, op, value]})
+
+    if condition_id == 'priceChange':
+        percentage = float(params.get('percentage', 5))
+        change = {"pct_change": "price", "bars": 1}
+        if params.get('direction', 'up') == 'up':
+            return compile_expression({"compare": [change, ">=", percentage]})
+        return compile_expression({"compare": [change, "<=", -percentage]})
+
+    return _never
+
+
+def compile_conditions(conditions: List[Dict[str, Any]], available: set) -> Callable[[Env], np.ndarray]:
+    """All condition blocks ANDed; with no conditions every bar signals"""
+    compiled = [compile_condition(condition, available) for condition in conditions]
+
+    def evaluate(env):
+        signal = np.ones(len(env["close"]), dtype=bool)
+        for condition in compiled:
+            signal &= condition(env)
+        return signal
+    return evaluate
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the position/fill kernel: the Python path against a
+straightforward reference loop, and the Numba path (when installed) against
+the Python path, on random prices, signals and action sets
+"""
+
+import time
+import numpy as np
+from fill_kernel import run_fills, jit_available, T_BAR, T_TYPE, T_SHARES, T_PRICE, T_PL
+
+ACTION_SETS = [
+    [{"id": "buy", "params": {"quantity": "percentage", "value": 100}}],
+    [{"id": "buy", "params": {"quantity": "percentage", "value": 20}},
+     {"id": "stopLoss", "params": {"percentage": 5}},
+     {"id": "takeProfit", "params": {"percentage": 8}}],
+    [{"id": "buy", "params": {"quantity": "shares", "value": 30}},
+     {"id": "sell", "params": {"quantity": "all"}}],
+    [{"id": "sell", "params": {"quantity": "half"}},
+     {"id": "buy", "params": {"quantity": "percentage", "value": 50}},
+     {"id": "stopLoss", "params": {"percentage": 3}}],
+    [{"id": "takeProfit", "params": {"percentage": 2}}]
+]
+
+
+def random_market(seed: int, bars: int = 2000):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, bars))
+    signal = rng.random(bars) < 0.1
+    return close, signal
+
+
+def reference_fills(close, signal, actions, initial_capital):
+    """The original per-bar loop from backtest_strategy, kept as the reference"""
+    capital, position, entry_price = initial_capital, 0, 0
+    peak_equity, max_drawdown = initial_capital, 0
+    trades, equity = [], []
+    stop_loss_pct = take_profit_pct = None
+    for action in actions:
+        if action['id'] == 'stopLoss':
+            stop_loss_pct = action['params'].get('percentage', 5) / 100
+        elif action['id'] == 'takeProfit':
+            take_profit_pct = action['params'].get('percentage', 10) / 100
+
+    for i in range(1, len(close)):
+        price = close[i]
+        if position > 0:
+            current_pl_pct = (price - entry_price) / entry_price
+            if (stop_loss_pct and current_pl_pct <= -stop_loss_pct) or \
+                    (take_profit_pct and current_pl_pct >= take_profit_pct):
+                capital += position * price
+                trades.append((i, 1, position, price, (price - entry_price) * position))
+                position, entry_price = 0, 0
+        if signal[i]:
+            for action in actions:
+                params = action['params']
+                if action['id'] == 'buy' and position == 0:
+                    if params.get('quantity', 'percentage') == 'percentage':
+                        amount = capital * (params.get('value', 10) / 100)
+                    else:
+                        amount = min(params.get('value', 10) * price, capital)
+                    shares = int(amount / price)
+                    if shares > 0:
+                        capital -= shares * price
+                        position, entry_price = shares, price
+                        trades.append((i, 0, shares, price, 0.0))
+                elif action['id'] == 'sell' and position > 0:
+                    shares = position if params.get('quantity', 'all') == 'all' else int(position * 0.5)
+                    capital += shares * price
+                    trades.append((i, 1, shares, price, (price - entry_price) * shares))
+                    position -= shares
+                    if position == 0:
+                        entry_price = 0
+        current_equity = capital + position * price
+        equity.append(current_equity)
+        peak_equity = max(peak_equity, current_equity)
+        max_drawdown = max(max_drawdown, (peak_equity - current_equity) / peak_equity)
+
+    if position > 0:
+        final_price = close[-1]
+        capital += position * final_price
+        trades.append((len(close) - 1, 1, position, final_price, (final_price - entry_price) * position))
+    return np.array(equity), trades, capital, max_drawdown
+
+
+def assert_same(result, expected_equity, expected_trades, expected_capital, expected_drawdown, label):
+    equity, _, _, fills, capital, max_drawdown = result
+    assert np.array_equal(equity[1:], expected_equity), f"{label}: equity curve differs"
+    got = [(int(f[T_BAR]), int(f[T_TYPE]), int(f[T_SHARES]), f[T_PRICE], f[T_PL]) for f in fills]
+    assert got == [(b, t, s, p, float(pl)) for b, t, s, p, pl in expected_trades], f"{label}: trades differ"
+    assert capital == expected_capital and max_drawdown == expected_drawdown, f"{label}: totals differ"
+
+
+def test_python_matches_reference():
+    """The Python kernel path reproduces the original loop exactly"""
+    print("Testing Python fill kernel against the reference loop...")
+    for seed in range(5):
+        close, signal = random_market(seed)
+        for n, actions in enumerate(ACTION_SETS):
+            expected = reference_fills(close.tolist(), signal.tolist(), actions, 100000.0)
+            assert_same(run_fills(close, signal, actions, 100000.0, jit=False), *expected,
+                        label=f"seed {seed}, actions {n}")
+    print(f"✅ {5 * len(ACTION_SETS)} cases identical")
+    print()
+
+
+def test_jit_matches_python():
+    """The Numba path produces the same fills and equity as the Python path"""
+    print("Testing Numba fill kernel against the Python path...")
+    if not jit_available():
+        print("⏭️  Numba JIT unavailable (numba not installed or FILL_KERNEL_JIT=off); skipped")
+        print()
+        return
+    for seed in range(5):
+        close, signal = random_market(seed)
+        for n, actions in enumerate(ACTION_SETS):
+            python = run_fills(close, signal, actions, 100000.0, jit=False)
+            jit = run_fills(close, signal, actions, 100000.0, jit=True)
+            for got, expected, name in zip(jit, python, ("equity", "capital", "position", "fills", "final", "drawdown")):
+                assert np.array_equal(got, expected), f"seed {seed}, actions {n}: {name} differs"
+    print(f"✅ {5 * len(ACTION_SETS)} cases identical")
+    print()
+
+
+def test_edge_cases():
+    """Empty and single-bar inputs, no actions, a signal on every bar"""
+    print("Testing edge cases...")
+    for jit in ([False, True] if jit_available() else [False]):
+        equity, _, _, fills, capital, drawdown = run_fills(np.array([]), np.array([], dtype=bool), ACTION_SETS[0],
+                                                           1000.0, jit=jit)
+        assert len(equity) == 0 and len(fills) == 0 and capital == 1000.0
+        _, _, _, fills, capital, _ = run_fills(np.array([10.0]), np.array([True]), ACTION_SETS[0], 1000.0, jit=jit)
+        assert len(fills) == 0 and capital == 1000.0
+        close, _ = random_market(7, bars=50)
+        _, _, _, fills, _, _ = run_fills(close, np.ones(50, dtype=bool), [], 1000.0, jit=jit)
+        assert len(fills) == 0
+        _, _, _, fills, _, _ = run_fills(close, np.ones(50, dtype=bool), ACTION_SETS[2], 100000.0, jit=jit)
+        assert len(fills) == 2 * 49  # buy and sell on every bar after the first
+    print("✅ Edge cases passed")
+    print()
+
+
+def test_throughput():
+    """Bars per second on a long series"""
+    print("Measuring fill kernel throughput...")
+    close, signal = random_market(1, bars=1_000_000)
+    for jit in ([False, True] if jit_available() else [False]):
+        run_fills(close[:100], signal[:100], ACTION_SETS[1], 100000.0, jit=jit)  # compile
+        start = time.perf_counter()
+        run_fills(close, signal, ACTION_SETS[1], 100000.0, jit=jit)
+        elapsed = time.perf_counter() - start
+        print(f"   {'numba' if jit else 'python'}: {len(close) / elapsed / 1e6:.2f}M bars/s")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("FILL KERNEL PARITY TESTS")
+    print("=" * 60)
+    print()
+
+    test_python_matches_reference()
+    test_jit_matches_python()
+    test_edge_cases()
+    test_throughput()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
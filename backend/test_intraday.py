@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Tests for intraday backtesting: the memory-mapped bar store, session-aware
+indicator windows and an end-to-end 1m backtest on synthetic bars
+"""
+
+import os
+import time
+import tempfile
+import threading
+import multiprocessing
+import numpy as np
+import pandas as pd
+from benchmark import SyntheticProvider
+from intraday_store import COLUMNS, IntradayStore
+from indicators import CLOSE, IndicatorContext, compute_indicator, session_positions
+from algo_backtest import backtest_intraday
+
+
+def synthetic_bars(interval: str = "1m", days: int = 10) -> pd.DataFrame:
+    return SyntheticProvider().intraday("RELIANCE.NS", interval, f"{days}d")
+
+
+def test_store_round_trip():
+    """Appended bars read back as memory maps, windowed by date; re-appending adds nothing"""
+    print("Testing intraday store round trip...")
+    df = synthetic_bars()
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        assert store.append("RELIANCE.NS", "1m", df) == len(df)
+        assert store.append("RELIANCE.NS", "1m", df) == 0
+        assert store.append("RELIANCE.NS", "1m", df.iloc[-10:]) == 0
+
+        bars = store.load("RELIANCE.NS", "1m")
+        assert len(bars) == len(df) and isinstance(bars.timestamps, np.memmap)
+        frame = bars.to_frame()
+        assert (frame.index == df.index).all()
+        assert np.allclose(frame["Close"], df["Close"], rtol=1e-6)
+        assert (frame["Volume"] == df["Volume"]).all()
+
+        window = store.load("RELIANCE.NS", "1m", start="2024-12-30", end="2024-12-31")
+        assert len(window) == 375 and window.label(0) == "2024-12-30 09:15"
+        assert window.label(len(window) - 1) == "2024-12-30 15:29"
+        assert len(store.load("MISSING.NS", "1m")) == 0
+
+        # A fresh store instance (another worker) sees the same bars
+        assert len(IntradayStore(directory).load("RELIANCE.NS", "1m")) == len(df)
+    print(f"✅ {len(df)} bars stored and read back")
+    print()
+
+
+def test_store_filters_bars():
+    """Bars outside 09:15-15:30 IST and bars without a close are not stored"""
+    print("Testing session filtering...")
+    df = synthetic_bars(days=3)
+    extra = df.iloc[:2].copy()
+    extra.index = extra.index - pd.Timedelta(minutes=30)  # 08:45, 08:46
+    missing = df.iloc[-1:].copy()
+    missing.index = missing.index + pd.Timedelta(minutes=1)  # 15:30
+    gap = df.copy()
+    gap.iloc[5, gap.columns.get_loc("Close")] = np.nan
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        added = store.append("RELIANCE.NS", "5m", pd.concat([extra, gap, missing]).sort_index())
+        assert added == len(df) - 1, added
+    print("✅ Out-of-session and empty bars skipped")
+    print()
+
+
+def append_in_chunks(directory: str, df: pd.DataFrame, chunk: int) -> None:
+    """An ingest process appending bars a chunk at a time"""
+    store = IntradayStore(directory)
+    for start in range(0, len(df), chunk):
+        store.append("RELIANCE.NS", "5m", df.iloc[start:start + chunk])
+
+
+def sync_repeatedly(directory: str, times: int) -> None:
+    """A process whose syncs fetch nothing new but still rewrite meta.json's synced_at"""
+    import market_data
+    market_data.get_intraday = lambda symbol, interval, period: pd.DataFrame()
+    store = IntradayStore(directory)
+    for _ in range(times):
+        store.sync("RELIANCE.NS", "5m", force=True)
+
+
+def test_concurrent_writers():
+    """Appends and syncs from several processes at once leave every bar stored exactly once"""
+    print("Testing concurrent writer processes...")
+    df = synthetic_bars("5m", days=20)
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        workers = [context.Process(target=append_in_chunks, args=(directory, df, chunk)) for chunk in (7, 11, 13)]
+        workers.append(context.Process(target=sync_repeatedly, args=(directory, 200)))
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=120)
+            assert worker.exitcode == 0, f"writer exited with {worker.exitcode}"
+
+        store = IntradayStore(directory)
+        frame = store.load("RELIANCE.NS", "5m").to_frame()
+        assert len(frame) == len(df) and (frame.index == df.index).all()
+        assert np.allclose(frame["Close"], df["Close"], rtol=1e-6)
+        for name, dtype in COLUMNS.items():
+            path = store._path("RELIANCE.NS", "5m", f"{name}.bin")
+            assert os.path.getsize(path) == len(df) * np.dtype(dtype).itemsize, name
+        assert store._meta("RELIANCE.NS", "5m")["synced_at"] > 0
+    print(f"✅ {len(workers)} writer processes, {len(df)} bars stored once")
+    print()
+
+
+def test_writer_locks():
+    """A writer holding one symbol does not block others; concurrent stale syncs fetch once"""
+    print("Testing writer locks and sync...")
+    import market_data
+    df = synthetic_bars("5m", days=3)
+    fetches = []
+
+    def slow_intraday(symbol, interval, period):
+        fetches.append(symbol)
+        time.sleep(0.2)
+        return df
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        with store._writer("RELIANCE.NS", "5m"):
+            done = threading.Event()
+            threading.Thread(target=lambda: (store.append("TCS.NS", "5m", df), done.set())).start()
+            assert done.wait(2), "an append for another symbol waited on this writer"
+
+        original = market_data.get_intraday
+        market_data.get_intraday = slow_intraday
+        try:
+            threads = [threading.Thread(target=store.sync, args=("INFY.NS", "5m")) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            market_data.get_intraday = original
+        assert fetches == ["INFY.NS"], fetches
+        assert store.count("INFY.NS", "5m") == len(df)
+    print("✅ One fetch for 4 concurrent syncs")
+    print()
+
+
+def test_session_windows():
+    """Rolling windows restart each session; session VWAP matches a per-day groupby"""
+    print("Testing session-aware indicator windows...")
+    df = synthetic_bars("5m", days=7)
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        store.append("RELIANCE.NS", "5m", df)
+        bars = store.load("RELIANCE.NS", "5m")
+    columns = bars.columns()
+    ctx = IndicatorContext(columns, sessions=bars.sessions)
+    position = session_positions(bars.sessions)
+
+    sma = compute_indicator(ctx, "sma", {"period": 20})["sma"]
+    assert np.isnan(sma[position < 19]).all() and not np.isnan(sma[position >= 19]).any()
+    expected = pd.Series(columns["Close"]).groupby(bars.sessions).transform(lambda s: s.rolling(20).mean())
+    assert np.allclose(sma, expected, equal_nan=True)
+
+    rsi = compute_indicator(ctx, "rsi", {"period": 14})["rsi"]
+    assert np.isnan(rsi[position < 14]).all() and not np.isnan(rsi[position >= 14]).any()
+
+    vwap = compute_indicator(ctx, "vwap", {"period": 0})["vwap"]
+    typical = (columns["High"] + columns["Low"] + columns["Close"]) / 3
+    frame = pd.DataFrame({"pv": typical * columns["Volume"], "v": columns["Volume"], "day": bars.sessions})
+    grouped = frame.groupby("day")
+    assert np.allclose(vwap, grouped["pv"].cumsum() / grouped["v"].cumsum())
+
+    # EMA carries over between sessions
+    ema = compute_indicator(ctx, "ema", {"period": 20})["ema"]
+    assert not np.isnan(ema).any()
+
+    # Price columns are leaf nodes resolved by the context, not computed by a kernel
+    assert np.array_equal(ctx.evaluate([CLOSE])[CLOSE], columns["Close"])
+    try:
+        ctx.evaluate([("sma", ("column", "Adj Close"), 5)])
+        raise AssertionError("expected ValueError")
+    except ValueError as e:
+        assert "Adj Close" in str(e)
+
+    # Without sessions (daily bars) the same windows run across the whole series
+    daily = compute_indicator(IndicatorContext(columns), "sma", {"period": 20})["sma"]
+    assert np.isnan(daily[:19]).all() and not np.isnan(daily[19:]).any()
+    print("✅ Windows stay within sessions")
+    print()
+
+
+def test_intraday_backtest():
+    """A VWAP strategy on 1m bars runs through the shared signal/fill pipeline"""
+    print("Testing intraday backtest...")
+    blocks = [
+        {"type": "indicator", "id": "vwap", "params": {"period": 0}},
+        {"type": "indicator", "id": "rsi", "params": {"period": 14}},
+        {"type": "condition", "id": "crossover", "params": {"indicator2": "vwap", "direction": "above"}},
+        {"type": "condition", "id": "threshold", "params": {"indicator": "rsi", "operator": "<", "value": 60}},
+        {"type": "action", "id": "buy", "params": {"quantity": "percentage", "value": 100}},
+        {"type": "action", "id": "stopLoss", "params": {"percentage": 1}},
+        {"type": "action", "id": "takeProfit", "params": {"percentage": 1}}
+    ]
+    with tempfile.TemporaryDirectory() as directory:
+        store = IntradayStore(directory)
+        store.append("RELIANCE.NS", "1m", synthetic_bars(days=30))
+        result = backtest_intraday("RELIANCE", blocks, interval="1m", start_date="2024-12-01",
+                                   end_date="2025-01-01", store=store, sync=False)
+        assert result["success"], result.get("error")
+        assert result["bars"] == 375 * result["sessions"]
+        assert result["metrics"]["total_trades"] > 0
+        assert result["trades"][0]["date"].startswith("2024-12-")
+        assert len(result["equity_curve"]) == 100
+        print(f"   {result['bars']} bars, {result['metrics']['total_trades']} trades, "
+              f"return {result['metrics']['total_return']}%")
+
+        assert not backtest_intraday("RELIANCE", blocks, interval="2m", store=store, sync=False)["success"]
+        assert not backtest_intraday("RELIANCE", blocks, interval="1m", start_date="2023-01-01",
+                                     end_date="2023-02-01", store=store, sync=False)["success"]
+    print("✅ Intraday backtest passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("INTRADAY BACKTEST TESTS")
+    print("=" * 60)
+    print()
+
+    test_store_round_trip()
+    test_store_filters_bars()
+    test_concurrent_writers()
+    test_writer_locks()
+    test_session_windows()
+    test_intraday_backtest()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the quiz leaderboard: the skip list against a sorted list, ranks and
+pages after score updates, tie ordering, badges matching the old frontend
+calculateBadges, and two server processes sharing one database
+"""
+
+import os
+import random
+import tempfile
+from leaderboard import (IndexableSkipList, Leaderboard, SCORE_THRESHOLDS, STREAK_THRESHOLDS,
+                         SEED_LEADERBOARD, calculate_badges)
+
+
+def js_calculate_badges(total_score, streak_days):
+    """calculateBadges from the old src/lib/leaderboard.js, line for line"""
+    badges = []
+
+    if total_score >= 1400: badges.append("Expert")
+    elif total_score >= 1000: badges.append("Scholar")
+    elif total_score >= 600: badges.append("Rising Star")
+    elif total_score >= 300: badges.append("Rookie")
+    else: badges.append("Beginner")
+
+    if streak_days >= 20: badges.append("Streak 20")
+    elif streak_days >= 15: badges.append("Streak 15")
+    elif streak_days >= 10: badges.append("Streak 10")
+    elif streak_days >= 7: badges.append("Streak 7")
+    elif streak_days >= 5: badges.append("Streak 5")
+    elif streak_days >= 3: badges.append("Streak 3")
+
+    if total_score >= 1200 and streak_days >= 15: badges.append("Top Performer")
+    if total_score >= 800 and streak_days >= 10: badges.append("Quiz Master")
+
+    return badges
+
+
+def make_leaderboard(directory: str) -> Leaderboard:
+    return Leaderboard(os.path.join(directory, "leaderboard.db"))
+
+
+def ranked_ids(board: Leaderboard):
+    return [entry["userId"] for entry in board.page(0, 100)["entries"]]
+
+
+def test_skip_list():
+    """Rank and slice agree with a plain sorted list through inserts and removes"""
+    print("Testing the indexable skip list...")
+    rng = random.Random(7)
+    skip_list, expected = IndexableSkipList(), []
+    for step in range(2000):
+        if expected and rng.random() < 0.4:
+            key = expected.pop(rng.randrange(len(expected)))
+            skip_list.remove(key)
+        else:
+            key = (-rng.randrange(500), f"user_{step}")
+            skip_list.insert(key)
+            expected.append(key)
+            expected.sort()
+    assert len(skip_list) == len(expected)
+    assert skip_list.slice(0, len(expected)) == expected
+    for position in rng.sample(range(len(expected)), 50):
+        assert skip_list.rank(expected[position]) == position
+        assert skip_list.slice(position, 5) == expected[position:position + 5]
+    assert skip_list.slice(len(expected), 5) == []
+    try:
+        skip_list.remove((1, "missing"))
+        raise AssertionError("expected KeyError")
+    except KeyError:
+        pass
+    print(f"✅ Skip list matches a sorted list of {len(expected)} keys")
+    print()
+
+
+def test_badge_thresholds():
+    """Badges match the old frontend at, just below and just above every threshold"""
+    print("Testing badge thresholds...")
+    scores = sorted({0, 5000} | {t + d for t in SCORE_THRESHOLDS for d in (-1, 0, 1)})
+    streaks = sorted({0, 1, 100} | {t + d for t in STREAK_THRESHOLDS for d in (-1, 0, 1)})
+    for score in scores:
+        for streak in streaks:
+            assert calculate_badges(score, streak) == js_calculate_badges(score, streak), (score, streak)
+    assert calculate_badges(1200, 15) == ["Scholar", "Streak 15", "Top Performer", "Quiz Master"]
+    assert calculate_badges(299, 2) == ["Beginner"]
+    print(f"✅ {len(scores) * len(streaks)} score/streak pairs match")
+    print()
+
+
+def test_ranks_and_updates():
+    """Updates move users in the ranking; ranks and pages agree"""
+    print("Testing ranks after score updates...")
+    with tempfile.TemporaryDirectory() as directory:
+        board = make_leaderboard(directory)
+        seeded = sorted(SEED_LEADERBOARD, key=lambda row: -row[2])
+        assert ranked_ids(board) == [row[0] for row in seeded]
+        assert board.get_user("user_789")["rank"] == 1
+
+        # Amit Singh: 720 -> 1520, streak 3 -> 4
+        user = board.update_score("user_321", 800)
+        assert user["totalScore"] == 1520 and user["streakDays"] == 4 and user["rank"] == 1
+        assert user["badges"] == js_calculate_badges(1520, 4)
+        assert board.get_user("user_789")["rank"] == 2
+
+        # A new user starts at the bottom
+        user = board.update_score("new_user", 10, name="Newcomer")
+        assert user == {"userId": "new_user", "name": "Newcomer", "totalScore": 10, "streakDays": 1,
+                        "badges": ["Beginner"], "rank": 6}
+        assert board.get_user("nobody") is None
+
+        page = board.page(offset=1, limit=2)
+        assert page["total"] == 6 and [e["rank"] for e in page["entries"]] == [2, 3]
+        assert [e["userId"] for e in page["entries"]] == ranked_ids(board)[1:3]
+        for entry in board.page(0, 100)["entries"]:
+            assert board.get_user(entry["userId"])["rank"] == entry["rank"]
+    print("✅ Ranks and updates passed")
+    print()
+
+
+def test_tie_ordering():
+    """Equal scores rank by user id, whatever order they reached the score in"""
+    print("Testing tie ordering...")
+    with tempfile.TemporaryDirectory() as directory:
+        board = make_leaderboard(directory)
+        board.update_score("tie_b", 2000)
+        board.update_score("tie_c", 2000)
+        board.update_score("tie_a", 1999)
+        assert ranked_ids(board)[:3] == ["tie_b", "tie_c", "tie_a"]
+        board.update_score("tie_a", 1)
+        assert ranked_ids(board)[:3] == ["tie_a", "tie_b", "tie_c"]
+        assert [board.get_user(u)["rank"] for u in ("tie_a", "tie_b", "tie_c")] == [1, 2, 3]
+    print("✅ Tie ordering passed")
+    print()
+
+
+def test_shared_between_processes():
+    """A second server process on the same database sees every update"""
+    print("Testing leaderboards across workers...")
+    with tempfile.TemporaryDirectory() as directory:
+        worker_a, worker_b = make_leaderboard(directory), make_leaderboard(directory)
+        assert ranked_ids(worker_a) == ranked_ids(worker_b)
+
+        worker_a.update_score("1", 1000)
+        assert worker_b.get_user("1")["totalScore"] == 1850 and worker_b.get_user("1")["rank"] == 1
+        worker_b.update_score("user_789", 500)
+        worker_b.update_score("1", 5)
+        assert worker_a.get_user("1")["totalScore"] == 1855
+        assert worker_a.page(0, 100) == worker_b.page(0, 100)
+        assert ranked_ids(worker_a)[:2] == ["user_789", "1"]
+    print("✅ Cross-worker leaderboard passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("LEADERBOARD TESTS")
+    print("=" * 60)
+    print()
+
+    test_skip_list()
+    test_badge_thresholds()
+    test_ranks_and_updates()
+    test_tie_ordering()
+    test_shared_between_processes()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the OHLC endpoint: date-range slicing on synthetic prices, and
+malformed dates answered with a 400 instead of a server error
+"""
+
+import market_data
+from benchmark import SyntheticProvider
+from ohlc import get_candles
+
+
+def with_synthetic_prices(func):
+    original = market_data.get_provider()
+    market_data.set_provider(SyntheticProvider())
+    try:
+        return func()
+    finally:
+        market_data.set_provider(original)
+
+
+def test_date_range():
+    print("Testing date-range slicing...")
+    result = with_synthetic_prices(lambda: get_candles("TCS", start="2024-06-03", end="2024-06-07"))
+    assert "error" not in result, result
+    assert 0 < result["count"] <= 5 and len(result["candles"]["close"]) == result["count"]
+    print(f"✅ {result['count']} candles in range")
+    print()
+
+
+def test_malformed_dates():
+    print("Testing malformed dates...")
+    for start, end in (("bogus", None), (None, "2024-13-45"), ("2024-06-03", "yesterday")):
+        result = get_candles("TCS", start=start, end=end)
+        assert "YYYY-MM-DD" in result.get("error", ""), result
+
+    from main import app
+    response = app.test_client().get("/ohlc?symbol=TCS&start=bogus")
+    assert response.status_code == 400 and not response.get_json()["success"]
+    print("✅ Malformed dates rejected with 400")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("OHLC TESTS")
+    print("=" * 60)
+    print()
+
+    test_date_range()
+    test_malformed_dates()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Tests for paper trading: trades are priced only from the server's latest
+quotes, and a symbol without a quote cannot be traded whatever the client sends
+"""
+
+import os
+import tempfile
+import portfolio_service
+from portfolio_service import LatestPrices, PortfolioError, PortfolioService, PORTFOLIO_STARTING_CASH
+
+QUOTES = {"TCS.NS": 3500.0}
+
+
+class FixedPrices(LatestPrices):
+    """Quotes from a fixed table; any other symbol has no data, like an outage"""
+
+    @staticmethod
+    def _fetch(symbol):
+        return QUOTES.get(symbol)
+
+
+def make_service(directory: str) -> PortfolioService:
+    return PortfolioService(os.path.join(directory, "portfolio.db"), prices=FixedPrices())
+
+
+def test_trades_use_server_price():
+    print("Testing trade pricing...")
+    with tempfile.TemporaryDirectory() as directory:
+        service = make_service(directory)
+        portfolio = service.trade("u", "BUY", "TCS", 2)
+        assert portfolio["cash"] == PORTFOLIO_STARTING_CASH - 7000
+        portfolio = service.trade("u", "SELL", "TCS", 1)
+        assert portfolio["cash"] == PORTFOLIO_STARTING_CASH - 3500
+        assert [t["price"] for t in portfolio["transactions"]] == [3500.0, 3500.0]
+    print("✅ Trades priced at the server quote")
+    print()
+
+
+def test_no_quote_no_trade():
+    """Without a server price the trade is refused; nothing is written"""
+    print("Testing symbols without a quote...")
+    with tempfile.TemporaryDirectory() as directory:
+        service = make_service(directory)
+        for action in ("BUY", "SELL"):
+            try:
+                service.trade("u", action, "NOSUCH", 1)
+                raise AssertionError(f"{action} without a price succeeded")
+            except PortfolioError as e:
+                assert "No price available for NOSUCH" in str(e)
+        portfolio = service.get_portfolio("u")
+        assert portfolio["cash"] == PORTFOLIO_STARTING_CASH
+        assert portfolio["positions"] == [] and portfolio["transactions"] == []
+    print("✅ Trades without a quote refused")
+    print()
+
+
+def test_route_ignores_client_price():
+    """A price in the request body is never used"""
+    print("Testing /portfolio/trade...")
+    from main import app
+    with tempfile.TemporaryDirectory() as directory:
+        original = portfolio_service.portfolio_service
+        portfolio_service.portfolio_service = make_service(directory)
+        try:
+            client = app.test_client()
+            response = client.post("/portfolio/trade", json={
+                "user_id": "u", "action": "BUY", "symbol": "NOSUCH", "quantity": 1, "price": 1})
+            assert response.status_code == 400 and "No price" in response.get_json()["error"]
+
+            body = client.post("/portfolio/trade", json={
+                "user_id": "u", "action": "BUY", "symbol": "TCS", "quantity": 1, "price": 1}).get_json()
+            assert body["success"] and body["portfolio"]["cash"] == PORTFOLIO_STARTING_CASH - 3500
+        finally:
+            portfolio_service.portfolio_service = original
+    print("✅ Client prices ignored")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("PAPER TRADING TESTS")
+    print("=" * 60)
+    print()
+
+    test_trades_use_server_price()
+    test_no_quote_no_trade()
+    test_route_ignores_client_price()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
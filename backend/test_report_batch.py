@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for batch reports: the metric suite on synthetic prices, reports
+without beta/CAPM when the benchmark fails to load, recovery from a broken
+report process pool, and report timings recorded in the parent process
+"""
+
+import os
+import ai_agent
+from benchmark import SyntheticProvider
+from metrics import STAGE_SECONDS
+
+SYMBOLS = ["TCS.NS", "INFY.NS"]
+provider = SyntheticProvider()
+
+
+def synthetic_history(symbol, period="2y"):
+    return provider.history(symbol, period=period)
+
+
+def failing_benchmark(symbol, period="2y"):
+    if symbol.startswith("^"):
+        raise ConnectionError("benchmark feed down")
+    return synthetic_history(symbol, period)
+
+
+def synthetic_info(symbol):
+    return {"longName": symbol, "currency": "INR"}
+
+
+def run_batch(get_history=synthetic_history):
+    original = ai_agent.get_history, ai_agent.get_info
+    ai_agent.get_history, ai_agent.get_info = get_history, synthetic_info
+    try:
+        return ai_agent.get_financial_reports_batch(SYMBOLS, "^NSEI")
+    finally:
+        ai_agent.get_history, ai_agent.get_info = original
+
+
+def report_timings() -> int:
+    return sum(series[-1] for labels, series in STAGE_SECONDS._series.items() if labels[1] == "financial_report")
+
+
+def test_batch_reports():
+    print("Testing batch reports...")
+    timings = report_timings()
+    reports = run_batch()
+    for symbol in SYMBOLS:
+        report = reports[symbol]
+        assert "error" not in report, report
+        assert report["benchmark_used"] == "^NSEI"
+        assert isinstance(report["risk_metrics"]["beta"]["value"], float)
+        assert report["capm_analysis"]["expected_return_percentage"].endswith("%")
+    assert report_timings() == timings + len(SYMBOLS), "report timings were not recorded"
+    print("✅ Batch reports passed")
+    print()
+
+
+def test_benchmark_unavailable():
+    """A failed benchmark load leaves out beta/CAPM instead of failing the batch"""
+    print("Testing a batch without the benchmark...")
+    reports = run_batch(failing_benchmark)
+    for symbol in SYMBOLS:
+        report = reports[symbol]
+        assert "error" not in report, report
+        assert report["benchmark_used"] is None
+        assert report["risk_metrics"]["beta"]["value"] is None
+        assert report["capm_analysis"]["expected_return"] is None
+        assert report["capm_analysis"]["expected_return_percentage"] == "N/A"
+        assert report["risk_metrics"]["sharpe_ratio"]["value"] is not None
+
+    from main import _build_structured_report
+    structured = _build_structured_report(SYMBOLS[0], "^NSEI", reports[SYMBOLS[0]])
+    assert structured["performance_analysis"]["risk_metrics"]["beta"]["value"] is None
+    print("✅ Reports without the benchmark passed")
+    print()
+
+
+def test_broken_pool_recovers():
+    """A pool whose worker died is replaced; that batch is computed in-process"""
+    print("Testing recovery from a broken process pool...")
+    pool = ai_agent._get_report_pool()
+    try:
+        pool.submit(os._exit, 1).result()
+    except Exception:
+        pass
+
+    reports = run_batch()
+    assert all("error" not in reports[symbol] for symbol in SYMBOLS), reports
+    assert ai_agent._report_pool is not pool, "the broken pool was kept"
+
+    reports = run_batch()
+    assert all("error" not in reports[symbol] for symbol in SYMBOLS), reports
+    assert ai_agent._report_pool is not None
+    print("✅ Broken pool recovery passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("BATCH REPORT TESTS")
+    print("=" * 60)
+    print()
+
+    test_batch_reports()
+    test_benchmark_unavailable()
+    test_broken_pool_recovers()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
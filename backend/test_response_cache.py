@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests for the chat response cache: exact and near-duplicate hits, and the
+near-duplicates that must NOT hit because order or numbers change the meaning
+"""
+
+from response_cache import ResponseCache, normalize_query, same_question_shape
+
+# (cached question, new question) pairs that mean something different
+DIFFERENT_MEANING = [
+    ("should I switch from debt to equity", "should I switch from equity to debt"),
+    ("how does inflation affect bonds", "how do bonds affect inflation"),
+    ("is it better to buy gold than silver", "is it better to buy silver than gold"),
+    ("I am 25, what SIP amount should I start", "I am 55, what SIP amount should I start"),
+    ("how much to invest for 10 years", "how much to invest for 20 years"),
+    ("should I buy gold now", "should I not buy gold now"),
+    ("advantages of index funds", "disadvantages of index funds"),
+    ("large cap", "small cap"),
+    ("long term capital gains taxed", "short term capital gains taxed")
+]
+
+# Paraphrases that should be served from the cache
+SAME_MEANING = [
+    ("What is CAGR?", "explain CAGR"),
+    ("how does compound interest work", "how compound interest works"),
+    ("What is the difference between a mutual fund and an ETF?", "difference between mutual fund and ETF"),
+    ("how are long term capital gains taxed", "how is long term capital gain taxed"),
+    ("advantages of index funds", "what are the advantages of an index fund")
+]
+
+
+def test_normalize_query():
+    print("Testing query normalization...")
+    assert normalize_query("What is CAGR?") == "cagr"
+    assert normalize_query("Please explain the meaning of P/E") == "p e"
+    assert normalize_query("I am 25") == "am 25"
+    print("✅ Normalization passed")
+    print()
+
+
+def test_different_meaning_misses():
+    """Negations, antonyms, word order and numbers are not ignored for near-duplicate hits"""
+    print("Testing near-duplicates with a different meaning...")
+    for cached, asked in DIFFERENT_MEANING:
+        assert not same_question_shape(normalize_query(cached), normalize_query(asked)), (cached, asked)
+        cache = ResponseCache(use_embeddings=True)
+        cache.put(cached, "cached answer")
+        assert cache.get(asked) is None, f"'{asked}' was served the answer for '{cached}'"
+    print(f"✅ {len(DIFFERENT_MEANING)} pairs not served from the cache")
+    print()
+
+
+def test_paraphrase_hits():
+    print("Testing paraphrased questions...")
+    for cached, asked in SAME_MEANING:
+        cache = ResponseCache(use_embeddings=True)
+        cache.put(cached, "cached answer")
+        assert cache.get(asked) == "cached answer", f"'{asked}' missed '{cached}'"
+    print(f"✅ {len(SAME_MEANING)} paraphrases served from the cache")
+    print()
+
+
+def test_best_valid_match_wins():
+    """A reordered entry scoring higher does not hide a valid lower-scoring one"""
+    print("Testing candidate selection...")
+    cache = ResponseCache(use_embeddings=True)
+    cache.put("should I switch from equity to debt", "to debt")
+    cache.put("should I switch from debt to equities", "to equity")
+    assert cache.get("should I switch from debt to equity") == "to equity"
+    print("✅ Candidate selection passed")
+    print()
+
+
+def test_market_answers_need_exact_match():
+    print("Testing market-dependent answers...")
+    cache = ResponseCache(use_embeddings=True)
+    cache.put("price of RELIANCE.NS today", "₹2,900", [{"name": "get_stock_data", "args": {"symbol": "RELIANCE.NS"}}])
+    assert cache.get("price of RELIANCE.NS today") == "₹2,900"
+    assert cache.get("RELIANCE.NS price today") is None
+    assert cache.invalidate("RELIANCE.NS") == 1
+    assert cache.get("price of RELIANCE.NS today") is None
+    print("✅ Market answers passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("RESPONSE CACHE TESTS")
+    print("=" * 60)
+    print()
+
+    test_normalize_query()
+    test_different_meaning_misses()
+    test_paraphrase_hits()
+    test_best_valid_match_wins()
+    test_market_answers_need_exact_match()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for chat sessions: history folding into the summary, idle expiry,
+sharing between server processes (two store instances on one database),
+the tool output cap, and stateless chat requests not creating sessions
+"""
+
+import os
+import time
+import tempfile
+from session_store import SessionStore, ToolOutputCache, active_session, estimate_tokens, session_memoize
+
+
+def make_store(directory: str, **kwargs) -> SessionStore:
+    return SessionStore(os.path.join(directory, "sessions.db"), **kwargs)
+
+
+def test_history_folding():
+    """Turns beyond max_turns, and turns over the token budget, are folded into the summary"""
+    print("Testing history folding...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory, max_turns=3)
+        session = store.get_or_create()
+        for i in range(5):
+            session.add_turn(f"Question {i}. More detail", f"Answer {i}. More detail")
+
+        summary, messages = session.history(token_budget=10_000)
+        assert "User asked: Question 0 Assistant answered: Answer 0" in summary
+        assert "Question 1" in summary and "Question 2" not in summary
+        assert [m["content"] for m in messages if m["role"] == "user"] == [
+            "Question 2. More detail", "Question 3. More detail", "Question 4. More detail"]
+
+        # A tight budget keeps only the newest turn and folds the rest
+        summary, messages = session.history(token_budget=estimate_tokens(summary) + 12)
+        assert len(messages) == 2 and messages[0]["content"] == "Question 4. More detail"
+        assert "Question 3" in summary
+        assert session.has_history()
+    print("✅ History folding passed")
+    print()
+
+
+def test_expiry():
+    """Idle sessions expire; an expired id starts a fresh conversation"""
+    print("Testing session expiry...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory, ttl=0.2)
+        session = store.get_or_create("abc")
+        session.add_turn("What is SIP?", "A systematic investment plan.")
+        assert store.get("abc") is not None
+        time.sleep(0.3)
+        assert store.get("abc") is None
+        fresh = store.get_or_create("abc")
+        assert not fresh.has_history()
+        assert store.count() == 1
+    print("✅ Expiry passed")
+    print()
+
+
+def test_max_sessions():
+    print("Testing the session limit...")
+    with tempfile.TemporaryDirectory() as directory:
+        store = make_store(directory, max_sessions=3)
+        ids = [store.get_or_create().id for _ in range(5)]
+        assert store.count() == 3
+        assert store.get(ids[0]) is None and store.get(ids[-1]) is not None
+    print("✅ Session limit passed")
+    print()
+
+
+def test_shared_between_processes():
+    """A follow-up handled by another worker sees the same history"""
+    print("Testing sessions across workers...")
+    with tempfile.TemporaryDirectory() as directory:
+        worker_a, worker_b = make_store(directory), make_store(directory)
+        session_id = worker_a.get_or_create().id
+        worker_a.get(session_id).add_turn("Explain CAGR", "Compound annual growth rate.")
+        session = worker_b.get(session_id)
+        assert session is not None
+        _, messages = session.history()
+        assert messages[0]["content"] == "Explain CAGR"
+        session.add_turn("And XIRR?", "Returns for irregular cash flows.")
+        _, messages = worker_a.get(session_id).history()
+        assert len(messages) == 4
+        assert worker_b.delete(session_id) and worker_a.get(session_id) is None
+    print("✅ Cross-worker sessions passed")
+    print()
+
+
+def test_tool_output_cap():
+    print("Testing the tool output cap...")
+    cache = ToolOutputCache(max_entries=3)
+    for i in range(5):
+        cache[i] = str(i)
+    assert list(cache) == [2, 3, 4]
+
+    calls = []
+
+    @session_memoize("lookup")
+    def lookup(symbol):
+        calls.append(symbol)
+        return f"data for {symbol}"
+
+    with tempfile.TemporaryDirectory() as directory:
+        session = make_store(directory).get_or_create()
+        with active_session(session):
+            lookup("TCS.NS")
+            lookup("TCS.NS")
+        assert calls == ["TCS.NS"] and len(session.tool_outputs) == 1
+    print("✅ Tool output cap passed")
+    print()
+
+
+def test_stateless_requests():
+    """Chat requests without a session_id do not create sessions"""
+    print("Testing stateless chat requests...")
+    import ai_agent
+    import session_store
+    from main import app
+
+    def answer(query, session_id=None):
+        # Stands in for the agent: records the turn like get_agent_response does
+        if session_id:
+            session_store.session_store.get_or_create(session_id).add_turn(query, "answer")
+        return "answer"
+
+    with tempfile.TemporaryDirectory() as directory:
+        original_store, original_answer = session_store.session_store, ai_agent.get_agent_response
+        store = session_store.session_store = make_store(directory)
+        ai_agent.get_agent_response = answer
+        try:
+            client = app.test_client()
+            body = client.post("/get_response", json={"query": "What is a P/E ratio?"}).get_json()
+            assert body["session_id"] is None and store.count() == 0
+            body = client.post("/get_response", json={"query": "What is a P/E ratio?", "new_session": True}).get_json()
+            assert body["session_id"] and store.count() == 1
+            client.post("/get_response", json={"query": "And EPS?", "session_id": body["session_id"]})
+            assert store.count() == 1 and store.get(body["session_id"]).has_history()
+        finally:
+            session_store.session_store, ai_agent.get_agent_response = original_store, original_answer
+    print("✅ Stateless requests passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SESSION STORE TESTS")
+    print("=" * 60)
+    print()
+
+    test_history_folding()
+    test_expiry()
+    test_max_sessions()
+    test_shared_between_processes()
+    test_tool_output_cap()
+    test_stateless_requests()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Parity tests for the signal compiler: the Algo Builder condition blocks and
+expression trees against hand-computed signals on a small fixture, and the
+compiled blocks against the original per-bar evaluate_condition on random prices
+"""
+
+import numpy as np
+from signals import compile_condition, compile_conditions, compile_expression, series_env
+
+T, F = True, False
+nan = np.nan
+
+# Seven bars, small enough to work every signal out by hand
+CLOSE = np.array([10, 11, 9, 12, 12, 8, 10], dtype=float)
+INDICATORS = {
+    "sma": np.array([nan, 10, 10, 11, 12, 9, 10]),
+    "ema": np.array([nan, 9, 11, 10, 13, 9, 11]),
+    "rsi": np.array([nan, 25, 30, 29.5, 71, 70, 45])
+}
+AVAILABLE = set(INDICATORS)
+
+# (condition params, expected signal)
+CROSSOVERS = [
+    # price > sma now and the previous price <= sma now
+    ({"indicator2": "sma", "direction": "above"}, [F, T, F, T, F, F, F]),
+    ({"indicator2": "sma", "direction": "below"}, [F, F, T, F, F, T, F]),
+    # ema - sma = [nan, -1, 1, -1, 1, 0, 1]: sign changes on both bars
+    ({"indicator1": "ema", "indicator2": "sma", "direction": "above"}, [F, F, T, F, T, F, T]),
+    ({"indicator1": "ema", "indicator2": "sma", "direction": "below"}, [F, F, F, T, F, F, F]),
+    ({"indicator1": "macd", "indicator2": "sma", "direction": "above"}, [F] * 7),
+    ({"indicator2": "macd", "direction": "above"}, [F] * 7)
+]
+
+THRESHOLDS = [
+    ({"indicator": "rsi", "operator": "<", "value": 30}, [F, T, F, T, F, F, F]),
+    ({"indicator": "rsi", "operator": ">", "value": 70}, [F, F, F, F, T, F, F]),
+    # "=" is within one point, exclusive
+    ({"indicator": "rsi", "operator": "=", "value": 30}, [F, F, T, T, F, F, F]),
+    ({"indicator": "rsi", "operator": ">=", "value": 30}, [F] * 7),
+    ({"indicator": "macd", "operator": "<", "value": 30}, [F] * 7)
+]
+
+PRICE_CHANGES = [
+    # % changes: [-, +10, -18.2, +33.3, 0, -33.3, +25]
+    ({"direction": "up", "percentage": 5}, [F, T, F, T, F, F, T]),
+    ({"direction": "down", "percentage": 5}, [F, F, T, F, F, T, F])
+]
+
+EXPRESSIONS = [
+    ({"any": [{"cross": ["ema", "above", "sma"]}, {"compare": ["rsi", "<", 30]}]}, [F, T, T, T, T, F, T]),
+    ({"all": [{"cross": ["ema", "above", "sma"]}, {"compare": ["rsi", ">", 50]}]}, [F, F, F, F, T, F, F]),
+    ({"not": {"compare": ["rsi", "<", 30]}}, [T, F, T, F, T, T, T]),
+    ({"all": [{"any": [{"compare": ["close", ">", 11]}, {"compare": ["close", "<", 9]}]},
+              {"not": {"compare": ["rsi", ">", 70]}}]}, [F, F, F, T, F, T, F]),
+    ({"compare": [{"ref": "close", "lookback": 1}, ">", "sma"]}, [F, F, T, F, F, T, F]),
+    ({"within": 2, "expr": {"compare": ["rsi", "<", 30]}}, [F, T, T, T, T, F, F]),
+    ({"for": 2, "expr": {"compare": ["rsi", ">", 28]}}, [F, F, F, T, T, T, T])
+]
+
+
+def fixture_env(close=CLOSE, indicators=INDICATORS):
+    columns = {"Open": close, "High": close, "Low": close, "Close": close, "Volume": np.ones(len(close))}
+    return series_env(columns, indicators)
+
+
+def block(condition_id, params):
+    return {"type": "condition", "id": condition_id, "params": params}
+
+
+def check(label, signal, expected):
+    assert signal.dtype == bool, f"{label}: not a boolean signal"
+    assert signal.tolist() == expected, f"{label}: got {signal.astype(int).tolist()}"
+
+
+def reference_condition(condition, price, indicators, prev_price):
+    """evaluate_condition from the original per-bar backtest loop"""
+    params = condition['params']
+    if condition['id'] == 'crossover':
+        indicator = params.get('indicator2', 'sma')
+        direction = params.get('direction', 'above')
+        if indicator in indicators:
+            value = indicators[indicator]
+            if direction == 'above':
+                return price > value and prev_price <= value
+            return price < value and prev_price >= value
+        return False
+    if condition['id'] == 'threshold':
+        indicator = params.get('indicator', 'rsi')
+        operator = params.get('operator', '<')
+        value = params.get('value', 30)
+        if indicator in indicators:
+            current = indicators[indicator]
+            if operator == '<':
+                return current < value
+            elif operator == '>':
+                return current > value
+            elif operator == '=':
+                return abs(current - value) < 1
+        return False
+    if condition['id'] == 'priceChange':
+        change_pct = ((price - prev_price) / prev_price) * 100
+        if params.get('direction', 'up') == 'up':
+            return change_pct >= params.get('percentage', 5)
+        return change_pct <= -params.get('percentage', 5)
+    return False
+
+
+def test_condition_blocks():
+    print("Testing Algo Builder condition blocks...")
+    env = fixture_env()
+    for condition_id, cases in (("crossover", CROSSOVERS), ("threshold", THRESHOLDS), ("priceChange", PRICE_CHANGES)):
+        for params, expected in cases:
+            check(f"{condition_id} {params}", compile_condition(block(condition_id, params), AVAILABLE)(env), expected)
+    print(f"✅ {len(CROSSOVERS) + len(THRESHOLDS) + len(PRICE_CHANGES)} condition blocks match")
+    print()
+
+
+def test_combined_blocks():
+    """Condition blocks are ANDed; no conditions means every bar"""
+    print("Testing combined condition blocks...")
+    env = fixture_env()
+    conditions = [block("crossover", {"indicator2": "sma", "direction": "above"}),
+                  block("threshold", {"indicator": "rsi", "operator": ">", "value": 28})]
+    check("crossover AND threshold", compile_conditions(conditions, AVAILABLE)(env), [F, F, F, T, F, F, F])
+    check("no conditions", compile_conditions([], AVAILABLE)(env), [T] * 7)
+    print("✅ Combined blocks passed")
+    print()
+
+
+def test_expressions():
+    print("Testing expression trees...")
+    env = fixture_env()
+    for spec, expected in EXPRESSIONS:
+        check(str(spec), compile_expression(spec)(env), expected)
+    for bad in ({"compare": ["rsi", "~", 30]}, {"cross": ["ema", "sideways", "sma"]}, {"any": []}, {"nope": 1}):
+        try:
+            compile_expression(bad)
+            raise AssertionError(f"{bad} compiled")
+        except ValueError:
+            pass
+    try:
+        compile_expression({"compare": ["vwap", ">", 1]})(env)
+        raise AssertionError("unknown series evaluated")
+    except ValueError as e:
+        assert "vwap" in str(e)
+    print(f"✅ {len(EXPRESSIONS)} expressions match")
+    print()
+
+
+def test_matches_per_bar_reference():
+    """Compiled blocks agree with the original per-bar evaluation on random prices"""
+    print("Testing against the per-bar reference...")
+    rng = np.random.default_rng(11)
+    close = 100 * np.cumprod(1 + rng.normal(0, 0.02, 500))
+    indicators = {"sma": close * (1 + rng.normal(0, 0.01, 500)), "rsi": rng.uniform(0, 100, 500)}
+    indicators["sma"][:20] = nan
+    env = fixture_env(close, indicators)
+    conditions = [block("crossover", {"indicator2": "sma", "direction": d}) for d in ("above", "below")]
+    conditions += [block("threshold", {"indicator": "rsi", "operator": op, "value": 40}) for op in ("<", ">", "=")]
+    conditions += [block("priceChange", {"direction": d, "percentage": 1.5}) for d in ("up", "down")]
+
+    for condition in conditions:
+        signal = compile_condition(condition, set(indicators))(env)
+        expected = [reference_condition(condition, close[i], {k: v[i] for k, v in indicators.items()}, close[i - 1])
+                    for i in range(1, len(close))]
+        assert signal[1:].tolist() == expected, condition
+    print(f"✅ {len(conditions)} blocks match the per-bar loop")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SIGNAL COMPILER TESTS")
+    print("=" * 60)
+    print()
+
+    test_condition_blocks()
+    test_combined_blocks()
+    test_expressions()
+    test_matches_per_bar_reference()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the summary cache: summaries written by several server processes
+at once are all kept, and the cache is capped at max_entries
+"""
+
+import os
+import tempfile
+import multiprocessing
+from content_aggregator import SummaryCache
+
+
+def write_summaries(path: str, worker: int, count: int) -> None:
+    """One server process summarizing its own articles"""
+    cache = SummaryCache(path)
+    for i in range(count):
+        cache.set(SummaryCache.make_key(f"article {worker}-{i}", "model", 100), f"summary {worker}-{i}")
+
+
+def test_shared_between_processes():
+    print("Testing summaries from concurrent workers...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "summaries.db")
+        SummaryCache(path).get("")  # opened in the parent first, like the gunicorn master
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=write_summaries, args=(path, worker, 50)) for worker in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=60)
+            assert worker.exitcode == 0, f"worker exited with {worker.exitcode}"
+
+        cache = SummaryCache(path)
+        assert cache.count() == 200
+        for worker in range(4):
+            key = SummaryCache.make_key(f"article {worker}-49", "model", 100)
+            assert cache.get(key) == f"summary {worker}-49"
+    print("✅ 4 workers, no summaries lost")
+    print()
+
+
+def test_max_entries():
+    """The oldest summaries are dropped beyond max_entries; rewriting a key keeps one row"""
+    print("Testing the summary cache limit...")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = SummaryCache(os.path.join(directory, "summaries.db"), max_entries=10)
+        for i in range(25):
+            cache.set(f"key {i}", f"summary {i}")
+        cache.set("key 24", "updated")
+        assert cache.count() <= 10
+        assert cache.get("key 0") is None and cache.get("key 23") == "summary 23"
+        assert cache.get("key 24") == "updated"
+    print("✅ Summary cache limit passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("SUMMARY CACHE TESTS")
+    print("=" * 60)
+    print()
+
+    test_shared_between_processes()
+    test_max_entries()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for agent tool timeouts: a hung tool returns an error at its timeout,
+does not block later tool calls, is tracked until it finishes, and a tool
+with too many hung calls fails fast
+"""
+
+import json
+import time
+import threading
+import contextvars
+from langchain_core.tools import StructuredTool
+import tool_executor
+from tool_executor import with_timeout, abandoned_calls, TOOL_MAX_ABANDONED, TOOL_MAX_CONCURRENCY
+
+release = threading.Event()
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def hang(symbol: str) -> str:
+    """Blocks until the test releases it"""
+    release.wait()
+    return f"late data for {symbol}"
+
+
+def quick(symbol: str) -> str:
+    """Returns at once, with the caller's context variable"""
+    return f"data for {symbol} ({request_id.get()})"
+
+
+def fail(symbol: str) -> str:
+    """Raises"""
+    raise ValueError(f"bad symbol {symbol}")
+
+
+def test_hung_tool_does_not_block():
+    print("Testing a hung tool...")
+    hung_tool = with_timeout(StructuredTool.from_function(hang), timeout=0.1)
+    quick_tool = with_timeout(StructuredTool.from_function(quick), timeout=1)
+
+    # More hung calls than the old shared pool had threads
+    calls = TOOL_MAX_CONCURRENCY + 2
+    original_limit = tool_executor.TOOL_MAX_ABANDONED
+    tool_executor.TOOL_MAX_ABANDONED = calls
+    try:
+        for _ in range(calls):
+            result = json.loads(hung_tool.invoke({"symbol": "TCS.NS"}))
+            assert result == {"error": "hang timed out after 0.1s"}
+        assert abandoned_calls() == {"hang": calls}
+
+        request_id.set("req-1")
+        start = time.perf_counter()
+        assert quick_tool.invoke({"symbol": "INFY.NS"}) == "data for INFY.NS (req-1)"
+        assert time.perf_counter() - start < 0.5, "the quick tool waited behind hung calls"
+    finally:
+        tool_executor.TOOL_MAX_ABANDONED = original_limit
+        release.set()
+
+    deadline = time.time() + 5
+    while abandoned_calls() and time.time() < deadline:
+        time.sleep(0.01)
+    assert abandoned_calls() == {}
+    release.clear()
+    print(f"✅ {calls} hung calls abandoned, later call answered at once")
+    print()
+
+
+def test_fail_fast_when_hung():
+    print("Testing fail-fast after too many hung calls...")
+    hung_tool = with_timeout(StructuredTool.from_function(hang), timeout=0.05)
+    try:
+        for _ in range(TOOL_MAX_ABANDONED):
+            assert "timed out" in hung_tool.invoke({"symbol": "TCS.NS"})
+        start = time.perf_counter()
+        result = json.loads(hung_tool.invoke({"symbol": "TCS.NS"}))
+        assert "unavailable" in result["error"] and time.perf_counter() - start < 0.05
+    finally:
+        release.set()
+    deadline = time.time() + 5
+    while abandoned_calls() and time.time() < deadline:
+        time.sleep(0.01)
+    release.clear()
+    print("✅ Fail-fast passed")
+    print()
+
+
+def test_errors_propagate():
+    print("Testing tool errors...")
+    failing_tool = with_timeout(StructuredTool.from_function(fail), timeout=1)
+    try:
+        failing_tool.invoke({"symbol": "???"})
+        raise AssertionError("expected ValueError")
+    except ValueError as e:
+        assert "bad symbol" in str(e)
+    print("✅ Errors passed")
+    print()
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("TOOL EXECUTOR TESTS")
+    print("=" * 60)
+    print()
+
+    test_hung_tool_does_not_block()
+    test_fail_fast_when_hung()
+    test_errors_propagate()
+
+    print("=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
@@ -0,0 +1,110 @@
+"""
+Agent Tool Execution
+Per-tool timeouts for the agent's tool calls. The agent's ToolNode already
+runs independent calls requested in one step (e.g. stock data for three
+tickers plus a web search) concurrently, capped by agent_config(); this
+module only makes sure a slow tool cannot hold up the whole answer.
+
+Each call runs on its own daemon thread. A call that exceeds its timeout is
+abandoned: the agent gets an {"error": ...} result at once, the thread is
+left to finish (yfinance requests carry their own socket timeout, see
+market_data.py) and is counted until it does. Because abandoned calls do not
+occupy a shared pool, hung calls never block later ones; a tool with
+TOOL_MAX_ABANDONED calls still hung fails fast instead of piling up threads.
+"""
+
+import os
+import json
+import threading
+import contextvars
+from typing import Any, Dict
+from langchain_core.tools import BaseTool, StructuredTool
+from metrics import timed, record_tool_timeout
+
+TOOL_MAX_CONCURRENCY = int(os.getenv("TOOL_MAX_CONCURRENCY", "8"))
+TOOL_TIMEOUT = float(os.getenv("TOOL_TIMEOUT", "30"))  # seconds, default for every tool
+TOOL_MAX_ABANDONED = int(os.getenv("TOOL_MAX_ABANDONED", "4"))  # hung calls per tool before it fails fast
+
+
+def _parse_timeouts(value: str) -> Dict[str, float]:
+    """Parse per-tool overrides like "get_stock_data=15,tavily_search_results_json=10" """
+    timeouts = {}
+    for item in value.split(","):
+        if "=" in item:
+            name, seconds = item.split("=", 1)
+            timeouts[name.strip()] = float(seconds)
+    return timeouts
+
+
+TOOL_TIMEOUTS = _parse_timeouts(os.getenv("TOOL_TIMEOUTS", "tavily_search_results_json=15"))
+
+# Tool name -> timed-out calls that are still running
+_abandoned: Dict[str, int] = {}
+_abandoned_lock = threading.Lock()
+
+
+def agent_config() -> Dict[str, Any]:
+    """Run config for the agent: caps how many tool calls run at once"""
+    return {"max_concurrency": TOOL_MAX_CONCURRENCY}
+
+
+def abandoned_calls() -> Dict[str, int]:
+    """Timed-out tool calls still running, per tool"""
+    with _abandoned_lock:
+        return {name: count for name, count in _abandoned.items() if count}
+
+
+def with_timeout(tool: BaseTool, timeout: float = None) -> BaseTool:
+    """
+    Wrap a tool so it returns an {"error": ...} result instead of blocking
+    the agent when it exceeds its timeout
+    """
+    if timeout is None:
+        timeout = TOOL_TIMEOUTS.get(tool.name, TOOL_TIMEOUT)
+
+    def run(**kwargs):
+        with _abandoned_lock:
+            hung = _abandoned.get(tool.name, 0)
+        if hung >= TOOL_MAX_ABANDONED:
+            return json.dumps({"error": f"{tool.name} is unavailable: {hung} earlier calls have not returned"})
+
+        # Copy the context so session-scoped caches stay visible in the thread
+        context = contextvars.copy_context()
+        outcome: Dict[str, Any] = {}
+        finished = threading.Event()
+
+        def call():
+            try:
+                outcome["result"] = context.run(tool.invoke, kwargs)
+            except Exception as e:
+                outcome["error"] = e
+            finally:
+                with _abandoned_lock:
+                    finished.set()
+                    if outcome.get("abandoned"):
+                        _abandoned[tool.name] -= 1
+                        print(f"⏱️ Abandoned {tool.name} call finished")
+
+        with timed(f"tool_{tool.name}"):
+            threading.Thread(target=call, name=f"agent-tool-{tool.name}", daemon=True).start()
+            if not finished.wait(timeout):
+                with _abandoned_lock:
+                    if not finished.is_set():
+                        outcome["abandoned"] = True
+                        _abandoned[tool.name] = _abandoned.get(tool.name, 0) + 1
+                        hung = _abandoned[tool.name]
+                if outcome.get("abandoned"):
+                    record_tool_timeout(tool.name)
+                    print(f"⚠️ {tool.name} timed out after {timeout:g}s ({hung} call(s) still running)")
+                    return json.dumps({"error": f"{tool.name} timed out after {timeout:g}s"})
+
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["result"]
+
+    return StructuredTool.from_function(
+        func=run,
+        name=tool.name,
+        description=tool.description,
+        args_schema=tool.args_schema
+    )
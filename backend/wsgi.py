@@ -0,0 +1,34 @@
+"""
+Production WSGI Entry Point
+Serve with gunicorn (settings in gunicorn.conf.py):
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app enabled this module is imported once in the master process,
+so the heavy imports and read-only reference data below are loaded before the
+workers fork and shared copy-on-write between them. LLM clients, thread pools
+and the report process pool are still created lazily inside each worker.
+"""
+
+import time
+from main import app, STATIC_RESPONSES
+
+
+def preload() -> None:
+    """Import the heavy modules and warm read-only data shared by all workers"""
+    start = time.perf_counter()
+
+    import market_data
+    import content_aggregator
+    import ai_agent  # langchain/langgraph imports; the agent itself is built lazily
+
+    # Risk questions/profiles, languages and the stock list, pre-serialized
+    for static_response in STATIC_RESPONSES:
+        static_response.warm()
+    content_aggregator.get_demo_sebi_content()
+
+    print(f"📦 Preloaded shared data in {time.perf_counter() - start:.2f}s "
+          f"(market data mode: {market_data.MARKET_DATA_MODE})")
+
+
+preload()
@@ -19,89 +19,48 @@ export const runBacktest = async (strategy) => {
   
   console.log('Running backtest for:', symbol, 'from', startDate, 'to', endDate);
   
-  // Simulate backtesting with mock data
-  return new Promise((resolve, reject) => {
-    setTimeout(() => {
-      try {
-        const results = generateBacktestResults(symbol, startDate, endDate, rules);
-        console.log('Generated results:', results);
-        resolve(results);
-      } catch (error) {
-        reject(error);
-      }
-    }, 2000);
+  // Results are cached server-side by strategy hash, so template runs are instant
+  const response = await fetch('http://localhost:5001/algo_backtest', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ symbol, startDate, endDate, rules })
   });
-};
-
-const generateBacktestResults = (symbol, startDate, endDate, rules) => {
-  const days = Math.floor((new Date(endDate) - new Date(startDate)) / (1000 * 60 * 60 * 24));
-  const equityCurve = [];
-  const transactions = [];
+  const data = await response.json();
   
-  let capital = 100000;
-  let position = 0;
-  let price = 1000 + Math.random() * 500;
-  
-  for (let i = 0; i <= days; i++) {
-    const date = new Date(startDate);
-    date.setDate(date.getDate() + i);
-    
-    // Simulate price movement
-    const change = (Math.random() - 0.5) * 0.05; // ±5% daily movement
-    price = price * (1 + change);
-    
-    // Simple moving average strategy simulation
-    const shouldBuy = Math.random() > 0.7 && position === 0;
-    const shouldSell = Math.random() > 0.8 && position > 0;
-    
-    if (shouldBuy && capital >= price * 10) {
-      const shares = Math.floor(capital * 0.1 / price);
-      position += shares;
-      capital -= shares * price;
-      transactions.push({
-        date: date.toISOString().split('T')[0],
-        type: 'BUY',
-        shares,
-        price: Math.round(price * 100) / 100
-      });
-    }
-    
-    if (shouldSell && position > 0) {
-      const shares = Math.floor(position * 0.5);
-      position -= shares;
-      capital += shares * price;
-      transactions.push({
-        date: date.toISOString().split('T')[0],
-        type: 'SELL',
-        shares,
-        price: Math.round(price * 100) / 100
-      });
-    }
-    
-    const totalValue = capital + (position * price);
-    
-    equityCurve.push({
-      date: date.toISOString().split('T')[0],
-      value: Math.round(totalValue * 100) / 100,
-      drawdown: Math.max(0, (120000 - totalValue) / 120000 * 100) // Mock drawdown
-    });
+  if (!response.ok || !data.success) {
+    throw new Error(data.error || 'Backtest failed');
   }
   
-  const finalValue = capital + (position * price);
-  const totalReturn = ((finalValue - 100000) / 100000) * 100;
-  const maxDrawdown = Math.max(...equityCurve.map(d => d.drawdown));
-  const winRate = transactions.filter(t => t.type === 'SELL').length > 0 ? 
-    Math.random() * 40 + 40 : 0; // 40-80% win rate
+  return toBacktestResults(data);
+};
+
+// Map the engine's response to the shape the Backtest page renders
+const toBacktestResults = (data) => {
+  let peak = 0;
+  const equityCurve = data.equity_curve.map(point => {
+    peak = Math.max(peak, point.equity);
+    return {
+      date: point.date,
+      value: point.equity,
+      drawdown: peak > 0 ? Math.round((peak - point.equity) / peak * 10000) / 100 : 0
+    };
+  });
   
   return {
     equityCurve,
-    transactions,
+    transactions: data.trades.map(trade => ({
+      date: trade.date,
+      type: trade.type,
+      shares: trade.shares,
+      price: trade.price
+    })),
     stats: {
-      totalReturn: Math.round(totalReturn * 100) / 100,
-      maxDrawdown: Math.round(maxDrawdown * 100) / 100,
-      winRate: Math.round(winRate * 100) / 100,
-      totalTrades: transactions.length,
-      finalCapital: Math.round(finalValue * 100) / 100
-    }
+      totalReturn: data.metrics.total_return,
+      maxDrawdown: data.metrics.max_drawdown,
+      winRate: data.metrics.win_rate,
+      totalTrades: data.metrics.total_trades,
+      finalCapital: data.metrics.final_capital
+    },
+    cached: data.cached
   };
-};
\ No newline at end of file
+};
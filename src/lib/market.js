@@ -21,20 +21,31 @@ export const topLosers = [
   { symbol: 'BHARTI AIRTEL', last: 890.45, change: -27.34, changePct: -2.98, volume: '1.7M' }
 ];
 
+const API_BASE = 'http://localhost:5001';
+
 export const getMarketData = async () => {
-  return new Promise(resolve => {
-    setTimeout(() => {
-      resolve({
-        indices,
-        topGainers,
-        topLosers,
-        lastUpdated: new Date().toISOString()
-      });
-    }, 500);
-  });
+  try {
+    // Served from the backend's precomputed snapshot
+    const response = await fetch(`${API_BASE}/market_snapshot`);
+    const data = await response.json();
+    if (response.ok && data.success) {
+      return data;
+    }
+    console.error('Market snapshot error:', data.error);
+  } catch (error) {
+    console.error('Market snapshot unavailable:', error);
+  }
+
+  // Backend offline: fall back to the sample data
+  return {
+    indices,
+    topGainers,
+    topLosers,
+    lastUpdated: new Date().toISOString()
+  };
 };
 
-export const getOHLCData = (symbol) => {
+const sampleOHLCData = () => {
   const days = 30;
   const data = [];
   let price = 1000 + Math.random() * 2000;
@@ -62,4 +73,34 @@ export const getOHLCData = (symbol) => {
   }
   
   return data;
-};
\ No newline at end of file
+};
+
+export const getOHLCData = async (symbol, { resolution = '1d', start, end, limit = 30 } = {}) => {
+  try {
+    const params = new URLSearchParams({ symbol, resolution });
+    if (start) params.set('start', start);
+    if (end) params.set('end', end);
+    if (limit) params.set('limit', String(limit));
+
+    const response = await fetch(`${API_BASE}/ohlc?${params}`);
+    const data = await response.json();
+    if (response.ok && data.success) {
+      // Candles arrive as parallel arrays; turn them into rows for the charts
+      const { date, open, high, low, close, volume } = data.candles;
+      return date.map((d, i) => ({
+        date: d,
+        open: open[i],
+        high: high[i],
+        low: low[i],
+        close: close[i],
+        volume: volume[i]
+      }));
+    }
+    console.error('OHLC error:', data.error);
+  } catch (error) {
+    console.error('OHLC data unavailable:', error);
+  }
+
+  // Backend offline: fall back to sample candles
+  return sampleOHLCData();
+};
@@ -1,113 +1,65 @@
-const PORTFOLIO_KEY = 'jainvest_portfolio';
+import { getCurrentUser } from './auth';
 
-const defaultPortfolio = {
-  cash: 100000,
-  positions: [],
-  transactions: [],
-  totalValue: 100000
+const API_BASE = 'http://localhost:5001';
+const GUEST_ID_KEY = 'jainvest_portfolio_guest';
+
+// Portfolios live on the server; guests get a random id kept in localStorage
+const getUserId = () => {
+  const auth = getCurrentUser();
+  if (auth?.user?.id) {
+    return String(auth.user.id);
+  }
+  let guestId = localStorage.getItem(GUEST_ID_KEY);
+  if (!guestId) {
+    guestId = `guest-${Date.now()}-${Math.random().toString(36).slice(2, 8)}`;
+    localStorage.setItem(GUEST_ID_KEY, guestId);
+  }
+  return guestId;
 };
 
-export const getPortfolio = () => {
-  try {
-    const data = localStorage.getItem(PORTFOLIO_KEY);
-    return data ? JSON.parse(data) : defaultPortfolio;
-  } catch {
-    return defaultPortfolio;
+const request = async (path, options) => {
+  const response = await fetch(`${API_BASE}${path}`, options);
+  const data = await response.json();
+  if (!response.ok || !data.success) {
+    throw new Error(data.error || 'Portfolio request failed');
   }
+  return data;
 };
 
-export const savePortfolio = (portfolio) => {
-  localStorage.setItem(PORTFOLIO_KEY, JSON.stringify(portfolio));
+// Positions come back marked to market at the latest prices
+export const getPortfolio = async () => {
+  const data = await request(`/portfolio?user_id=${encodeURIComponent(getUserId())}`);
+  return data.portfolio;
 };
 
-export const buyStock = (symbol, quantity, price) => {
-  const portfolio = getPortfolio();
-  const cost = quantity * price;
-  
-  if (portfolio.cash < cost) {
-    throw new Error('Insufficient funds');
-  }
-  
-  const existingPosition = portfolio.positions.find(p => p.symbol === symbol);
-  
-  if (existingPosition) {
-    const totalShares = existingPosition.quantity + quantity;
-    const totalCost = (existingPosition.averagePrice * existingPosition.quantity) + cost;
-    existingPosition.averagePrice = totalCost / totalShares;
-    existingPosition.quantity = totalShares;
-  } else {
-    portfolio.positions.push({
-      symbol,
-      quantity,
-      averagePrice: price,
-      currentPrice: price
-    });
-  }
-  
-  portfolio.cash -= cost;
-  portfolio.transactions.push({
-    id: Date.now(),
-    type: 'BUY',
-    symbol,
-    quantity,
-    price,
-    total: cost,
-    timestamp: new Date().toISOString()
+const trade = async (action, symbol, quantity) => {
+  const data = await request('/portfolio/trade', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    // The server prices every trade at its own latest quote
+    body: JSON.stringify({ user_id: getUserId(), action, symbol, quantity })
   });
-  
-  savePortfolio(portfolio);
-  return portfolio;
+  return data.portfolio;
 };
 
-export const sellStock = (symbol, quantity, price) => {
-  const portfolio = getPortfolio();
-  const position = portfolio.positions.find(p => p.symbol === symbol);
-  
-  if (!position || position.quantity < quantity) {
-    throw new Error('Insufficient shares');
-  }
-  
-  const proceeds = quantity * price;
-  
-  if (position.quantity === quantity) {
-    portfolio.positions = portfolio.positions.filter(p => p.symbol !== symbol);
-  } else {
-    position.quantity -= quantity;
-  }
-  
-  portfolio.cash += proceeds;
-  portfolio.transactions.push({
-    id: Date.now(),
-    type: 'SELL',
-    symbol,
-    quantity,
-    price,
-    total: proceeds,
-    timestamp: new Date().toISOString()
+export const buyStock = (symbol, quantity) => trade('BUY', symbol, quantity);
+
+export const sellStock = (symbol, quantity) => trade('SELL', symbol, quantity);
+
+export const resetPortfolio = async () => {
+  const data = await request('/portfolio/reset', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ user_id: getUserId() })
   });
-  
-  savePortfolio(portfolio);
-  return portfolio;
+  return data.portfolio;
 };
 
-export const updatePortfolioPrices = (marketData) => {
-  const portfolio = getPortfolio();
-  
-  portfolio.positions.forEach(position => {
-    const marketPrice = getRandomPrice(position.symbol);
-    position.currentPrice = marketPrice;
+export const analyzePortfolioRisk = async () => {
+  const data = await request('/analyze_portfolio_risk', {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({ user_id: getUserId() })
   });
-  
-  portfolio.totalValue = portfolio.cash + portfolio.positions.reduce((total, pos) => {
-    return total + (pos.quantity * pos.currentPrice);
-  }, 0);
-  
-  savePortfolio(portfolio);
-  return portfolio;
+  return data.analysis;
 };
-
-const getRandomPrice = (symbol) => {
-  const basePrice = 1000 + (symbol.charCodeAt(0) * 10);
-  const variation = (Math.random() - 0.5) * 200;
-  return Math.round((basePrice + variation) * 100) / 100;
-};
\ No newline at end of file
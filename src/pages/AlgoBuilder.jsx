@@ -12,6 +12,7 @@ const AlgoBuilder = () => {
   const [selectedStock, setSelectedStock] = useState('RELIANCE.NS');
   const [startDate, setStartDate] = useState('2023-01-01');
   const [endDate, setEndDate] = useState('2024-11-14');
+  const [barInterval, setBarInterval] = useState('1d');
 
   // Available strategy building blocks
   const blockCategories = {
@@ -55,6 +56,54 @@ const AlgoBuilder = () => {
         color: '#ec4899',
         params: { period: 20, stdDev: 2 },
         description: 'Volatility bands'
+      },
+      { 
+        id: 'atr', 
+        name: 'Average True Range (ATR)', 
+        icon: <Activity size={20} />,
+        color: '#14b8a6',
+        params: { period: 14 },
+        description: 'Volatility from the daily range'
+      },
+      { 
+        id: 'stochastic', 
+        name: 'Stochastic Oscillator', 
+        icon: <Activity size={20} />,
+        color: '#a855f7',
+        params: { period: 14, smooth: 3 },
+        description: 'Close within the recent range (0-100)'
+      },
+      { 
+        id: 'adx', 
+        name: 'Average Directional Index (ADX)', 
+        icon: <BarChart3 size={20} />,
+        color: '#0ea5e9',
+        params: { period: 14 },
+        description: 'Trend strength (0-100)'
+      },
+      { 
+        id: 'obv', 
+        name: 'On-Balance Volume (OBV)', 
+        icon: <BarChart3 size={20} />,
+        color: '#84cc16',
+        params: {},
+        description: 'Cumulative volume flow'
+      },
+      { 
+        id: 'vwap', 
+        name: 'VWAP', 
+        icon: <TrendingUp size={20} />,
+        color: '#eab308',
+        params: { period: 20 },
+        description: 'Volume-weighted average price'
+      },
+      { 
+        id: 'supertrend', 
+        name: 'Supertrend', 
+        icon: <TrendingUp size={20} />,
+        color: '#f43f5e',
+        params: { period: 10, multiplier: 3 },
+        description: 'ATR trailing trend line'
       }
     ],
     conditions: [
@@ -184,7 +233,8 @@ const AlgoBuilder = () => {
         symbol: selectedStock,
         strategy_blocks: cleanBlocks,
         start_date: startDate,
-        end_date: endDate
+        end_date: endDate,
+        interval: barInterval
       });
 
       // Call real backtest API with actual market data
@@ -198,6 +248,7 @@ const AlgoBuilder = () => {
           strategy_blocks: cleanBlocks,
           start_date: startDate,
           end_date: endDate,
+          interval: barInterval,
           initial_capital: 100000
         })
       });
@@ -315,6 +366,30 @@ const AlgoBuilder = () => {
                 </select>
               </div>
               
+              <div>
+                <label style={{ display: 'block', marginBottom: '8px', fontWeight: '600', fontSize: '14px' }}>
+                  ⏱️ Bar Interval
+                </label>
+                <select
+                  value={barInterval}
+                  onChange={(e) => setBarInterval(e.target.value)}
+                  style={{
+                    width: '100%',
+                    padding: '12px 16px',
+                    border: '2px solid var(--border)',
+                    borderRadius: '8px',
+                    fontSize: '16px',
+                    fontWeight: '600',
+                    cursor: 'pointer'
+                  }}
+                >
+                  <option value="1d">Daily</option>
+                  <option value="15m">15 minutes (intraday)</option>
+                  <option value="5m">5 minutes (intraday)</option>
+                  <option value="1m">1 minute (intraday)</option>
+                </select>
+              </div>
+              
               <div>
                 <label style={{ display: 'block', marginBottom: '8px', fontWeight: '600', fontSize: '14px' }}>
                   📅 Start Date
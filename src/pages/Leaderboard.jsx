@@ -9,10 +9,16 @@ import Card from '../components/Card';
 const Leaderboard = () => {
   const { t } = useTranslation();
   const [leaderboard, setLeaderboard] = useState([]);
+  const [userData, setUserData] = useState(null);
   const user = getCurrentUser();
 
   useEffect(() => {
-    setLeaderboard(getLeaderboard());
+    getLeaderboard()
+      .then(({ entries, user: currentUser }) => {
+        setLeaderboard(entries);
+        setUserData(currentUser);
+      })
+      .catch(err => console.error('Leaderboard error:', err));
   }, []);
 
   const getBadgeColor = (badge) => {
@@ -30,10 +36,10 @@ const Leaderboard = () => {
     return `#${rank}`;
   };
 
-  const chartData = leaderboard.slice(0, 10).map((user, index) => ({
+  const chartData = leaderboard.slice(0, 10).map(user => ({
     name: user.name.split(' ')[0],
     score: user.totalScore,
-    rank: index + 1
+    rank: user.rank
   }));
 
   return (
@@ -51,15 +57,12 @@ const Leaderboard = () => {
             <Card style={{ marginBottom: '32px' }}>
               <h3 style={{ marginBottom: '16px' }}>Your Performance</h3>
               {(() => {
-                const userRank = leaderboard.findIndex(u => u.userId === user.user.id) + 1;
-                const userData = leaderboard.find(u => u.userId === user.user.id);
-                
                 if (userData) {
                   return (
                     <div style={{ display: 'flex', alignItems: 'center', gap: '24px', flexWrap: 'wrap' }}>
                       <div style={{ textAlign: 'center' }}>
                         <div style={{ fontSize: '32px', marginBottom: '4px' }}>
-                          {getRankIcon(userRank)}
+                          {getRankIcon(userData.rank)}
                         </div>
                         <div style={{ fontSize: '12px', color: 'var(--textMuted)' }}>Your Rank</div>
                       </div>
@@ -158,7 +161,7 @@ const Leaderboard = () => {
                       }}
                     >
                       <td style={{ padding: '16px 0', fontSize: '18px', fontWeight: '600' }}>
-                        {getRankIcon(index + 1)}
+                        {getRankIcon(userData.rank)}
                       </td>
                       <td style={{ padding: '16px 0' }}>
                         <div>
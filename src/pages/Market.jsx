@@ -19,8 +19,9 @@ const Market = () => {
 
   useEffect(() => {
     if (selectedSymbol) {
-      const ohlcData = getOHLCData(selectedSymbol);
-      setChartData(ohlcData.map(d => ({ date: d.date, price: d.close })));
+      getOHLCData(selectedSymbol).then(ohlcData => {
+        setChartData(ohlcData.map(d => ({ date: d.date, price: d.close })));
+      });
     }
   }, [selectedSymbol]);
 
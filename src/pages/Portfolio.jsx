@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { useTranslation } from 'react-i18next';
 import { motion } from 'framer-motion';
 import { LineChart, Line, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, PieChart, Pie, Cell } from 'recharts';
-import { getPortfolio, buyStock, sellStock, updatePortfolioPrices } from '../lib/portfolio';
+import { getPortfolio, buyStock, sellStock } from '../lib/portfolio';
 import { topGainers, topLosers } from '../lib/market';
 import Card from '../components/Card';
 
@@ -17,9 +17,12 @@ const Portfolio = () => {
     loadPortfolio();
   }, []);
 
-  const loadPortfolio = () => {
-    const portfolioData = updatePortfolioPrices();
-    setPortfolio(portfolioData);
+  const loadPortfolio = async () => {
+    try {
+      setPortfolio(await getPortfolio());
+    } catch (err) {
+      setError(err.message);
+    }
   };
 
   const formatCurrency = (value) => {
@@ -37,17 +40,14 @@ const Portfolio = () => {
 
     try {
       const quantity = parseInt(tradeData.quantity);
-      const price = getStockPrice(tradeData.symbol);
 
-      if (tradeData.action === 'BUY') {
-        buyStock(tradeData.symbol, quantity, price);
-      } else {
-        sellStock(tradeData.symbol, quantity, price);
-      }
+      const updated = tradeData.action === 'BUY'
+        ? await buyStock(tradeData.symbol, quantity)
+        : await sellStock(tradeData.symbol, quantity);
 
       setShowTradeModal(false);
       setTradeData({ symbol: '', quantity: '', action: 'BUY' });
-      loadPortfolio();
+      setPortfolio(updated);
     } catch (err) {
       setError(err.message);
     }
@@ -71,7 +71,7 @@ const Portfolio = () => {
         <div className="container">
           <div style={{ textAlign: 'center' }}>
             <div style={{ fontSize: '24px' }}>💼</div>
-            <p>{t('common.loading')}</p>
+            <p>{error || t('common.loading')}</p>
           </div>
         </div>
       </div>
@@ -69,7 +69,8 @@ const Quiz = () => {
     };
 
     saveQuizAttempt(attempt);
-    updateUserScore(user.user.id, quizResults.score);
+    updateUserScore(user.user.id, quizResults.score)
+      .catch(err => console.error("Leaderboard update error:", err));
     setUserAttempts(getUserAttempts());
   };
 